@@ -0,0 +1,89 @@
+import hashlib
+import json
+import os
+
+# Options that only control checkpointing, so changing them doesn't invalidate a journal
+CHECKPOINT_OPTIONS = {'checkpoint', 'resume', 'checkpoint-rows', 'jobs', 'compress-level'}
+
+def journal_file(output_file):
+    """Where a conversion into output_file keeps its checkpoint journal"""
+    return output_file + '.checkpoint.json'
+
+def partial_file(output_file):
+    """Plain CSV the committed chunks are appended to until the conversion finishes"""
+    return output_file + '.partial'
+
+def input_digest(path):
+    """sha256 of the input file, so a resume never mixes rows from two different exports"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def new_journal(form_type, input_file, options, chunk_rows):
+    """Journal for a conversion that has not committed anything yet"""
+    return {
+        'form_type': form_type,
+        'input': os.path.abspath(input_file),
+        'input_digest': input_digest(input_file),
+        'options': {key: value for key, value in (options or {}).items() if key not in CHECKPOINT_OPTIONS},
+        'chunk_rows': chunk_rows,
+        'rows_read': 0,
+        'bytes': 0,
+        'entries': 0,
+        'skipped': 0,
+        'rows': 0
+    }
+
+def load_journal(output_file, expected):
+    """The saved journal if it belongs to the same conversion as expected, else None (and why)"""
+    path = journal_file(output_file)
+    if not os.path.exists(path) or not os.path.exists(partial_file(output_file)):
+        return None, 'no checkpoint found'
+    with open(path, encoding='utf-8') as f:
+        journal = json.load(f)
+
+    for key in ['form_type', 'input', 'input_digest', 'options', 'chunk_rows']:
+        if journal.get(key) != expected[key]:
+            reason = 'the input file changed' if key == 'input_digest' else f"the {key.replace('_', ' ')} changed"
+            return None, f"checkpoint is for a different run ({reason})"
+    if os.path.getsize(partial_file(output_file)) < journal['bytes']:
+        return None, 'the partial output is shorter than the checkpoint says'
+    return journal, None
+
+def save_journal(output_file, journal):
+    """Replace the journal atomically, so a crash leaves either the old or the new one"""
+    path = journal_file(output_file)
+    temp = path + '.tmp'
+    with open(temp, 'w', encoding='utf-8') as f:
+        json.dump(journal, f, indent=2, sort_keys=True)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp, path)
+
+def open_partial(output_file, committed_bytes):
+    """Append handle on the partial output, cut back to the last committed chunk
+
+    Anything written after the last journal update (a chunk the run died in the middle
+    of) is dropped, so it is written again exactly once.
+    """
+    path = partial_file(output_file)
+    mode = 'r+b' if committed_bytes and os.path.exists(path) else 'wb'
+    f = open(path, mode)
+    f.truncate(committed_bytes)
+    f.seek(committed_bytes)
+    return f
+
+def commit_chunk(f, text):
+    """Append one chunk of CSV text and make sure it is on disk; returns the new file size"""
+    f.write(text.encode('utf-8'))
+    f.flush()
+    os.fsync(f.fileno())
+    return f.tell()
+
+def clear_checkpoint(output_file):
+    """Remove the journal and partial output once the final output is in place"""
+    for path in [journal_file(output_file), partial_file(output_file)]:
+        if os.path.exists(path):
+            os.remove(path)
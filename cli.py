@@ -0,0 +1,22 @@
+import sys
+
+def parse_options(args, value_options=()):
+    """Split command-line arguments into positional arguments and --options"""
+    positional = []
+    options = {}
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg.startswith('--'):
+            key, has_value, value = arg.partition('=')
+            if not has_value and key in value_options:
+                if i + 1 >= len(args):
+                    print(f"❌ Option {key} needs a value")
+                    sys.exit(1)
+                i += 1
+                value = args[i]
+            options[key[2:]] = value if (has_value or key in value_options) else True
+        else:
+            positional.append(arg)
+        i += 1
+    return positional, options
@@ -0,0 +1,81 @@
+import gzip
+import io
+import os
+
+# Optional: only needed for .zst files
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# --compress value -> file extension
+COMPRESSIONS = {
+    'gzip': '.gz',
+    'zstd': '.zst'
+}
+DEFAULT_LEVELS = {'gzip': 6, 'zstd': 3}
+
+def compression_of(path):
+    """'gzip', 'zstd' or None, from the file extension"""
+    ext = os.path.splitext(path)[1].lower()
+    return next((method for method, suffix in COMPRESSIONS.items() if suffix == ext), None)
+
+def split_output_name(path):
+    """('voa_orders', '.csv.gz') for 'voa_orders.csv.gz', so derived files keep both extensions"""
+    base, ext = os.path.splitext(path)
+    if compression_of(path):
+        base, inner = os.path.splitext(base)
+        ext = (inner or '.csv') + ext
+    return base, ext or '.csv'
+
+def with_compression(path, method):
+    """Add the --compress extension to an output name that does not already have one"""
+    if not method or method is True:
+        return path
+    if method not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression '{method}'. Use: {', '.join(COMPRESSIONS)}")
+    return path if compression_of(path) else path + COMPRESSIONS[method]
+
+def _require_zstandard():
+    if zstandard is None:
+        raise ImportError("Reading or writing .zst files needs zstandard (pip install zstandard)")
+
+def open_output(path, level=None):
+    """Text handle that compresses as it writes, chosen by the file extension"""
+    method = compression_of(path)
+    level = int(level) if level is not None else DEFAULT_LEVELS.get(method)
+
+    if method == 'gzip':
+        # No timestamp in the header, so the same data always gives the same file
+        return io.TextIOWrapper(gzip.GzipFile(path, 'wb', compresslevel=level, mtime=0),
+                                encoding='utf-8', newline='')
+    if method == 'zstd':
+        _require_zstandard()
+        compressor = zstandard.ZstdCompressor(level=level)
+        return io.TextIOWrapper(compressor.stream_writer(open(path, 'wb'), closefd=True),
+                                encoding='utf-8', newline='')
+    return open(path, 'w', encoding='utf-8', newline='')
+
+def open_input(path):
+    """Binary handle that decompresses as it reads, chosen by the file extension"""
+    method = compression_of(path)
+    if method == 'gzip':
+        return gzip.open(path, 'rb')
+    if method == 'zstd':
+        _require_zstandard()
+        return zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
+    return open(path, 'rb')
+
+def write_csv(df, path, level=None, chunk_rows=None, on_chunk=None):
+    """Write a DataFrame as CSV through open_output, optionally chunk by chunk
+
+    on_chunk(rows_written) is called after each chunk (used for progress reporting).
+    """
+    with open_output(path, level) as f:
+        if not chunk_rows:
+            df.to_csv(f, index=False)
+        else:
+            for start in range(0, max(len(df), 1), chunk_rows):
+                df.iloc[start:start + chunk_rows].to_csv(f, index=False, header=start == 0)
+                if on_chunk:
+                    on_chunk(min(start + chunk_rows, len(df)))
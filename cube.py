@@ -0,0 +1,169 @@
+import pandas as pd
+import numpy as np
+import os
+import sys
+import time
+from registry import SIZE_ORDER
+from form_input import read_table
+from production import COMMITTEE_DESIGNS
+from cli import parse_options
+
+# Axes of the cube, in storage order
+DIMENSIONS = ['design', 'size', 'residency', 'domain', 'source']
+
+# Label for a dimension an output does not have (e.g. residency of a committee shirt)
+NONE_LABEL = '-'
+
+DEFAULT_CUBE = 'order_cube.npz'
+
+VALUE_OPTIONS = {'--voa', '--cores', '--exes', '--by'}
+
+def output_records(source, output_file):
+    """One row per shirt from a converter output, with every cube dimension as a column
+
+    voa takes a VOA orders output; cores and exes take their sizes (distribution) lists.
+    """
+    df = read_table(output_file, usecols=[dim for dim in DIMENSIONS if dim != 'source'],
+                    dtype=str, keep_default_na=False)
+    if source in COMMITTEE_DESIGNS:
+        df['design'] = COMMITTEE_DESIGNS[source]
+    missing = [dim for dim in ['design', 'size'] if dim not in df.columns]
+    if missing:
+        raise KeyError(f"{output_file} has no {' or '.join(missing)} column - is it a {source} output?")
+
+    records = df.reindex(columns=DIMENSIONS, fill_value='').assign(source=source)
+    return records.replace('', NONE_LABEL)
+
+def dimension_labels(dim, values):
+    """Sorted labels of one axis (sizes S..XXL first, the none label last)"""
+    def key(label):
+        return (label == NONE_LABEL, SIZE_ORDER.get(label, 999) if dim == 'size' else 0, label)
+    return sorted(pd.unique(values), key=key)
+
+def build_cube(records):
+    """Count records over every combination of DIMENSIONS; returns (counts array, {dim: labels})"""
+    labels = {dim: dimension_labels(dim, records[dim]) for dim in DIMENSIONS}
+    shape = tuple(len(labels[dim]) for dim in DIMENSIONS)
+    codes = [pd.Categorical(records[dim], categories=labels[dim]).codes for dim in DIMENSIONS]
+
+    flat = np.ravel_multi_index(codes, shape) if len(records) else np.empty(0, dtype=np.int64)
+    counts = np.bincount(flat, minlength=int(np.prod(shape))).reshape(shape)
+    return counts.astype(np.int32), labels
+
+def save_cube(cube_file, counts, labels):
+    """Save the counts and axis labels as one .npz file (no pickled objects)"""
+    np.savez_compressed(cube_file, counts=counts,
+                        **{f'labels_{dim}': np.array(labels[dim], dtype=str) for dim in DIMENSIONS})
+
+def load_cube(cube_file):
+    """(counts array, {dim: labels}) from a saved cube"""
+    with np.load(cube_file, allow_pickle=False) as data:
+        return data['counts'], {dim: data[f'labels_{dim}'].tolist() for dim in DIMENSIONS}
+
+def cube_build(cube_file, inputs):
+    """Pre-aggregate converter outputs ({source: file}) into a cube file"""
+    print(f"\n🧊 Building order cube from {', '.join(f'{s} ({p})' for s, p in inputs.items())}")
+    records = pd.concat([output_records(source, path) for source, path in inputs.items()], ignore_index=True)
+    counts, labels = build_cube(records)
+    save_cube(cube_file, counts, labels)
+
+    print(f"✓ {len(records)} shirts over " + ' x '.join(f"{len(labels[d])} {d}" for d in DIMENSIONS))
+    print(f"💾 Saved {cube_file} ({os.path.getsize(cube_file):,} bytes)")
+    return counts, labels
+
+def parse_filters(terms, labels):
+    """'dim=value[,value...]' terms as {dim: [label positions]}; matching ignores case"""
+    filters = {}
+    for term in terms:
+        dim, has_value, values = term.partition('=')
+        dim = dim.strip().lower()
+        if not has_value or dim not in labels:
+            raise ValueError(f"Bad filter '{term}'. Use dimension=value with one of: {', '.join(DIMENSIONS)}")
+
+        lookup = {label.lower(): i for i, label in enumerate(labels[dim])}
+        positions = []
+        for value in values.split(','):
+            if value.strip().lower() not in lookup:
+                raise ValueError(f"No {dim} '{value.strip()}' in the cube ({', '.join(labels[dim])})")
+            positions.append(lookup[value.strip().lower()])
+        filters[dim] = positions
+    return filters
+
+def query_cube(counts, labels, filters=None, by=()):
+    """Total count of a slice, or a DataFrame of counts per combination of the `by` dimensions
+
+    filters maps dimension -> label positions to keep (see parse_filters); dimensions not
+    in `by` are summed over. Zero rows are left out of the table.
+    """
+    filters = filters or {}
+    index = [filters.get(dim, range(len(labels[dim]))) for dim in DIMENSIONS]
+    sliced = counts[np.ix_(*[list(positions) for positions in index])]
+
+    summed = tuple(axis for axis, dim in enumerate(DIMENSIONS) if dim not in by)
+    rolled = sliced.sum(axis=summed)
+    if not by:
+        return int(rolled)
+
+    # Put the remaining axes in the order the dimensions were asked for
+    kept = [dim for dim in DIMENSIONS if dim in by]
+    rolled = np.transpose(rolled, [kept.index(dim) for dim in by])
+    rows = pd.MultiIndex.from_product([[labels[dim][i] for i in index[DIMENSIONS.index(dim)]] for dim in by],
+                                      names=list(by))
+    table = pd.Series(rolled.ravel(), index=rows, name='quantity')
+    return table[table > 0].reset_index()
+
+def cube_command(positional, options):
+    """Run 'cube build|query ...' from parsed command-line arguments"""
+    action = positional[0] if positional else None
+    if action == 'build':
+        inputs = {source: options[source] for source in ['voa', 'cores', 'exes'] if options.get(source)}
+        if not inputs:
+            print("Usage: cube build [cube_file] [--voa voa_orders.csv] [--cores cores_sizes.csv] [--exes exes_sizes.csv]")
+            sys.exit(1)
+        for path in inputs.values():
+            if not os.path.exists(path):
+                print(f"\n❌ Error: File '{path}' not found!")
+                sys.exit(1)
+        cube_build(positional[1] if len(positional) > 1 else DEFAULT_CUBE, inputs)
+
+    elif action == 'query':
+        cube_file = next((arg for arg in positional[1:] if '=' not in arg), DEFAULT_CUBE)
+        if not os.path.exists(cube_file):
+            print(f"\n❌ Error: File '{cube_file}' not found! Run 'cube build' first.")
+            sys.exit(1)
+
+        started = time.perf_counter()
+        counts, labels = load_cube(cube_file)
+        by = [dim.strip().lower() for dim in options['by'].split(',')] if options.get('by') else []
+        try:
+            unknown = [dim for dim in by if dim not in DIMENSIONS]
+            if unknown:
+                raise ValueError(f"Unknown --by dimension {', '.join(unknown)}. Use: {', '.join(DIMENSIONS)}")
+            filters = parse_filters([arg for arg in positional[1:] if '=' in arg], labels)
+            result = query_cube(counts, labels, filters, by)
+        except ValueError as e:
+            print(f"\n❌ Error: {e}")
+            sys.exit(1)
+        elapsed = (time.perf_counter() - started) * 1000
+
+        if isinstance(result, int):
+            print(f"\n📦 {result} shirts")
+        elif len(result):
+            print(f"\n{result.to_string(index=False)}")
+            print(f"\n📦 {result['quantity'].sum()} shirts")
+        else:
+            print("\n📦 0 shirts")
+        print(f"⏱️  {elapsed:.1f} ms")
+
+    else:
+        print("Usage: cube build [cube_file] [--voa voa_orders.csv] [--cores cores_sizes.csv] [--exes exes_sizes.csv]")
+        print("       cube query [cube_file] [dimension=value[,value]] ... [--by dimension[,dimension]]")
+        print(f"Dimensions: {', '.join(DIMENSIONS)}")
+        sys.exit(1)
+
+def main():
+    """Main entry point"""
+    cube_command(*parse_options(sys.argv[1:], VALUE_OPTIONS))
+
+if __name__ == "__main__":
+    main()
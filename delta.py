@@ -0,0 +1,97 @@
+import pandas as pd
+from registry import FORMS, SIZE_ORDER, flags_as_text
+from form_input import read_table
+from generate_printing_summary import sort_summary
+from compression import split_output_name, write_csv
+
+def output_text(df):
+    """A converter output as the text it is saved with (TRUE/FALSE flags, '' for blanks)"""
+    text = flags_as_text(df).astype(object)
+    return text.where(text.notna(), '').astype(str)
+
+def read_previous(previous_file):
+    """Read an earlier converter output as text, so cells compare the way they were written"""
+    return read_table(previous_file, dtype=str, keep_default_na=False)
+
+def person_digests(lines, key):
+    """One (digest, line count) per person; the digest ignores the order of their lines"""
+    payload = [col for col in lines.columns if col not in key]
+    row_hashes = pd.util.hash_pandas_object(lines[payload], index=False)
+    # A sum of row hashes is the same whatever order a person's order lines come in
+    return row_hashes.groupby([lines[col] for col in key], sort=False).agg(['sum', 'size'])
+
+def _lines_of(lines, key, people):
+    """Rows of lines belonging to the given people (a MultiIndex of key values)"""
+    return lines[pd.MultiIndex.from_frame(lines[key]).isin(people)]
+
+def diff_outputs(new, old, key):
+    """Hash-join two outputs on the person key; returns (added, changed, removed) lines
+
+    added and changed hold the new lines of those people, removed holds the old lines.
+    """
+    old = old.reindex(columns=new.columns, fill_value='')
+    digests = person_digests(new, key).join(person_digests(old, key), how='outer',
+                                           lsuffix='_new', rsuffix='_old')
+
+    in_new = digests['size_new'].notna()
+    in_old = digests['size_old'].notna()
+    differs = (digests['sum_new'] != digests['sum_old']) | (digests['size_new'] != digests['size_old'])
+
+    added = _lines_of(new, key, digests.index[in_new & ~in_old])
+    changed = _lines_of(new, key, digests.index[in_new & in_old & differs])
+    removed = _lines_of(old, key, digests.index[~in_new & in_old])
+    return added, changed, removed
+
+def delta_summary(added_lines, removed_lines):
+    """Net shirts to add or cancel per design and size (or per size for distribution lists)"""
+    groups = [col for col in ['design', 'size'] if col in added_lines.columns]
+    if not groups:
+        return None
+
+    net = (added_lines.groupby(groups).size().sub(removed_lines.groupby(groups).size(), fill_value=0)
+           .astype(int).reset_index(name='net'))
+    net = net[net['net'] != 0]
+    net['add'] = net['net'].clip(lower=0)
+    net['cancel'] = (-net['net']).clip(lower=0)
+    net = net[groups + ['add', 'cancel']]
+
+    if groups == ['design', 'size']:
+        return sort_summary(net)
+    return net.sort_values('size', key=lambda sizes: sizes.map(lambda x: SIZE_ORDER.get(x, 999)), kind='stable')
+
+def write_diff(output_df, previous, output_file, form_type, level=None):
+    """Write <output>_added/_changed/_removed.csv and the delta printing summary"""
+    key = FORMS[form_type]['key']
+    missing = [col for col in key if col not in previous.columns]
+    if missing:
+        raise KeyError(f"The previous output has no {' or '.join(missing)} column - is it a {form_type} output?")
+
+    new = output_text(output_df)
+    added, changed, removed = diff_outputs(new, previous, key)
+
+    base, ext = split_output_name(output_file)
+    people = {name: len(lines.drop_duplicates(key)) for name, lines in
+              [('added', added), ('changed', changed), ('removed', removed)]}
+    print(f"\n🔁 Changes since the previous output: {people['added']} added, "
+          f"{people['changed']} changed, {people['removed']} removed")
+
+    for name, lines in [('added', added), ('changed', changed), ('removed', removed)]:
+        write_csv(lines, f"{base}_{name}{ext}", level)
+    print(f"💾 Saved {base}_added{ext}, {base}_changed{ext} and {base}_removed{ext}")
+
+    # Changed people count with their new lines in and their old lines out
+    old_changed = _lines_of(previous.reindex(columns=new.columns, fill_value=''), key,
+                            pd.MultiIndex.from_frame(changed[key]))
+    summary = delta_summary(pd.concat([added, changed]), pd.concat([removed, old_changed]))
+    if summary is None:
+        return added, changed, removed
+
+    summary_file = f"{base}_delta_summary{ext}"
+    write_csv(summary, summary_file, level)
+    print(f"💾 Saved {summary_file}")
+    if len(summary):
+        print("\n📊 Shirts to add / cancel:")
+        print(summary.to_string(index=False))
+    else:
+        print("✅ Nothing to add or cancel")
+    return added, changed, removed
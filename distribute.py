@@ -0,0 +1,337 @@
+import pandas as pd
+import sqlite3
+import socket
+import sys
+import os
+import re
+import time
+from datetime import datetime
+from registry import SIZE_ORDER
+from form_input import read_table
+from production import COMMITTEE_DESIGNS
+from duplicates import phone_digits, email_local
+from cli import parse_options
+
+DEFAULT_DESK_DB = 'distribution.db'
+
+# Most people shown for one search
+MAX_RESULTS = 20
+
+# Columns kept from each converter output (cores/exes take their sizes lists)
+SOURCE_COLUMNS = {
+    'voa': ['name', 'email', 'contact', 'residency', 'design', 'size'],
+    'cores': ['name', 'domain', 'size'],
+    'exes': ['name', 'domain', 'size']
+}
+
+# collections is never rebuilt, so a re-import after late orders keeps who already collected
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS people (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    name TEXT NOT NULL,
+    contact TEXT,
+    email TEXT,
+    domain TEXT,
+    residency TEXT,
+    phone_rev TEXT,
+    email_key TEXT,
+    roll TEXT
+);
+CREATE TABLE IF NOT EXISTS name_words (
+    word TEXT NOT NULL,
+    person_id INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    person_id INTEGER NOT NULL,
+    item_key TEXT NOT NULL UNIQUE,
+    design TEXT NOT NULL,
+    size TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS collections (
+    item_key TEXT PRIMARY KEY,
+    collected_at TEXT NOT NULL,
+    desk TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_people_source ON people (source);
+CREATE INDEX IF NOT EXISTS idx_people_phone_rev ON people (phone_rev);
+CREATE INDEX IF NOT EXISTS idx_people_email ON people (email_key);
+CREATE INDEX IF NOT EXISTS idx_people_roll ON people (roll);
+CREATE INDEX IF NOT EXISTS idx_name_words ON name_words (word, person_id);
+CREATE INDEX IF NOT EXISTS idx_name_words_person ON name_words (person_id);
+CREATE INDEX IF NOT EXISTS idx_items_person ON items (person_id);
+"""
+
+VALUE_OPTIONS = {'--db', '--desk', '--design', '--voa', '--cores', '--exes'}
+
+def connect(db_file=DEFAULT_DESK_DB):
+    """Open (and create if needed) a distribution database that several desks can share
+
+    WAL lets desks read while another one writes, synchronous=FULL makes every committed
+    collection survive a crash or power cut, and busy_timeout makes a desk wait for a
+    moment instead of failing when another desk is writing.
+    """
+    conn = sqlite3.connect(db_file, timeout=10)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=FULL")
+    conn.execute("PRAGMA busy_timeout=10000")
+    conn.executescript(SCHEMA)
+    return conn
+
+def prefix_range(prefix):
+    """(low, high) bounds matching every string that starts with prefix, so an index is used"""
+    return prefix, prefix + '￿'
+
+def name_words(names):
+    """Lower-case words of each name, one row per (row label, word)"""
+    words = names.str.lower().str.replace(r'[^\w\s]', ' ', regex=True).str.split().explode()
+    return words[words.notna() & (words != '')]
+
+def people_frame(df, source):
+    """People and their items from one converter output; returns (people, items)"""
+    columns = SOURCE_COLUMNS[source]
+    missing = [col for col in columns if col not in df.columns and col != 'design']
+    if missing:
+        raise KeyError(f"{source} output is missing column(s): {', '.join(missing)}")
+
+    df = df.reindex(columns=columns, fill_value='').fillna('').astype(str)
+    if source in COMMITTEE_DESIGNS:
+        df['design'] = COMMITTEE_DESIGNS[source]
+    key = ['name', 'contact'] if source == 'voa' else ['name', 'domain']
+
+    people = df.drop_duplicates(key).drop(columns=['design', 'size']).reset_index(drop=True)
+    people = people.reindex(columns=['name', 'contact', 'email', 'domain', 'residency'], fill_value='')
+    people['source'] = source
+    people['phone_rev'] = phone_digits(people['contact']).str[::-1]
+    people['email_key'] = people['email'].str.strip().str.lower()
+    # College emails start with the roll number
+    people['roll'] = email_local(people['email'])
+
+    # The same person can order the same shirt twice, so number repeats to keep keys unique
+    person = df[key].merge(people[key].reset_index(), on=key, how='left')['index'].to_numpy()
+    items = df[['design', 'size']].assign(person=person)
+    repeat = items.groupby(['person', 'design', 'size']).cumcount().astype(str)
+    items['item_key'] = (source + '|' + df['name'] + '|' + df['contact' if source == 'voa' else 'domain']
+                         + '|' + items['design'] + '|' + items['size'] + '|' + repeat)
+    return people, items
+
+def import_output(conn, df, source):
+    """Replace one source's people and items with a converter output (collections are kept)"""
+    people, items = people_frame(df, source)
+
+    with conn:
+        old = "SELECT id FROM people WHERE source = ?"
+        conn.execute(f"DELETE FROM name_words WHERE person_id IN ({old})", (source,))
+        conn.execute(f"DELETE FROM items WHERE person_id IN ({old})", (source,))
+        conn.execute("DELETE FROM people WHERE source = ?", (source,))
+
+        start = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM people").fetchone()[0]
+        people['id'] = range(start, start + len(people))
+        columns = ['id', 'source', 'name', 'contact', 'email', 'domain', 'residency', 'phone_rev', 'email_key', 'roll']
+        conn.executemany(f"INSERT INTO people ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                         people[columns].itertuples(index=False, name=None))
+
+        words = name_words(people['name'])
+        conn.executemany("INSERT INTO name_words (word, person_id) VALUES (?, ?)",
+                         zip(words.tolist(), people['id'].to_numpy()[words.index].tolist()))
+
+        items['person_id'] = people['id'].to_numpy()[items['person']]
+        conn.executemany("INSERT INTO items (person_id, item_key, design, size) VALUES (?, ?, ?, ?)",
+                         items[['person_id', 'item_key', 'design', 'size']].itertuples(index=False, name=None))
+
+    return len(people), len(items)
+
+def build_index(db_file, inputs):
+    """Import converter outputs ({source: file}) into the distribution database"""
+    conn = connect(db_file)
+    try:
+        for source, path in inputs.items():
+            print(f"\n📋 Reading {source} output from: {path}")
+            df = read_table(path, dtype=str, keep_default_na=False)
+            people, items = import_output(conn, df, source)
+            print(f"✓ Indexed {people} people with {items} shirts")
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+    print(f"\n💾 Distribution desk index saved to {db_file}")
+
+def find_people(conn, query, limit=MAX_RESULTS):
+    """Person ids matching a search: phone digits (any ending), email or roll prefix, or name word prefixes"""
+    text = query.strip().lower()
+    digits = re.sub(r'\D', '', text)
+
+    if '@' in text:
+        where, params = "email_key >= ? AND email_key < ?", prefix_range(text)
+    elif len(digits) >= 4 and not re.sub(r'[\d\s+\-()]', '', text):
+        # Phone numbers are stored reversed, so the last digits typed are an indexed prefix
+        where, params = "phone_rev >= ? AND phone_rev < ?", prefix_range(digits[-10:][::-1])
+    else:
+        words = re.sub(r'[^\w\s]', ' ', text).split()
+        if not words:
+            return []
+        match = " INTERSECT ".join(["SELECT person_id FROM name_words WHERE word >= ? AND word < ?"] * len(words))
+        where = f"id IN ({match})"
+        params = tuple(bound for word in words for bound in prefix_range(word))
+        if len(words) == 1:
+            where += " OR (roll >= ? AND roll < ?)"
+            params += prefix_range(words[0])
+
+    rows = conn.execute(f"SELECT id FROM people WHERE {where} ORDER BY name, id LIMIT ?", params + (limit,))
+    return [row[0] for row in rows]
+
+def person_items(conn, person_ids):
+    """Each person's details with their shirts and collection status, as a DataFrame"""
+    if not person_ids:
+        return pd.DataFrame()
+    query = (f"SELECT p.id, p.name, p.source, p.contact, p.email, p.domain, p.residency, "
+             f"i.design, i.size, c.collected_at, c.desk "
+             f"FROM people p JOIN items i ON i.person_id = p.id "
+             f"LEFT JOIN collections c ON c.item_key = i.item_key "
+             f"WHERE p.id IN ({', '.join('?' * len(person_ids))}) ORDER BY p.name, p.id, i.id")
+    return pd.read_sql_query(query, conn, params=list(person_ids))
+
+def show_people(items):
+    """Print search results person by person"""
+    for person_id, shirts in items.groupby('id', sort=False):
+        first = shirts.iloc[0]
+        details = [first[col] for col in ['contact', 'email', 'domain', 'residency'] if first[col]]
+        print(f"\n👤 #{person_id} {first['name']} ({first['source']}) {' | '.join(details)}")
+        same = shirts.groupby(['design', 'size', 'collected_at', 'desk'], dropna=False, sort=False).size()
+        for (design, size, collected_at, desk), count in same.items():
+            status = f"✅ collected {collected_at} at {desk}" if pd.notna(collected_at) else "⏳ to collect"
+            print(f"     {design:16s} {size:6s} {'x' + str(count) if count > 1 else '':4s} {status}")
+
+def lookup(conn, query):
+    """Search and print matching people; returns their ids"""
+    started = time.perf_counter()
+    person_ids = find_people(conn, query)
+    items = person_items(conn, person_ids)
+    elapsed = (time.perf_counter() - started) * 1000
+
+    if items.empty:
+        print(f"\n🔎 Nobody matches '{query}' ({elapsed:.1f} ms)")
+        return []
+    show_people(items)
+    more = " (showing the first ones - type more letters)" if len(person_ids) == MAX_RESULTS else ""
+    print(f"\n🔎 {len(person_ids)} match(es) for '{query}' in {elapsed:.1f} ms{more}")
+    return person_ids
+
+def mark_collected(conn, person_id, desk, design=None, collected=True):
+    """Record (or undo) the hand-over of a person's shirts; returns how many changed
+
+    Each call is one committed transaction. A shirt already marked by another desk is
+    left as it is, so two desks can never count the same hand-over twice.
+    """
+    where, params = "person_id = ?", [person_id]
+    if design:
+        where, params = where + " AND lower(design) = ?", params + [design.lower()]
+    keys = [row[0] for row in conn.execute(f"SELECT item_key FROM items WHERE {where}", params)]
+
+    with conn:
+        if collected:
+            stamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            cursor = conn.executemany("INSERT OR IGNORE INTO collections (item_key, collected_at, desk) VALUES (?, ?, ?)",
+                                      [(key, stamp, desk) for key in keys])
+        else:
+            cursor = conn.executemany("DELETE FROM collections WHERE item_key = ?", [(key,) for key in keys])
+    return max(cursor.rowcount, 0), len(keys)
+
+def collection_status(conn):
+    """Collected and pending shirts per design and size"""
+    query = ("SELECT i.design, i.size, COUNT(c.item_key) AS collected, COUNT(*) - COUNT(c.item_key) AS pending "
+             "FROM items i LEFT JOIN collections c ON c.item_key = i.item_key GROUP BY i.design, i.size")
+    status = pd.read_sql_query(query, conn)
+    status['size_order'] = status['size'].map(lambda size: SIZE_ORDER.get(size, 999))
+    return status.sort_values(['design', 'size_order']).drop(columns='size_order')
+
+def collect_command(conn, person_id, options, collected=True):
+    """Mark one person's shirts (optionally one --design) as collected or not and say what happened"""
+    changed, total = mark_collected(conn, int(person_id), options.get('desk', socket.gethostname()),
+                                    options.get('design'), collected)
+    if total == 0:
+        print(f"\n❌ No shirts for #{person_id}" + (f" with design '{options['design']}'" if options.get('design') else ''))
+    elif collected and changed == 0:
+        print(f"\n⚠️  #{person_id}: already collected - check the times below before handing anything over")
+    elif collected:
+        print(f"\n✅ #{person_id}: {changed} shirt(s) marked collected" +
+              (f", {total - changed} already collected" if changed < total else ''))
+    else:
+        print(f"\n↩️  #{person_id}: {changed} shirt(s) marked not collected")
+    shirts = person_items(conn, [int(person_id)])
+    if not shirts.empty:
+        show_people(shirts)
+
+def desk_mode(conn, options):
+    """Interactive desk: search, then 'c <id>' to hand over, 'u <id>' to undo, 'q' to quit"""
+    print("\n🧾 Distribution desk - type a name, phone, email or roll number")
+    print("   c <id> = mark collected, u <id> = undo, s = status, q = quit")
+    while True:
+        try:
+            entry = input("\n> ").strip()
+        except (EOFError, KeyboardInterrupt):
+            break
+        command, _, rest = entry.partition(' ')
+        if entry.lower() in ('q', 'quit', 'exit'):
+            break
+        if command.lower() in ('c', 'u') and rest.strip().isdigit():
+            collect_command(conn, rest.strip(), options, collected=command.lower() == 'c')
+        elif entry.lower() == 's':
+            print(collection_status(conn).to_string(index=False))
+        elif entry:
+            lookup(conn, entry)
+    print("\n👋 Desk closed")
+
+def distribute_command(positional, options):
+    """Run 'distribute <build|find|collect|uncollect|status|desk> ...' from parsed arguments"""
+    usage = [
+        "Usage: distribute build [--db distribution.db] [--voa voa_orders.csv] [--cores cores_sizes.csv] [--exes exes_sizes.csv]",
+        "       distribute find <name|phone|email|roll> [--db distribution.db]",
+        "       distribute collect <person_id> [--design name] [--desk name] [--db distribution.db]",
+        "       distribute uncollect <person_id> [--design name] [--db distribution.db]",
+        "       distribute status [--db distribution.db]",
+        "       distribute desk [--desk name] [--db distribution.db]"
+    ]
+    db_file = options.get('db', DEFAULT_DESK_DB)
+    action = positional[0] if positional else ''
+
+    if action == 'build':
+        inputs = {source: options[source] for source in SOURCE_COLUMNS if options.get(source)}
+        if not inputs:
+            print("\n".join(usage))
+            sys.exit(1)
+        for path in inputs.values():
+            if not os.path.exists(path):
+                print(f"\n❌ Error: File '{path}' not found!")
+                sys.exit(1)
+        build_index(db_file, inputs)
+        return
+
+    if action not in ('find', 'collect', 'uncollect', 'status', 'desk') or \
+            (action in ('find', 'collect', 'uncollect') and len(positional) < 2) or \
+            (action in ('collect', 'uncollect') and not positional[1].isdigit()):
+        print("\n".join(usage))
+        sys.exit(1)
+    if not os.path.exists(db_file):
+        print(f"\n❌ Error: File '{db_file}' not found! Run 'distribute build' first.")
+        sys.exit(1)
+
+    conn = connect(db_file)
+    try:
+        if action == 'find':
+            lookup(conn, ' '.join(positional[1:]))
+        elif action in ('collect', 'uncollect'):
+            collect_command(conn, positional[1], options, collected=action == 'collect')
+        elif action == 'status':
+            print(collection_status(conn).to_string(index=False))
+        else:
+            desk_mode(conn, options)
+    finally:
+        conn.close()
+
+def main():
+    """Main entry point"""
+    distribute_command(*parse_options(sys.argv[1:], VALUE_OPTIONS))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+import pandas as pd
+import numpy as np
+import sys
+import os
+from difflib import SequenceMatcher
+from registry import text_column
+from form_input import read_table, normalize_header
+from compression import write_csv
+from timestamps import parse_timestamps
+from cli import parse_options
+
+# Pairs scoring at least this are written to the review file
+DEFAULT_THRESHOLD = 0.8
+
+# Name blocks bigger than this (a very common first name) are not compared, so the work
+# stays close to linear in the number of rows. Phone and email blocks are never capped:
+# everyone sharing a number or address is always compared.
+MAX_BLOCK = 50
+
+# How much each field counts when both rows have it
+WEIGHTS = {'name': 0.5, 'phone': 0.3, 'email': 0.2}
+
+REVIEW_COLUMNS = ['score', 'row_a', 'row_b', 'name_a', 'name_b', 'contact_a', 'contact_b',
+                  'email_a', 'email_b', 'later', 'reasons']
+
+TIMESTAMP_COL = 'Timestamp'
+
+# Who filled in the form (first header present), not the name printed on the merch
+PERSON_HEADERS = {
+    'voa': {
+        'name': ['NAME'],
+        'contact': ['CONTACT NUMBER'],
+        'email': ['Email Address', 'E-MAIL']
+    },
+    'cores': {
+        'name': ['NAME'],
+        'contact': ['CONTACT NUMBER'],
+        'email': ['Email Address', 'E-MAIL']
+    },
+    'exes': {
+        'name': ['NAME'],
+        'contact': ['CONTACT NUMBER'],
+        'email': ['Email Address', 'E-MAIL']
+    }
+}
+
+VALUE_OPTIONS = {'--threshold', '--sheet'}
+
+def phone_digits(contacts):
+    """Last 10 digits of each phone number, so '+91 98765 43210' and '09876543210' match"""
+    digits = contacts.str.replace(r'\D', '', regex=True).str[-10:]
+    return digits.where(digits.str.len() == 10, '')
+
+def email_local(emails):
+    """Lower-case local part of each email, without any '+tag'"""
+    return emails.str.lower().str.split('@').str[0].str.split('+').str[0].fillna('')
+
+def name_key(names):
+    """Lower-case name words in sorted order, so 'D. Rahul' and 'Rahul D' compare equal"""
+    words = names.str.lower().str.replace(r'[^\w\s]', ' ', regex=True).str.split()
+    return words.apply(lambda parts: ' '.join(sorted(parts)))
+
+def person_frame(df, form_type):
+    """name / contact / email columns of a raw form export, plus their normalized forms"""
+    people = pd.DataFrame(index=df.index)
+    columns = {normalize_header(col): col for col in df.columns}
+    for key, headers in PERSON_HEADERS[form_type].items():
+        header = next((columns[h] for h in headers if h in columns), None)
+        people[key] = text_column(df[header]) if header else ''
+
+    # NaT when the export has no Timestamp column
+    people['submitted'] = (parse_timestamps(df[TIMESTAMP_COL]) if TIMESTAMP_COL in df.columns
+                           else pd.Series(pd.NaT, index=df.index, dtype='datetime64[ns]'))
+    people['phone'] = phone_digits(people['contact'])
+    people['local'] = email_local(people['email'])
+    people['name_key'] = name_key(people['name'])
+    return people[people['name'] != '']
+
+def blocking_keys(people):
+    """One (row, block key) pair per phone, email local part and name-word prefix"""
+    parts = [
+        ('phone:' + people['phone'])[people['phone'] != ''],
+        ('email:' + people['local'])[people['local'] != ''],
+    ]
+    # First three letters of every name word of two letters or more
+    words = people['name_key'].str.split().explode()
+    words = words[words.str.len() >= 2]
+    parts.append('name:' + words.str[:3])
+
+    keys = pd.concat(parts).rename('key').rename_axis('row').reset_index()
+    return keys.drop_duplicates()
+
+def oversized(keys, max_block=MAX_BLOCK):
+    """Which block keys are name blocks too big to compare (phone and email never are)"""
+    sizes = keys.groupby('key')['row'].transform('size')
+    return keys['key'].str.startswith('name:') & (sizes > max_block)
+
+def candidate_pairs(keys, max_block=MAX_BLOCK):
+    """Row pairs sharing at least one block, never comparing inside oversized name blocks"""
+    sizes = keys.groupby('key')['row'].transform('size')
+    keys = keys[(sizes > 1) & ~oversized(keys, max_block)]
+    pairs = keys.merge(keys, on='key', suffixes=('_a', '_b'))
+    pairs = pairs[pairs['row_a'] < pairs['row_b']]
+    return pairs[['row_a', 'row_b']].drop_duplicates().reset_index(drop=True)
+
+def similarity(left, right):
+    """difflib ratio of each pair of strings, computed once per distinct pair ('' scores 0)"""
+    pairs = pd.DataFrame({'a': left.to_numpy(), 'b': right.to_numpy()})
+    same = (pairs['a'] == pairs['b']) & (pairs['a'] != '')
+
+    distinct = pairs[~same & (pairs['a'] != '') & (pairs['b'] != '')].drop_duplicates()
+    distinct['ratio'] = [SequenceMatcher(None, a, b).ratio() for a, b in zip(distinct['a'], distinct['b'])]
+    ratio = pairs.merge(distinct, on=['a', 'b'], how='left')['ratio'].fillna(0.0).to_numpy()
+    return np.where(same, 1.0, ratio)
+
+def score_pairs(people, pairs, threshold=0.0):
+    """Weighted similarity of each candidate pair over the fields both rows have
+
+    Only pairs scoring at least threshold are returned.
+    """
+    a = people.loc[pairs['row_a']].reset_index(drop=True)
+    b = people.loc[pairs['row_b']].reset_index(drop=True)
+
+    name_sim = similarity(a['name_key'], b['name_key'])
+    has_phone = ((a['phone'] != '') & (b['phone'] != '')).to_numpy()
+    same_phone = (a['phone'] == b['phone']).to_numpy()
+    has_email = ((a['local'] != '') & (b['local'] != '')).to_numpy()
+    email_sim = similarity(a['local'], b['local'])
+
+    weight = WEIGHTS['name'] + WEIGHTS['phone'] * has_phone + WEIGHTS['email'] * has_email
+    score = (WEIGHTS['name'] * name_sim + WEIGHTS['phone'] * (same_phone & has_phone)
+             + WEIGHTS['email'] * email_sim * has_email) / weight
+
+    # Which row of the pair was submitted later (usually the one to drop)
+    later = np.select([(b['submitted'] > a['submitted']).to_numpy(), (a['submitted'] > b['submitted']).to_numpy()],
+                      ['b', 'a'], '')
+
+    keep = score >= threshold
+    a, b = a[keep], b[keep]
+    reasons = [
+        '; '.join(part for part in (
+            f"name {n:.2f}",
+            ('same phone' if p else 'different phone') if hp else '',
+            f"email {e:.2f}" if he else ''
+        ) if part)
+        for n, p, hp, e, he in zip(name_sim[keep], same_phone[keep], has_phone[keep],
+                                   email_sim[keep], has_email[keep])
+    ]
+
+    return pd.DataFrame({
+        'score': np.round(score[keep], 3),
+        'row_a': pairs['row_a'].to_numpy()[keep] + 2,  # spreadsheet rows: header line + 1-based
+        'row_b': pairs['row_b'].to_numpy()[keep] + 2,
+        'name_a': a['name'].to_numpy(), 'name_b': b['name'].to_numpy(),
+        'contact_a': a['contact'].to_numpy(), 'contact_b': b['contact'].to_numpy(),
+        'email_a': a['email'].to_numpy(), 'email_b': b['email'].to_numpy(),
+        'later': later[keep],
+        'reasons': reasons
+    })
+
+def find_duplicates(df, form_type='voa', threshold=DEFAULT_THRESHOLD, max_block=MAX_BLOCK):
+    """Likely duplicate people in a raw form export, best matches first; returns (review, stats)"""
+    people = person_frame(df.reset_index(drop=True), form_type)
+    keys = blocking_keys(people)
+    pairs = candidate_pairs(keys, max_block)
+
+    skipped = keys.loc[oversized(keys, max_block), 'key'].nunique()
+    stats = {'people': len(people), 'pairs': len(pairs), 'skipped_blocks': int(skipped)}
+
+    if pairs.empty:
+        return pd.DataFrame(columns=REVIEW_COLUMNS), stats
+
+    review = score_pairs(people, pairs, threshold)
+    return review.sort_values(['score', 'row_a'], ascending=[False, True]).reset_index(drop=True), stats
+
+def duplicates_file(input_file, output_file='duplicates_review.csv', form_type='voa',
+                    threshold=DEFAULT_THRESHOLD, sheet=None):
+    """Write a scored review file of likely duplicate people in a form export
+
+    With output_file=None nothing is written, the best matches are only printed.
+    """
+    print(f"\n🔎 Looking for duplicate people in: {input_file}")
+    usecols = {header for headers in PERSON_HEADERS[form_type].values() for header in headers}
+    df = read_table(input_file, usecols=usecols | {TIMESTAMP_COL}, sheet=sheet)
+    if not any(header in df.columns for header in PERSON_HEADERS[form_type]['name']):
+        print(f"⚠️  No {' / '.join(PERSON_HEADERS[form_type]['name'])} column in this export, so nobody can be compared")
+    review, stats = find_duplicates(df, form_type, float(threshold))
+
+    print(f"✓ Compared {stats['pairs']} candidate pairs among {stats['people']} people")
+    if stats['skipped_blocks']:
+        print(f"⚠️  {stats['skipped_blocks']} name blocks with more than {MAX_BLOCK} people were not compared "
+              "(shared phones and emails always are)")
+
+    if len(review) == 0:
+        print("✅ No likely duplicates found!")
+        return review
+
+    if output_file is None:
+        print(f"\n🔎 {len(review)} likely duplicates (not saved in a dry run):")
+    else:
+        print(f"\n💾 Saving {len(review)} likely duplicates to {output_file}...")
+        write_csv(review, output_file)
+    print(review.head(10)[['score', 'row_a', 'row_b', 'name_a', 'name_b', 'reasons']].to_string(index=False))
+    return review
+
+def duplicates_command(positional, options):
+    """Run 'duplicates <voa|cores|exes> <input_file> [review_file]' from parsed command-line arguments"""
+    if len(positional) < 2 or positional[0] not in PERSON_HEADERS:
+        print("Usage: duplicates <voa|cores|exes> <input_file> [review_file] [--threshold 0.8] [--sheet name]")
+        sys.exit(1)
+
+    form_type, input_file = positional[0], positional[1]
+    if not os.path.exists(input_file):
+        print(f"\n❌ Error: File '{input_file}' not found!")
+        sys.exit(1)
+
+    output_file = positional[2] if len(positional) > 2 else 'duplicates_review.csv'
+    duplicates_file(input_file, output_file, form_type, options.get('threshold', DEFAULT_THRESHOLD),
+                    options.get('sheet'))
+
+def main():
+    """Main entry point"""
+    duplicates_command(*parse_options(sys.argv[1:], VALUE_OPTIONS))
+
+if __name__ == "__main__":
+    main()
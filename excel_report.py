@@ -0,0 +1,164 @@
+import re
+from form_input import iter_table, read_table
+from production import production_matrix
+
+# Optional: the Excel report is written with xlsxwriter (faster) or else openpyxl
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+# Rows per worksheet Excel can open (one of them is the header)
+EXCEL_MAX_ROWS = 1_048_576
+
+# Characters Excel does not allow in sheet names, and their length limit
+SHEET_NAME_CHARS = r'[\[\]:*?/\\]'
+SHEET_NAME_LENGTH = 31
+
+# Text openpyxl would store as a formula unless the cell is marked as a string
+FORMULA_PREFIXES = ('=', '+', '-', '@')
+
+class ReportBook:
+    """Write-only workbook that keeps only the current row of each sheet in memory
+
+    Uses xlsxwriter in constant_memory mode, or openpyxl in write_only mode when only
+    openpyxl is installed. Rows have to be appended in order, sheet by sheet. Text is
+    always written as text, so a form answer starting with '=' never becomes a formula.
+    """
+
+    def __init__(self, path):
+        if xlsxwriter is None and openpyxl is None:
+            raise ImportError("The Excel report needs xlsxwriter or openpyxl (pip install xlsxwriter)")
+        self.path = path
+        self.names = set()
+        if xlsxwriter is not None:
+            self.book = xlsxwriter.Workbook(path, {'constant_memory': True, 'strings_to_formulas': False,
+                                                   'strings_to_urls': False})
+            self.bold = self.book.add_format({'bold': True})
+        else:
+            self.book = openpyxl.Workbook(write_only=True)
+
+    def sheet_name(self, name):
+        """A valid sheet name, unique within the workbook"""
+        base = re.sub(SHEET_NAME_CHARS, '_', str(name)).strip("' ") or 'Sheet'
+        base = base[:SHEET_NAME_LENGTH]
+        candidate, n = base, 2
+        while candidate.lower() in self.names:
+            suffix = f" ({n})"
+            candidate, n = base[:SHEET_NAME_LENGTH - len(suffix)] + suffix, n + 1
+        self.names.add(candidate.lower())
+        return candidate
+
+    def add_sheet(self, name, header, widths=None):
+        """Start a sheet with a bold, frozen header row; returns the sheet handle for append"""
+        name = self.sheet_name(name)
+        if xlsxwriter is not None:
+            sheet = self.book.add_worksheet(name)
+            for col, width in enumerate(widths or []):
+                sheet.set_column(col, col, width)
+            sheet.freeze_panes(1, 0)
+            sheet.write_row(0, 0, header, self.bold)
+            return {'sheet': sheet, 'row': 1}
+
+        sheet = self.book.create_sheet(name)
+        for col, width in enumerate(widths or []):
+            sheet.column_dimensions[openpyxl.utils.get_column_letter(col + 1)].width = width
+        sheet.freeze_panes = 'A2'
+        sheet.append(header)
+        return {'sheet': sheet, 'row': 1}
+
+    def append(self, handle, values):
+        """Write the next row of a sheet"""
+        self.append_rows(handle, [values])
+
+    def append_rows(self, handle, rows):
+        """Write a batch of rows (lists of values) after the last row of a sheet"""
+        if xlsxwriter is not None:
+            write_row = handle['sheet'].write_row
+            for row, values in enumerate(rows, handle['row']):
+                write_row(row, 0, values)
+        else:
+            sheet = handle['sheet']
+            for values in rows:
+                sheet.append([self.text_cell(sheet, value) if isinstance(value, str) and value.startswith(FORMULA_PREFIXES)
+                              else value for value in values])
+        handle['row'] += len(rows)
+
+    @staticmethod
+    def text_cell(sheet, value):
+        """openpyxl cell that keeps a formula-like string as text"""
+        cell = openpyxl.cell.WriteOnlyCell(sheet, value=value)
+        cell.data_type = 's'
+        return cell
+
+    def close(self):
+        if xlsxwriter is not None:
+            self.book.close()
+        else:
+            self.book.save(self.path)
+
+def write_table(book, name, table, widths=None):
+    """A small DataFrame as one sheet (index written as the first columns)"""
+    table = table.reset_index()
+    handle = book.add_sheet(name, [str(col) for col in table.columns], widths)
+    book.append_rows(handle, table.to_numpy(dtype=object).tolist())
+
+def orders_header(orders_files):
+    """Every column of the order files, in the order first seen ('file' last with several files)"""
+    header = []
+    for path in orders_files:
+        columns = read_table(path, dtype=str, nrows=0).columns
+        header += [col for col in columns if col not in header]
+    return header + (['file'] if len(orders_files) > 1 else [])
+
+def write_orders(book, orders_files):
+    """Stream every order line into 'Orders' sheets, starting a new one at Excel's row limit
+
+    Files are read in chunks, so memory stays flat however many lines there are. The
+    sheets have every column of every file (blank where a file lacks one); with several
+    files a 'file' column says where each line came from.
+    """
+    header = orders_header(orders_files)
+    handle, lines = None, 0
+    for path in orders_files:
+        for chunk in iter_table(path, dtype=str, keep_default_na=False):
+            if len(orders_files) > 1:
+                chunk['file'] = path
+            rows = chunk.reindex(columns=header, fill_value='').to_numpy(dtype=object).tolist()
+            while rows:
+                if handle is None or handle['row'] >= EXCEL_MAX_ROWS:
+                    handle = book.add_sheet('Orders', header, [20] * len(header))
+                room = EXCEL_MAX_ROWS - handle['row']
+                book.append_rows(handle, rows[:room])
+                lines += min(room, len(rows))
+                rows = rows[room:]
+    return lines
+
+def write_xlsx_report(summary, xlsx_file, orders_files=None):
+    """Printer's workbook: a design x size matrix sheet, one sheet per design, optional order lines
+
+    summary is the design/size/quantity table of generate_printing_summary. With
+    orders_files the per-person order lines are streamed in after the summary sheets.
+    """
+    print(f"\n📗 Writing Excel report to {xlsx_file}...")
+    book = ReportBook(xlsx_file)
+
+    matrix = production_matrix(summary, ['design'])
+    write_table(book, 'Matrix', matrix, [18] + [8] * len(matrix.columns))
+
+    for design in summary['design'].unique():
+        sizes = summary[summary['design'] == design][['size', 'quantity']]
+        handle = book.add_sheet(design, ['size', 'quantity'], [16, 10])
+        for size, quantity in zip(sizes['size'], sizes['quantity'].tolist()):
+            book.append(handle, [size, quantity])
+        book.append(handle, ['TOTAL', int(sizes['quantity'].sum())])
+
+    lines = write_orders(book, orders_files) if orders_files else 0
+    book.close()
+
+    sheets = 1 + summary['design'].nunique()
+    print(f"✓ {sheets} summary sheets" + (f" and {lines:,} order lines" if orders_files else ''))
@@ -1,6 +1,7 @@
-import pandas as pd
 import sys
 import os
+from registry import convert_form, map_domain, CONVERT_OPTIONS
+from cli import parse_options
 
 def print_banner():
     """Print application banner"""
@@ -9,79 +10,9 @@ def print_banner():
     print("  Extract name, domain, and size for distribution")
     print("="*60 + "\n")
 
-def map_domain(domain):
-    """Map domain names from Google Form to standard format"""
-    domain_mapping = {
-        'Sponsorship & Marketing': 'Sponsorship',
-        'Media & Public Relations': 'Media and PR',
-        'Design & Editing': 'Design & Editing',
-        'Vigyaan': 'Vigyaan',
-        'Event Management': 'Event Management',
-        'Tech': 'Tech',
-        'Documentation': 'Documentation'
-    }
-    return domain_mapping.get(domain.strip(), domain.strip())
-
-def extract_size_data(input_file, output_file, file_type='cores'):
+def extract_size_data(input_file, output_file, file_type='cores', options=None, progress=None):
     """Extract name, domain, and size from Google Form data"""
-    print(f"\n📋 Reading {file_type} data from: {input_file}")
-    
-    # Read the CSV file
-    df = pd.read_csv(input_file)
-    print(f"✓ Found {len(df)} entries")
-    
-    output_data = []
-    skipped = 0
-    
-    for idx, row in df.iterrows():
-        # Extract fields
-        name_full = str(row['Name On Merch:']).strip()
-        domain_raw = str(row['Domain']).strip()
-        size = str(row['Mention Your Size:']).strip()
-        
-        # Skip rows with missing critical data
-        if name_full == 'nan' or name_full == '' or domain_raw == 'nan' or domain_raw == '':
-            print(f"⚠️  Skipping row {idx+2} - missing name or domain")
-            skipped += 1
-            continue
-        
-        # Shorten name if too long
-        if len(name_full) > 12:
-            name = name_full.split()[0]
-        else:
-            name = name_full
-        
-        domain = map_domain(domain_raw)
-        
-        # Handle invalid size
-        if size == 'nan' or size == '':
-            size = 'NOT SPECIFIED'
-            print(f"⚠️  {name}: Size not specified")
-        
-        # Create output row
-        output_row = {
-            'name': name,
-            'domain': domain,
-            'size': size.upper()
-        }
-        
-        output_data.append(output_row)
-    
-    # Create DataFrame
-    output_df = pd.DataFrame(output_data)
-    
-    # Save to CSV
-    print(f"\n💾 Saving to {output_file}...")
-    output_df.to_csv(output_file, index=False)
-    
-    print(f"✅ Extraction complete! {len(output_df)} records processed ({skipped} skipped).")
-    
-    # Show size breakdown
-    print(f"\n📊 Size breakdown:")
-    print(output_df['size'].value_counts().to_string())
-    
-    print(f"\n📊 Domain breakdown:")
-    print(output_df['domain'].value_counts().to_string())
+    return convert_form('sizes', input_file, output_file, label=file_type, options=options, progress=progress)
 
 def interactive_mode():
     """Run in interactive mode"""
@@ -130,16 +61,18 @@ def main():
     """Main entry point"""
     if len(sys.argv) > 1:
         # Command-line mode
-        if sys.argv[1] in ['cores', 'exes']:
-            if len(sys.argv) < 3:
-                print(f"Usage: python extract_sizes.py {sys.argv[1]} <input_file> [output_file]")
+        args, options = parse_options(sys.argv[1:], CONVERT_OPTIONS)
+        if args and args[0] in ['cores', 'exes']:
+            if len(args) < 2:
+                print(f"Usage: python extract_sizes.py {args[0]} <input_file> [output_file] [--sheet name] "
+                      "[--dry-run | --sample N] [--jobs N]")
                 sys.exit(1)
             
-            file_type = sys.argv[1]
-            input_file = sys.argv[2]
-            output_file = sys.argv[3] if len(sys.argv) > 3 else f"{file_type}_sizes.csv"
+            file_type = args[0]
+            input_file = args[1]
+            output_file = args[2] if len(args) > 2 else f"{file_type}_sizes.csv"
             
-            extract_size_data(input_file, output_file, file_type)
+            extract_size_data(input_file, output_file, file_type, options)
         else:
             print("Unknown command. Use 'cores' or 'exes'")
             print("\nExamples:")
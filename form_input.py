@@ -0,0 +1,385 @@
+import pandas as pd
+import numpy as np
+import codecs
+import csv
+import io
+import os
+import re
+from progress import CHUNK_ROWS, report
+from compression import compression_of, open_input
+
+# Optional: only needed for Excel workbooks
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+try:
+    import xlrd
+except ImportError:
+    xlrd = None
+
+# How much of a file is looked at to pick the encoding and delimiter
+SAMPLE_SIZE = 64 * 1024
+
+# Byte order marks, checked before anything else (Excel adds the UTF-8 one on save)
+BOMS = [
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16')
+]
+
+# Tried in this order; cp1252 is what older Windows laptops save, latin-1 never fails
+FALLBACK_ENCODINGS = ['cp1252', 'latin-1']
+
+DELIMITERS = [',', ';', '\t', '|']
+
+WORKBOOK_EXTENSIONS = ('.xlsx', '.xlsm', '.xls')
+
+def normalize_header(header):
+    """Collapse whitespace and newlines in a header so question text matches however it was saved"""
+    return re.sub(r'\s+', ' ', str(header)).strip()
+
+def normalize_headers(columns):
+    """Normalize every header, numbering any that become duplicates ('Name', 'Name.1', ...)"""
+    seen = {}
+    result = []
+    for column in columns:
+        name = normalize_header(column)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        result.append(name)
+    return result
+
+def detect_encoding(sample):
+    """Pick the encoding of a file from its first bytes"""
+    for bom, encoding in BOMS:
+        if sample.startswith(bom):
+            return encoding
+
+    try:
+        sample.decode('utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError as e:
+        # The sample may end in the middle of a multi-byte character
+        if e.reason == 'unexpected end of data' and e.start >= len(sample) - 3:
+            return 'utf-8'
+
+    for encoding in FALLBACK_ENCODINGS:
+        try:
+            sample.decode(encoding)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return 'latin-1'
+
+def _record_widths(text, delimiter, complete):
+    """Field count of each record in the sample (multi-line quoted headers count as one record)"""
+    widths = [len(record) for record in csv.reader(io.StringIO(text), delimiter=delimiter) if record]
+    # The last record of a cut-off sample is usually incomplete
+    return widths if complete else widths[:-1]
+
+def detect_delimiter(text, complete=True):
+    """The delimiter that splits the header into the most columns, consistently across rows"""
+    best, best_width = ',', 1
+    for delimiter in DELIMITERS:
+        widths = _record_widths(text, delimiter, complete)
+        if not widths or widths[0] <= best_width:
+            continue
+        rows = widths[1:]
+        if not rows or sum(width == widths[0] for width in rows) * 2 >= len(rows):
+            best, best_width = delimiter, widths[0]
+    return best
+
+def detect_quotechar(text, delimiter):
+    """Quote character of the file: '"' unless the sample has none and single quotes wrap fields"""
+    if '"' in text:
+        return '"'
+    wrapped = text.count(delimiter + "'") + text.count("'" + delimiter)
+    return "'" if wrapped else '"'
+
+def sniff_file(input_file):
+    """Read the first SAMPLE_SIZE bytes once and work out how to parse the whole file
+
+    Compressed files (.csv.gz, .csv.zst) are sniffed on their decompressed start.
+    """
+    with open_input(input_file) as f:
+        sample = f.read(SAMPLE_SIZE)
+
+    encoding = detect_encoding(sample)
+    complete = len(sample) < SAMPLE_SIZE
+    text = sample.decode(encoding, errors='ignore')
+    delimiter = detect_delimiter(text, complete)
+
+    return {
+        'encoding': encoding,
+        'delimiter': delimiter,
+        'quotechar': detect_quotechar(text, delimiter)
+    }
+
+def is_workbook(input_file):
+    """True for Excel files (.xlsx/.xlsm/.xls)"""
+    return os.path.splitext(input_file)[1].lower() in WORKBOOK_EXTENSIONS
+
+def _pick_sheet(names, sheet):
+    """Sheet name from a --sheet value: a name, a 1-based number, or None for the first sheet"""
+    if sheet is None:
+        return names[0]
+    if sheet in names:
+        return sheet
+    if str(sheet).isdigit() and 1 <= int(sheet) <= len(names):
+        return names[int(sheet) - 1]
+    raise KeyError(f"No sheet '{sheet}' in the workbook (sheets: {', '.join(names)})")
+
+def _xlsx_rows(input_file, sheet):
+    """Stream the cell values of one .xlsx sheet, row by row, without building the workbook model"""
+    if openpyxl is None:
+        raise ImportError("Reading .xlsx files needs openpyxl (pip install openpyxl)")
+
+    workbook = openpyxl.load_workbook(input_file, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[_pick_sheet(workbook.sheetnames, sheet)]
+        for row in worksheet.iter_rows(values_only=True):
+            yield row
+    finally:
+        workbook.close()
+
+def _xls_rows(input_file, sheet):
+    """Cell values of one legacy .xls sheet, loading only that sheet"""
+    if xlrd is None:
+        raise ImportError("Reading .xls files needs xlrd (pip install xlrd)")
+
+    workbook = xlrd.open_workbook(input_file, on_demand=True)
+    try:
+        worksheet = workbook.sheet_by_name(_pick_sheet(workbook.sheet_names(), sheet))
+        for i in range(worksheet.nrows):
+            row = worksheet.row(i)
+            yield [xlrd.xldate.xldate_as_datetime(cell.value, workbook.datemode)
+                   if cell.ctype == xlrd.XL_CELL_DATE else cell.value for cell in row]
+    finally:
+        workbook.release_resources()
+
+def _cell_text(value):
+    """A workbook cell as it would appear in a CSV export"""
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+# Workbook rows parsed per batch, so a big sheet is never held as one block of CSV text
+WORKBOOK_BATCH_ROWS = CHUNK_ROWS
+
+def _parse_rows(names, rows, **kwargs):
+    """Parse a batch of cell-text rows with pandas.read_csv"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(names)
+    writer.writerows(rows)
+    buffer.seek(0)
+    return pd.read_csv(buffer, **kwargs)
+
+def _join_batches(batches):
+    """Concatenate batches parsed on their own, typed as if they had been one CSV
+
+    A column that is text in any batch is text in every batch (a numeric batch is
+    turned back into the cell text it was parsed from); numeric columns widen on concat.
+    """
+    if len(batches) == 1:
+        return batches[0]
+    for col in batches[0].columns:
+        text = [batch[col].dtype for batch in batches if not pd.api.types.is_numeric_dtype(batch[col])]
+        if text and len(text) < len(batches):
+            for batch in batches:
+                if pd.api.types.is_numeric_dtype(batch[col]):
+                    values = batch[col].astype(object)
+                    batch[col] = values.where(values.isna(), values.map(_cell_text)).astype(text[0])
+    return pd.concat(batches, ignore_index=True)
+
+def read_workbook(input_file, usecols=None, sheet=None, progress=None, **kwargs):
+    """Read one sheet of an Excel workbook into the same DataFrame a CSV export would give
+
+    Rows are streamed and only the wanted columns are kept. Every WORKBOOK_BATCH_ROWS of
+    them are written as CSV text and parsed by pandas.read_csv, so types and blanks come
+    out as for CSV input while only one batch of text is held at a time. nrows stops
+    reading the sheet early.
+    """
+    rows = _xls_rows(input_file, sheet) if input_file.lower().endswith('.xls') else _xlsx_rows(input_file, sheet)
+
+    header = next(rows, None)
+    if header is None:
+        return pd.DataFrame()
+
+    header = normalize_headers(_cell_text(cell) for cell in header)
+    keep = [i for i, name in enumerate(header) if usecols is None or usecols(name)]
+    names = [header[i] for i in keep]
+    nrows = kwargs.pop('nrows', None)
+
+    batches, batch, count = [], [], 0
+    for row in rows:
+        if nrows is not None and count >= nrows:
+            break
+        if not any(cell not in (None, '') for cell in row):
+            continue
+        batch.append([_cell_text(row[i]) if i < len(row) else '' for i in keep])
+        count += 1
+        if len(batch) == WORKBOOK_BATCH_ROWS:
+            batches.append(_parse_rows(names, batch, **kwargs))
+            batch = []
+        if count % 1000 == 0:
+            report(progress, 'read', count)
+    rows.close()
+    if batch or not batches:
+        batches.append(_parse_rows(names, batch, **kwargs))
+
+    df = _join_batches(batches)
+    report(progress, 'read', len(df), len(df))
+    return df
+
+def _read_csv_chunks(input_file, dialect, progress, **kwargs):
+    """read_csv in CHUNK_ROWS pieces, reporting rows read and an estimate of the total"""
+    # Only an uncompressed file's position says how far through it the parser is
+    size = None if compression_of(input_file) else os.path.getsize(input_file)
+    chunks = []
+    with open_input(input_file) as f:
+        reader = pd.read_csv(f, sep=dialect['delimiter'], quotechar=dialect['quotechar'],
+                             encoding=dialect['encoding'], chunksize=CHUNK_ROWS, **kwargs)
+        rows = 0
+        for chunk in reader:
+            chunks.append(chunk)
+            rows += len(chunk)
+            # The parser reads ahead, so the file position gives a rough total
+            position = f.tell() if size else 0
+            report(progress, 'read', rows, max(rows, round(rows * size / position)) if position else None)
+
+    if not chunks:
+        return pd.read_csv(input_file, sep=dialect['delimiter'], quotechar=dialect['quotechar'],
+                           encoding=dialect['encoding'], **kwargs)
+    df = pd.concat(chunks) if len(chunks) > 1 else chunks[0]
+    report(progress, 'read', len(df), len(df))
+    return df
+
+def read_table(input_file, usecols=None, sheet=None, progress=None, **kwargs):
+    """Read a form export in one pass with sniffed settings and normalized headers
+
+    usecols may be a collection of (normalized) header names or a function called
+    with each normalized header. Excel workbooks are read from the given sheet (name or
+    1-based number, first sheet by default). progress is an optional callback (see
+    progress.py) told how many rows have been read. Extra keyword arguments go to
+    pandas.read_csv.
+    """
+    wanted = None
+    if usecols is not None:
+        wanted = usecols if callable(usecols) else set(map(normalize_header, usecols)).__contains__
+
+    if is_workbook(input_file):
+        return read_workbook(input_file, wanted, sheet, progress, **kwargs)
+
+    dialect = sniff_file(input_file)
+    if wanted is not None:
+        kwargs['usecols'] = lambda col: wanted(normalize_header(col))
+
+    if progress is not None:
+        df = _read_csv_chunks(input_file, dialect, progress, **kwargs)
+    else:
+        df = pd.read_csv(input_file, sep=dialect['delimiter'], quotechar=dialect['quotechar'],
+                         encoding=dialect['encoding'], **kwargs)
+    df.columns = normalize_headers(df.columns)
+    return df
+
+def iter_table(input_file, usecols=None, chunk_rows=CHUNK_ROWS, sheet=None, **kwargs):
+    """Like read_table, but yields the rows chunk_rows at a time to keep memory bounded
+
+    Excel workbooks are yielded as one chunk (their rows are already streamed in).
+    """
+    if is_workbook(input_file):
+        yield read_table(input_file, usecols, sheet, **kwargs)
+        return
+
+    dialect = sniff_file(input_file)
+    if usecols is not None:
+        wanted = usecols if callable(usecols) else set(map(normalize_header, usecols)).__contains__
+        kwargs['usecols'] = lambda col: wanted(normalize_header(col))
+
+    with pd.read_csv(input_file, sep=dialect['delimiter'], quotechar=dialect['quotechar'],
+                     encoding=dialect['encoding'], chunksize=chunk_rows, **kwargs) as reader:
+        for chunk in reader:
+            chunk.columns = normalize_headers(chunk.columns)
+            yield chunk
+
+# Rows kept by --sample are picked with this seed, so a sample run can be repeated
+SAMPLE_SEED = 0
+
+def parse_sample(value):
+    """A --sample value as a row count (int, e.g. '500') or a fraction (float, e.g. '0.05')"""
+    number = float(value)
+    if number >= 1 and number.is_integer():
+        return int(number)
+    if 0 < number < 1:
+        return number
+    raise ValueError(f"--sample must be a row count or a fraction between 0 and 1 (got {value})")
+
+def sample_table(input_file, sample, usecols=None, sheet=None, seed=SAMPLE_SEED):
+    """Random rows of a form export, read chunk by chunk; returns (rows in file order, total rows)
+
+    An int sample keeps that many rows (reservoir sampling: every row gets a random key and
+    the smallest keys seen so far are kept), a float keeps each row with that probability.
+    Only the sample and one chunk are ever held in memory.
+    """
+    rng = np.random.default_rng(seed)
+    kept, keys = None, np.empty(0)
+    total = 0
+    for chunk in iter_table(input_file, usecols, sheet=sheet):
+        total += len(chunk)
+        chunk_keys = rng.random(len(chunk))
+        if isinstance(sample, float):
+            chunk = chunk[chunk_keys < sample]
+            kept = chunk if kept is None else pd.concat([kept, chunk])
+            continue
+
+        kept = chunk if kept is None else pd.concat([kept, chunk])
+        keys = np.concatenate([keys, chunk_keys])
+        if len(kept) > sample:
+            best = np.argpartition(keys, sample)[:sample]
+            kept, keys = kept.iloc[best], keys[best]
+
+    if kept is None:
+        return read_table(input_file, usecols, sheet, nrows=0), 0
+    return kept.sort_index(), total
+
+def read_head(input_file, rows, usecols=None, sheet=None):
+    """The first rows of a form export and an estimate of the file's total rows (None if unknown)
+
+    The estimate scales the file size by the bytes those rows take, so only the start of
+    the file is read. Compressed files and workbooks give no estimate.
+    """
+    df = read_table(input_file, usecols, sheet, nrows=rows)
+    if len(df) < rows:
+        return df, len(df)
+    if is_workbook(input_file) or compression_of(input_file):
+        return df, None
+
+    dialect = sniff_file(input_file)
+    encoding = 'utf-8' if dialect['encoding'] == 'utf-8-sig' else dialect['encoding']
+    consumed = [0]
+
+    def counted(lines):
+        for line in lines:
+            consumed[0] += len(line.encode(encoding, errors='replace'))
+            yield line
+
+    with open(input_file, encoding=dialect['encoding'], errors='replace', newline='') as f:
+        records = csv.reader(counted(f), delimiter=dialect['delimiter'], quotechar=dialect['quotechar'])
+        next(records, None)
+        header_bytes = consumed[0]
+        read = 0
+        for record in records:
+            read += bool(record)
+            if read >= rows:
+                break
+
+    row_bytes = (consumed[0] - header_bytes) / max(read, 1)
+    return df, max(rows, round((os.path.getsize(input_file) - header_bytes) / row_bytes))
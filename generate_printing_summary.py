@@ -1,6 +1,11 @@
 import pandas as pd
 import sys
 import os
+from registry import SIZE_ORDER
+from form_input import iter_table
+from excel_report import write_xlsx_report
+from compression import write_csv
+from cli import parse_options
 
 def print_banner():
     """Print application banner"""
@@ -9,26 +14,18 @@ def print_banner():
     print("  Generate size counts for each design")
     print("="*60 + "\n")
 
-def generate_printing_summary(input_file, output_file):
-    """Generate printing summary from VOA orders"""
-    print(f"\n📋 Reading orders from: {input_file}")
-    
-    # Read the orders file
-    df = pd.read_csv(input_file)
-    print(f"✓ Found {len(df)} order items")
-    
-    # Group by design and size, count occurrences
-    summary = df.groupby(['design', 'size']).size().reset_index(name='quantity')
-    
-    # Sort by design and size
-    size_order = {'S': 1, 'M': 2, 'L': 3, 'XL': 4, 'XXL': 5}
-    summary['size_order'] = summary['size'].map(lambda x: size_order.get(x, 999))
+def sort_summary(summary):
+    """Order a design/size/quantity table by design, then by size (S to XXL)"""
+    summary = summary.copy()
+    summary['size_order'] = summary['size'].map(lambda x: SIZE_ORDER.get(x, 999))
     summary = summary.sort_values(['design', 'size_order'])
-    summary = summary.drop('size_order', axis=1)
-    
+    return summary.drop('size_order', axis=1)
+
+def write_summary(summary, output_file, level=None):
+    """Save the summary CSV (compressed for .gz/.zst) and show it design by design"""
     # Save to CSV
     print(f"\n💾 Saving to {output_file}...")
-    summary.to_csv(output_file, index=False)
+    write_csv(summary, output_file, level)
     
     print(f"✅ Summary complete!\n")
     
@@ -56,6 +53,52 @@ def generate_printing_summary(input_file, output_file):
     for size, count in size_totals.items():
         print(f"  {size:6s} : {count:3d} pcs")
 
+def merge_counts(parts):
+    """Add up design x size count Series (one per chunk or file) into one"""
+    if not parts:
+        return pd.Series(0, index=pd.MultiIndex.from_tuples([], names=['design', 'size']), dtype='int64')
+    return pd.concat(parts).groupby(level=['design', 'size']).sum()
+
+def count_orders(input_file):
+    """Count (design, size) pairs of an orders file chunk by chunk; returns (counts, lines)"""
+    parts = []
+    lines = 0
+    for chunk in iter_table(input_file, usecols=['design', 'size']):
+        lines += len(chunk)
+        # Keep only the small per-chunk counter, never the rows themselves
+        parts = [merge_counts(parts + [chunk.groupby(['design', 'size']).size()])]
+    return merge_counts(parts), lines
+
+def generate_printing_summary(input_file, output_file, xlsx_file=None, orders_sheet=False, level=None):
+    """Generate printing summary from VOA orders (one file or a list of files, counts merged)
+
+    Files are read in chunks into a design x size counter, so memory does not grow
+    with the number of order lines. With xlsx_file the printer's Excel workbook is
+    written too (with every order line when orders_sheet is set). level is the
+    compression level of a .gz/.zst output_file.
+    """
+    input_files = [input_file] if isinstance(input_file, str) else list(input_file)
+    parts = []
+
+    for path in input_files:
+        print(f"\n📋 Reading orders from: {path}")
+        counts, lines = count_orders(path)
+        print(f"✓ Found {lines} order items")
+        parts.append(counts)
+
+    # Group by design and size, count occurrences
+    summary = merge_counts(parts).reset_index(name='quantity')
+    
+    summary = sort_summary(summary)
+    write_summary(summary, output_file, level)
+    if xlsx_file:
+        write_xlsx_report(summary, xlsx_file, input_files if orders_sheet else None)
+
+def summary_inputs(input_file, options):
+    """The main orders file plus any --merge files (comma separated)"""
+    extra = [path.strip() for path in options.get('merge', '').split(',') if path.strip()]
+    return [input_file] + extra
+
 def interactive_mode():
     """Run in interactive mode"""
     print_banner()
@@ -86,11 +129,14 @@ def main():
     """Main entry point"""
     if len(sys.argv) > 1:
         # Command-line mode
-        input_file = sys.argv[1]
-        output_file = sys.argv[2] if len(sys.argv) > 2 else "printing_summary.csv"
+        args, options = parse_options(sys.argv[1:], {'--merge', '--xlsx', '--compress-level'})
+        input_file = args[0]
+        output_file = args[1] if len(args) > 1 else "printing_summary.csv"
         
         try:
-            generate_printing_summary(input_file, output_file)
+            generate_printing_summary(summary_inputs(input_file, options), output_file,
+                                      options.get('xlsx'), bool(options.get('orders-sheet')),
+                                      options.get('compress-level'))
         except Exception as e:
             print(f"\n❌ Error: {e}")
             import traceback
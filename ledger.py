@@ -0,0 +1,192 @@
+import pandas as pd
+import sqlite3
+import sys
+import os
+from registry import SIZE_ORDER
+from generate_printing_summary import sort_summary, write_summary
+from form_input import read_table
+from compression import with_compression
+from cli import parse_options
+
+DEFAULT_LEDGER = 'merch_ledger.db'
+
+# Which table each converter output goes into, and the columns kept from it
+SOURCES = {
+    'voa': ('orders', ['name', 'email', 'contact', 'residency', 'design', 'size']),
+    'cores': ('roster', ['name', 'domain', 'number']),
+    'exes': ('roster', ['name', 'domain']),
+    'sizes': ('roster', ['name', 'domain', 'size'])
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS orders (
+    id INTEGER PRIMARY KEY,
+    event TEXT NOT NULL,
+    source TEXT NOT NULL,
+    name TEXT NOT NULL,
+    email TEXT,
+    contact TEXT,
+    residency TEXT,
+    design TEXT NOT NULL,
+    size TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS roster (
+    id INTEGER PRIMARY KEY,
+    event TEXT NOT NULL,
+    source TEXT NOT NULL,
+    name TEXT NOT NULL,
+    domain TEXT,
+    number INTEGER,
+    size TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_orders_event ON orders (event, source);
+CREATE INDEX IF NOT EXISTS idx_orders_email ON orders (email);
+CREATE INDEX IF NOT EXISTS idx_orders_contact ON orders (contact);
+CREATE INDEX IF NOT EXISTS idx_orders_design_size ON orders (design, size);
+CREATE INDEX IF NOT EXISTS idx_orders_size ON orders (size);
+CREATE INDEX IF NOT EXISTS idx_orders_residency ON orders (residency);
+CREATE INDEX IF NOT EXISTS idx_roster_event ON roster (event, source);
+CREATE INDEX IF NOT EXISTS idx_roster_size ON roster (size);
+"""
+
+# S..XXL first, anything else after, for ORDER BY
+SIZE_RANK_SQL = "CASE size " + " ".join(f"WHEN '{size}' THEN {rank}" for size, rank in SIZE_ORDER.items()) + " ELSE 999 END"
+
+def connect(db_file=DEFAULT_LEDGER):
+    """Open (and create if needed) a ledger database"""
+    conn = sqlite3.connect(db_file)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+def _event_filter(events):
+    """WHERE clause and parameters limiting a query to some events (all if empty)"""
+    if not events:
+        return "", []
+    return f"WHERE event IN ({', '.join('?' * len(events))})", list(events)
+
+def import_frame(conn, df, event, source):
+    """Replace an event's rows from one source with the rows of a converter output"""
+    if source not in SOURCES:
+        raise ValueError(f"Unknown source '{source}'. Use: {', '.join(SOURCES)}")
+
+    table, columns = SOURCES[source]
+    missing = [col for col in columns if col not in df.columns]
+    if missing:
+        raise KeyError(f"{source} output is missing column(s): {', '.join(missing)}")
+
+    values = df[columns].astype(object).where(df[columns].notna(), None)
+    rows = [(event, source, *row) for row in values.itertuples(index=False, name=None)]
+    placeholders = ', '.join('?' * (len(columns) + 2))
+
+    # One transaction: a re-import swaps the old rows for the new ones or does nothing
+    with conn:
+        conn.execute(f"DELETE FROM {table} WHERE event = ? AND source = ?", (event, source))
+        conn.executemany(f"INSERT INTO {table} (event, source, {', '.join(columns)}) VALUES ({placeholders})", rows)
+
+    return len(rows)
+
+def import_file(db_file, input_file, event, source):
+    """Import a converter output CSV into the ledger"""
+    print(f"\n📋 Reading {source} output from: {input_file}")
+    df = read_table(input_file, dtype=str, keep_default_na=False)
+
+    return record_output(db_file, df, event, source)
+
+def record_output(db_file, df, event, source):
+    """Import a converter's output DataFrame straight into the ledger"""
+    conn = connect(db_file)
+    try:
+        count = import_frame(conn, df, event, source)
+    finally:
+        conn.close()
+
+    print(f"📒 Recorded {count} rows in {db_file} (event '{event}', source '{source}')")
+    return count
+
+def order_summary(conn, events=None):
+    """design/size/quantity counts over the chosen events, as a DataFrame"""
+    where, params = _event_filter(events)
+    query = f"SELECT design, size, COUNT(*) AS quantity FROM orders {where} GROUP BY design, size"
+    return sort_summary(pd.read_sql_query(query, conn, params=params))
+
+def size_breakdown(conn, events=None, table='roster'):
+    """Count per size over the chosen events"""
+    where, params = _event_filter(events)
+    where = f"{where} AND size IS NOT NULL" if where else "WHERE size IS NOT NULL"
+    query = (f"SELECT size, COUNT(*) AS quantity FROM {table} {where} "
+             f"GROUP BY size ORDER BY {SIZE_RANK_SQL}, size")
+    return pd.read_sql_query(query, conn, params=params)
+
+def list_events(conn):
+    """Row counts per event and source"""
+    query = ("SELECT event, source, COUNT(*) AS rows FROM orders GROUP BY event, source "
+             "UNION ALL SELECT event, source, COUNT(*) FROM roster GROUP BY event, source "
+             "ORDER BY event, source")
+    return pd.read_sql_query(query, conn)
+
+def ledger_printing_summary(db_file, output_file, events=None):
+    """generate_printing_summary over any mix of events in the ledger"""
+    print(f"\n📋 Summarising orders in {db_file} ({', '.join(events) if events else 'all events'})")
+    conn = connect(db_file)
+    try:
+        summary = order_summary(conn, events)
+    finally:
+        conn.close()
+
+    print(f"✓ Found {summary['quantity'].sum()} order items")
+    write_summary(summary, output_file)
+    return summary
+
+VALUE_OPTIONS = {'--db', '--events', '--compress'}
+
+def ledger_command(positional, options):
+    """Run 'ledger <import|summary|sizes|events> ...' from parsed command-line arguments"""
+    usage = [
+        "Usage: ledger import <voa|cores|exes|sizes> <event> <input_file> [--db ledger.db]",
+        "       ledger summary [output_file] [--db ledger.db] [--events ev1,ev2]",
+        "       ledger sizes <orders|roster> [--db ledger.db] [--events ev1,ev2]",
+        "       ledger events [--db ledger.db]"
+    ]
+    db_file = options.get('db', DEFAULT_LEDGER)
+    events = [e.strip() for e in options['events'].split(',')] if options.get('events') else None
+
+    action = positional[0] if positional else ''
+
+    if action == 'import' and len(positional) >= 4:
+        source, event, input_file = positional[1:4]
+        if not os.path.exists(input_file):
+            print(f"\n❌ Error: File '{input_file}' not found!")
+            sys.exit(1)
+        import_file(db_file, input_file, event, source)
+
+    elif action == 'summary':
+        output_file = with_compression(positional[1] if len(positional) > 1 else "printing_summary.csv", options.get('compress'))
+        ledger_printing_summary(db_file, output_file, events)
+
+    elif action == 'sizes' and len(positional) >= 2 and positional[1] in ['orders', 'roster']:
+        conn = connect(db_file)
+        try:
+            breakdown = size_breakdown(conn, events, positional[1])
+        finally:
+            conn.close()
+        print(f"\n📊 Size breakdown ({positional[1]}):")
+        print(breakdown.to_string(index=False))
+
+    elif action == 'events':
+        conn = connect(db_file)
+        try:
+            print(list_events(conn).to_string(index=False))
+        finally:
+            conn.close()
+
+    else:
+        print("\n".join(usage))
+        sys.exit(1)
+
+def main():
+    """Main entry point"""
+    ledger_command(*parse_options(sys.argv[1:], VALUE_OPTIONS))
+
+if __name__ == "__main__":
+    main()
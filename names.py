@@ -0,0 +1,84 @@
+import pandas as pd
+
+MAX_NAME_LENGTH = 12
+
+# Ways to tell apart two people whose printed names collide, tried in the given order
+STRATEGIES = {
+    'full': 'full name, if it fits',
+    'last-initial': "first name + last initial, e.g. 'Rahul S.'"
+}
+DEFAULT_STRATEGY = ['full', 'last-initial']
+
+REPORT_COLUMNS = ['domain', 'full_name', 'old_name', 'new_name', 'status']
+
+def parse_strategy(value):
+    """Turn 'full,last-initial' (or 'none') into a list of strategy names"""
+    if value is None or value is True:
+        return list(DEFAULT_STRATEGY)
+    if value.strip().lower() == 'none':
+        return []
+
+    strategy = [part.strip().lower() for part in value.split(',') if part.strip()]
+    unknown = [part for part in strategy if part not in STRATEGIES]
+    if unknown:
+        raise ValueError(f"Unknown name strategy '{unknown[0]}'. Use: {', '.join(STRATEGIES)} or none")
+    return strategy
+
+def normalize_names(names):
+    """Strip and collapse runs of whitespace (including newlines) in a name column"""
+    return names.str.replace(r'\s+', ' ', regex=True).str.strip()
+
+def shorten_names(names, max_length=MAX_NAME_LENGTH):
+    """Keep only the first word of names longer than max_length"""
+    too_long = names.str.len() > max_length
+    return names.mask(too_long, names.str.split().str[0])
+
+def collision_mask(frame):
+    """Rows whose (domain, name) is shared with someone who has a different full name"""
+    keys = ['domain', 'name']
+    shared = frame.duplicated(keys, keep=False)
+    if not shared.any():
+        return shared
+
+    # Only the shared keys need the distinct-full-name count
+    distinct = frame[shared].groupby(keys, sort=False)['full_name'].transform('nunique')
+    return shared & distinct.reindex(frame.index, fill_value=0).gt(1)
+
+def _candidates(full_names, strategy, max_length):
+    """Alternative printed name for each row under one strategy (NaN where it does not apply)"""
+    if strategy == 'full':
+        return full_names.where(full_names.str.len() <= max_length)
+
+    words = full_names.str.split()
+    first = words.str[0]
+    last = words.str[-1]
+    initial = first + ' ' + last.str[0].str.upper() + '.'
+    return initial.where((words.str.len() > 1) & (initial.str.len() <= max_length))
+
+def disambiguate_names(frame, strategy=None, max_length=MAX_NAME_LENGTH):
+    """Find print-name collisions in one pass and rename them; returns (frame, report)"""
+    strategy = DEFAULT_STRATEGY if strategy is None else strategy
+    colliding = collision_mask(frame)
+
+    if not colliding.any():
+        return frame, pd.DataFrame(columns=REPORT_COLUMNS)
+
+    old_names = frame.loc[colliding, 'name']
+    new_names = pd.Series(pd.NA, index=old_names.index, dtype=object)
+    for name in strategy:
+        new_names = new_names.fillna(_candidates(frame.loc[colliding, 'full_name'], name, max_length))
+    new_names = new_names.fillna(old_names).astype(str)
+
+    frame.loc[colliding, 'name'] = new_names
+    unresolved = collision_mask(frame) & colliding
+
+    report = pd.DataFrame({
+        'domain': frame.loc[colliding, 'domain'],
+        'full_name': frame.loc[colliding, 'full_name'],
+        'old_name': old_names,
+        'new_name': new_names,
+        'status': 'changed'
+    })
+    report.loc[unresolved[colliding].to_numpy(), 'status'] = 'unresolved'
+    report = report[(report['old_name'] != report['new_name']) | (report['status'] == 'unresolved')]
+    return frame, report.reset_index(drop=True)[REPORT_COLUMNS]
@@ -0,0 +1,203 @@
+import pandas as pd
+import numpy as np
+from timestamps import sort_by_time
+from compression import write_csv
+
+NUMBER_RANGE = range(0, 100)
+
+# Any listed preference, however far down, costs less than a number nobody asked for
+UNLISTED_COST = 1000
+
+def parse_preferences(numbers, alternates=None):
+    """Ranked list of requested numbers per row: the merch number first, then any alternates
+
+    A number cell may hold one number ('7', '7.0') or several ('7, 17 / 77').
+    """
+    numeric = pd.to_numeric(numbers, errors='coerce')
+    numeric = numeric.where(np.isfinite(numeric))
+
+    listed = numbers.astype(object).where(numbers.notna(), '').astype(str).str.findall(r'\d+')
+    preferences = listed.where(numeric.isna(), numeric.apply(lambda x: [] if pd.isna(x) else [int(x)]))
+    preferences = preferences.apply(lambda values: [int(v) for v in values])
+
+    if alternates is not None:
+        extra = alternates.astype(object).where(alternates.notna(), '').astype(str).str.findall(r'\d+')
+        preferences = preferences + extra.apply(lambda values: [int(v) for v in values])
+
+    # Drop repeats but keep the first (highest) rank of each number
+    return preferences.apply(lambda values: list(dict.fromkeys(values)))
+
+def _cost_matrix(preferences, pool, nearby):
+    """Cost of giving each pool number to each person, before the timestamp weight"""
+    pool = np.asarray(pool)
+    costs = np.empty((len(preferences), len(pool)), dtype=np.float64)
+    position = {number: j for j, number in enumerate(pool)}
+
+    for i, wanted in enumerate(preferences):
+        primary = wanted[0] if wanted else None
+        if primary is None:
+            # No usable request: lowest free number
+            costs[i] = UNLISTED_COST + np.arange(len(pool))
+            continue
+
+        costs[i] = UNLISTED_COST + np.abs(pool - primary)
+        ranked = list(wanted)
+        for distance in range(1, nearby + 1):
+            ranked += [primary - distance, primary + distance]
+
+        for rank, number in enumerate(ranked):
+            if rank >= len(wanted):
+                # Both neighbours at the same distance share a rank
+                rank = len(wanted) + (rank - len(wanted)) // 2
+            j = position.get(number)
+            if j is not None and costs[i, j] > rank:
+                costs[i, j] = rank
+
+    return costs
+
+def min_cost_assignment(costs):
+    """Hungarian algorithm for an n x m cost matrix (n <= m); returns the column for each row
+
+    Shortest augmenting path version, O(n^2 m), with the inner loop over columns in numpy.
+    Ties always resolve to the lowest column, so the result is deterministic.
+    """
+    n, m = costs.shape
+    if n > m:
+        raise ValueError(f"{n} people but only {m} numbers to give out")
+
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    owner = np.zeros(m + 1, dtype=np.int64)   # owner[j] = row (1-based) holding column j, 0 = free
+    way = np.zeros(m + 1, dtype=np.int64)
+
+    for i in range(1, n + 1):
+        owner[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+
+        while True:
+            used[j0] = True
+            i0 = owner[j0]
+            free = ~used[1:]
+            reduced = costs[i0 - 1] - u[i0] - v[1:]
+
+            better = free & (reduced < minv[1:])
+            minv[1:][better] = reduced[better]
+            way[1:][better] = j0
+
+            candidates = np.where(free, minv[1:], np.inf)
+            j1 = int(np.argmin(candidates)) + 1
+            delta = candidates[j1 - 1]
+
+            u[owner[used]] += delta
+            v[used] -= delta
+            minv[~used] -= delta
+
+            j0 = j1
+            if owner[j0] == 0:
+                break
+
+        while j0:
+            j1 = way[j0]
+            owner[j0] = owner[j1]
+            j0 = j1
+
+    assigned = np.full(n, -1, dtype=np.int64)
+    taken = np.flatnonzero(owner[1:])
+    assigned[owner[1:][taken] - 1] = taken
+    return assigned
+
+def _describe(number, wanted, nearby):
+    """How an assigned number relates to what the person asked for"""
+    if not wanted:
+        return 'free number'
+    if number in wanted:
+        rank = wanted.index(number)
+        return 'first choice' if rank == 0 else f'alternate {rank}'
+    if nearby and abs(number - wanted[0]) <= nearby:
+        return 'nearby'
+    return 'free number'
+
+def assign_numbers(frame, nearby=0, scope='all', pinned=None, pool=NUMBER_RANGE):
+    """Give out numbers as a min-cost assignment weighted by submission order
+
+    frame needs 'name', 'domain' and 'preferences' columns and must already be in
+    priority order (earliest first). pinned maps row labels to numbers that are
+    kept as they are (e.g. shirts already printed). Returns (numbers, report).
+    """
+    pinned = pinned or {}
+    numbers = pd.Series(-1, index=frame.index, dtype='int64')
+    how = pd.Series('', index=frame.index, dtype=object)
+
+    if scope == 'domain':
+        groups = [group.index for _, group in frame.groupby('domain', sort=False)]
+    elif scope == 'all':
+        groups = [frame.index]
+    else:
+        raise ValueError(f"Unknown number scope '{scope}'. Use: all or domain")
+
+    for labels in groups:
+        kept = {label: pinned[label] for label in labels if label in pinned}
+        taken = set()
+        for label, number in kept.items():
+            if number in taken:
+                continue
+            numbers[label] = number
+            how[label] = 'kept'
+            taken.add(number)
+
+        open_labels = [label for label in labels if how[label] != 'kept']
+        free_pool = [number for number in pool if number not in taken]
+        if not open_labels:
+            continue
+
+        if len(open_labels) > len(free_pool):
+            where = f" in {frame.loc[open_labels[0], 'domain']}" if scope == 'domain' else ''
+            hint = " - use --number-scope domain to give each domain its own numbers" if scope == 'all' else ''
+            raise ValueError(f"{len(open_labels)} people{where} but only {len(free_pool)} free numbers{hint}")
+
+        preferences = frame.loc[open_labels, 'preferences'].tolist()
+        costs = _cost_matrix(preferences, free_pool, nearby)
+
+        # Earlier submitters weigh more, so they win ties over the same number
+        order = np.arange(len(open_labels))
+        weights = (2 * len(open_labels) - order)[:, None]
+        assigned = min_cost_assignment(costs * weights)
+
+        for label, wanted, j in zip(open_labels, preferences, assigned):
+            numbers[label] = free_pool[j]
+            how[label] = _describe(free_pool[j], wanted, nearby)
+
+    report = pd.DataFrame({
+        'name': frame['name'],
+        'domain': frame['domain'],
+        'requested': frame['preferences'].apply(lambda values: ' '.join(map(str, values))),
+        'assigned': numbers,
+        'result': how
+    })
+    return numbers, report.reset_index(drop=True)
+
+def resolve_number_conflicts(df, nearby=0, scope='all', pinned=None, report_file=None, level=None):
+    """Resolve conflicts when multiple people choose the same number"""
+    # Sort by real submission time (not the timestamp text) to determine who filled first
+    df = sort_by_time(df, 'Timestamp')
+    if 'preferences' not in df.columns:
+        df['preferences'] = parse_preferences(df['number'])
+
+    numbers, report = assign_numbers(df, nearby=nearby, scope=scope, pinned=pinned)
+
+    moved = report[~report['result'].isin(['first choice', 'kept'])]
+    for row in moved.itertuples(index=False):
+        if row.requested:
+            requested = int(row.requested.split()[0])
+            reason = 'it was taken' if requested in NUMBER_RANGE else 'it is out of range'
+            print(f"⚠️  Conflict: {row.name} requested #{requested} but {reason}. "
+                  f"Assigned #{row.assigned} ({row.result})")
+
+    if report_file:
+        print(f"💾 Saving number assignments to {report_file}...")
+        write_csv(report, report_file, level)
+
+    df['number'] = numbers
+    return df.drop(columns='preferences')
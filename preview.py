@@ -0,0 +1,240 @@
+import pandas as pd
+import math
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from registry import parse_jobs
+from form_input import read_table
+from compression import write_csv
+from cli import parse_options
+
+# Optional: only needed for print previews
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:
+    Image = ImageDraw = ImageFont = None
+
+# Print area on the back of the shirt, in cm (override with --print-width etc.)
+PRINT_WIDTH = 30.0
+NAME_HEIGHT = 4.5
+NUMBER_HEIGHT = 20.0
+TAG_HEIGHT = 2.5
+
+# Mockups are drawn at this many pixels per cm; contact sheet tiles are 1/TILE_REDUCE of that
+PX_PER_CM = 12
+TILE_REDUCE = 2
+SHEET_COLUMNS = 8
+
+SHIRT_COLOR = (38, 40, 46)
+INK_COLOR = (245, 245, 245)
+AREA_COLOR = (90, 160, 90)
+OVERFLOW_COLOR = (220, 50, 50)
+SHEET_COLOR = (255, 255, 255)
+
+REPORT_COLUMNS = ['file', 'name', 'domain', 'number', 'name_width_cm', 'number_width_cm', 'issue']
+
+VALUE_OPTIONS = {'--font', '--print-width', '--name-height', '--number-height', '--jobs'}
+
+_fonts = {}
+
+def load_font(font_file, size):
+    """A font at a pixel size, loaded once per worker process
+
+    Without a font file Pillow's built-in font is used, which is close to but not the
+    shop's print font, so widths are then only a guide.
+    """
+    key = (font_file, size)
+    if key not in _fonts:
+        _fonts[key] = ImageFont.truetype(font_file, size) if font_file else ImageFont.load_default(size=size)
+    return _fonts[key]
+
+def preview_settings(options):
+    """Print area and font settings from command-line options"""
+    return {
+        'font': options.get('font'),
+        'print_width': float(options.get('print-width', PRINT_WIDTH)),
+        'name_height': float(options.get('name-height', NAME_HEIGHT)),
+        'number_height': float(options.get('number-height', NUMBER_HEIGHT))
+    }
+
+def number_issue(number):
+    """Why a number can't be printed as given, or '' when it is fine"""
+    if not number:
+        return 'no number'
+    if not re.fullmatch(r'\d{1,2}', number):
+        return f"number '{number}' is not 0-99"
+    return ''
+
+def render_row(row, settings):
+    """Draw one mockup; returns (image, name width cm, number width cm, issue)"""
+    px = lambda cm: int(round(cm * PX_PER_CM))
+    margin = 3.0
+    area_width = settings['print_width']
+    heights = [settings['name_height'], settings['number_height'] if 'number' in row else 0, TAG_HEIGHT]
+    width, height = px(area_width + 2 * margin), px(sum(heights) + 2 * margin + 2.0)
+
+    image = Image.new('RGB', (width, height), SHIRT_COLOR)
+    draw = ImageDraw.Draw(image)
+
+    name_font = load_font(settings['font'], px(settings['name_height']))
+    name_width = name_font.getlength(row['name']) / PX_PER_CM
+    issues = []
+    if name_width > area_width:
+        issues.append(f"name {name_width:.1f} cm wide, print area is {area_width:g} cm")
+
+    number_width = 0.0
+    top = px(margin)
+    draw.text((width // 2, top), row['name'], font=name_font, fill=INK_COLOR, anchor='mt')
+    top += px(settings['name_height'] + 1.0)
+
+    if 'number' in row:
+        number = row['number']
+        issue = number_issue(number)
+        if issue:
+            issues.append(issue)
+        if number:
+            number_font = load_font(settings['font'], px(settings['number_height']))
+            number_width = number_font.getlength(number) / PX_PER_CM
+            if number_width > area_width:
+                issues.append(f"number {number_width:.1f} cm wide, print area is {area_width:g} cm")
+            draw.text((width // 2, top), number, font=number_font, fill=INK_COLOR, anchor='mt')
+        top += px(settings['number_height'] + 1.0)
+
+    tag_font = load_font(settings['font'], px(TAG_HEIGHT))
+    draw.text((width // 2, top), row.get('domain', ''), font=tag_font, fill=INK_COLOR, anchor='mt')
+
+    area = [px(margin), px(margin) - 4, px(margin + area_width), top + px(TAG_HEIGHT) + 4]
+    draw.rectangle(area, outline=OVERFLOW_COLOR if issues else AREA_COLOR, width=3 if issues else 1)
+    return image, name_width, number_width, '; '.join(issues)
+
+def render_chunk(rows, settings, output_dir):
+    """Worker: render and save a list of (index, row) mockups
+
+    Returns one result dict per row, with a small thumbnail (raw RGB bytes) for the
+    contact sheet so the main process never re-reads the PNGs.
+    """
+    results = []
+    for index, row in rows:
+        image, name_width, number_width, issue = render_row(row, settings)
+        safe_name = re.sub(r'[^\w-]+', '_', row['name']).strip('_') or 'blank'
+        file_name = f"{index + 1:04d}_{safe_name}.png"
+        # Flat colours compress well even at the fastest zlib level, which is most of the time saved
+        image.save(os.path.join(output_dir, file_name), compress_level=1)
+
+        thumb = image.reduce(TILE_REDUCE)
+        results.append({
+            'index': index,
+            'file': file_name,
+            'name_width_cm': round(name_width, 1),
+            'number_width_cm': round(number_width, 1),
+            'issue': issue,
+            'thumb': (thumb.size, thumb.tobytes())
+        })
+    return results
+
+def contact_sheet(results, sheet_file):
+    """Paste every thumbnail into one grid image, flagged ones with a red frame"""
+    (tile_w, tile_h), _ = results[0]['thumb']
+    gap = 6
+    columns = min(SHEET_COLUMNS, len(results))
+    rows = math.ceil(len(results) / columns)
+    sheet = Image.new('RGB', (columns * (tile_w + gap) + gap, rows * (tile_h + gap) + gap), SHEET_COLOR)
+    draw = ImageDraw.Draw(sheet)
+
+    for position, result in enumerate(results):
+        size, data = result['thumb']
+        x = gap + (position % columns) * (tile_w + gap)
+        y = gap + (position // columns) * (tile_h + gap)
+        sheet.paste(Image.frombytes('RGB', size, data), (x, y))
+        if result['issue']:
+            draw.rectangle([x - 3, y - 3, x + size[0] + 2, y + size[1] + 2], outline=OVERFLOW_COLOR, width=3)
+    sheet.save(sheet_file, compress_level=1)
+
+def render_previews(input_file, output_dir='previews', options=None):
+    """Render a mockup per row of a cores/exes output, flag what won't print, build a contact sheet
+
+    Rows are rendered in a process pool (--jobs, every core by default). Writes one PNG
+    per row, contact_sheet.png and preview_report.csv into output_dir; returns the report.
+    """
+    if Image is None:
+        raise ImportError("Print previews need Pillow (pip install pillow)")
+
+    options = options or {}
+    settings = preview_settings(options)
+    jobs = parse_jobs(options.get('jobs', 'auto'))
+
+    print(f"\n📋 Reading {input_file}...")
+    df = read_table(input_file, dtype=str, keep_default_na=False)
+    if 'name' not in df.columns:
+        raise KeyError(f"{input_file} has no name column - is it a converter output?")
+    columns = [col for col in ['name', 'number', 'domain'] if col in df.columns]
+    if df.empty:
+        print("\n⚠️  No rows to preview")
+        return pd.DataFrame(columns=REPORT_COLUMNS)
+    rows = list(enumerate(df[columns].to_dict('records')))
+
+    os.makedirs(output_dir, exist_ok=True)
+    # A few chunks per worker keeps every core busy when some names take longer to draw
+    chunk = max(1, math.ceil(len(rows) / (jobs * 4)))
+    chunks = [rows[start:start + chunk] for start in range(0, len(rows), chunk)]
+    print(f"🎨 Rendering {len(rows)} mockups with {jobs} worker(s)...")
+
+    started = time.perf_counter()
+    if jobs == 1:
+        parts = [render_chunk(part, settings, output_dir) for part in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            parts = list(pool.map(render_chunk, chunks, [settings] * len(chunks), [output_dir] * len(chunks)))
+    results = sorted((result for part in parts for result in part), key=lambda result: result['index'])
+
+    sheet_file = os.path.join(output_dir, 'contact_sheet.png')
+    contact_sheet(results, sheet_file)
+    elapsed = time.perf_counter() - started
+
+    report = df[columns].reindex(columns=['name', 'domain', 'number'], fill_value='')
+    report = report.assign(**{key: [result[key] for result in results]
+                              for key in ['file', 'name_width_cm', 'number_width_cm', 'issue']})[REPORT_COLUMNS]
+    report_file = os.path.join(output_dir, 'preview_report.csv')
+    write_csv(report, report_file)
+
+    flagged = report[report['issue'] != '']
+    print(f"✓ Rendered {len(rows)} mockups in {elapsed:.1f}s")
+    if settings['font'] is None:
+        print("⚠️  No --font given: widths use Pillow's built-in font, pass the print font for exact widths")
+    if len(flagged):
+        print(f"\n⚠️  {len(flagged)} row(s) won't print as given:")
+        for row in flagged.itertuples(index=False):
+            print(f"   {row.name} ({row.domain}): {row.issue}")
+    else:
+        print(f"✓ Every name fits the {settings['print_width']:g} cm print area")
+
+    print(f"\n💾 Mockups, {os.path.basename(sheet_file)} and {os.path.basename(report_file)} saved to {output_dir}")
+    return report
+
+def preview_command(positional, options):
+    """Run 'preview <cores_photoshop.csv> [output_dir] [--font f.ttf] ...' from parsed arguments"""
+    if not positional:
+        print("Usage: preview <cores_photoshop.csv> [output_dir] [--font print_font.ttf] [--jobs N]")
+        print(f"       [--print-width {PRINT_WIDTH:g}] [--name-height {NAME_HEIGHT:g}] [--number-height {NUMBER_HEIGHT:g}] (cm)")
+        sys.exit(1)
+
+    input_file = positional[0]
+    for path in [input_file] + ([options['font']] if options.get('font') else []):
+        if not os.path.exists(path):
+            print(f"\n❌ Error: File '{path}' not found!")
+            sys.exit(1)
+
+    try:
+        render_previews(input_file, positional[1] if len(positional) > 1 else 'previews', options)
+    except (ImportError, KeyError, ValueError) as e:
+        print(f"\n❌ Error: {e}")
+        sys.exit(1)
+
+def main():
+    """Main entry point"""
+    preview_command(*parse_options(sys.argv[1:], VALUE_OPTIONS))
+
+if __name__ == "__main__":
+    main()
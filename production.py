@@ -0,0 +1,119 @@
+import pandas as pd
+import io
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from registry import compile_plan, read_form, run_plan, SIZE_ORDER
+from compression import split_output_name, with_compression, write_csv
+from cli import parse_options
+
+# Committee shirts are their own designs in the production matrix
+COMMITTEE_DESIGNS = {
+    'cores': 'Core Team',
+    'exes': 'Executive Team'
+}
+
+# Source -> form declaration its export is read with (committee sizes come from the
+# same 'sizes' plan as the distribution lists)
+SOURCE_FORMS = {'cores': 'sizes', 'exes': 'sizes', 'voa': 'voa'}
+
+VALUE_OPTIONS = {'--cores', '--exes', '--voa', '--sheet', '--compress', '--compress-level'}
+
+def source_counts(source, input_file, sheet=None):
+    """(source, design, size, quantity) rows for one form export; returns (counts, messages)
+
+    Runs in a worker process: the export is converted in memory and only the counts are
+    handed back, with the converter's printed warnings.
+    """
+    messages = io.StringIO()
+    with redirect_stdout(messages):
+        plan = compile_plan(SOURCE_FORMS[source])
+        output, _ = run_plan(plan, read_form(input_file, plan, sheet), {'name-strategy': 'none'})
+
+    if source in COMMITTEE_DESIGNS:
+        output = output.assign(design=COMMITTEE_DESIGNS[source])
+    counts = (output.astype({'design': str, 'size': str}).groupby(['design', 'size']).size()
+              .reset_index(name='quantity').assign(source=source))
+    return counts[['source', 'design', 'size', 'quantity']], messages.getvalue()
+
+def size_columns(sizes):
+    """Sizes in S..XXL order, anything else (e.g. NOT SPECIFIED) after them"""
+    return sorted(sizes, key=lambda size: (SIZE_ORDER.get(size, 999), size))
+
+def production_matrix(counts, rows):
+    """Pivot (rows..., size, quantity) into a rows x size table with a total column and row"""
+    matrix = counts.groupby(rows + ['size'])['quantity'].sum().unstack('size', fill_value=0)
+    matrix = matrix[size_columns(matrix.columns)]
+    matrix.columns = list(matrix.columns)
+    matrix['total'] = matrix.sum(axis=1)
+
+    total = matrix.sum().to_frame().T
+    if len(rows) > 1:
+        total.index = pd.MultiIndex.from_tuples([('TOTAL',) + ('',) * (len(rows) - 1)], names=rows)
+    else:
+        total.index = pd.Index(['TOTAL'], name=rows[0])
+    return pd.concat([matrix, total]).astype('int64')
+
+def production_summary(inputs, output_file='production_matrix.csv', sheet=None, level=None):
+    """Count cores, exes and VOA shirts together into one design x size production matrix
+
+    inputs maps source ('cores', 'exes', 'voa') to its form export. The exports are
+    converted in parallel in memory; writes the matrix and <output>_by_source.csv.
+    """
+    sources = [source for source in SOURCE_FORMS if inputs.get(source)]
+    print(f"\n🏭 Counting shirts from {', '.join(f'{s} ({inputs[s]})' for s in sources)}")
+
+    with ProcessPoolExecutor(max_workers=len(sources)) as pool:
+        results = list(pool.map(source_counts, sources, [inputs[s] for s in sources], [sheet] * len(sources)))
+
+    for source, (counts, messages) in zip(sources, results):
+        warnings = sum(line.startswith('⚠️') for line in messages.splitlines())
+        print(f"✓ {source}: {counts['quantity'].sum()} shirts" + (f" ({warnings} warnings)" if warnings else ''))
+
+    counts = pd.concat([counts for counts, _ in results], ignore_index=True)
+    if counts.empty:
+        print("\n❌ No shirts found in the given exports!")
+        return None
+
+    matrix = production_matrix(counts, ['design'])
+    by_source = production_matrix(counts, ['source', 'design'])
+
+    base, ext = split_output_name(output_file)
+    by_source_file = f"{base}_by_source{ext}"
+    print(f"\n💾 Saving to {output_file} and {by_source_file}...")
+    write_csv(matrix.reset_index(), output_file, level)
+    write_csv(by_source.reset_index(), by_source_file, level)
+
+    print("\n" + "=" * 60)
+    print("PRODUCTION MATRIX (all sources)")
+    print("=" * 60)
+    print(matrix.to_string())
+
+    print("\n📊 Subtotals by source:")
+    subtotals = production_matrix(counts, ['source'])
+    print(subtotals.to_string())
+    return matrix
+
+def production_command(positional, options):
+    """Run 'production [output_file] --cores c.csv --exes e.csv --voa v.csv' from parsed arguments"""
+    inputs = {source: options.get(source) for source in SOURCE_FORMS if options.get(source)}
+    if not inputs:
+        print("Usage: production [output_file] [--cores cores.csv] [--exes exes.csv] [--voa VOA.csv]")
+        print("       [--sheet name] [--compress gzip|zstd]")
+        sys.exit(1)
+
+    for path in inputs.values():
+        if not os.path.exists(path):
+            print(f"\n❌ Error: File '{path}' not found!")
+            sys.exit(1)
+
+    output_file = with_compression(positional[0] if positional else 'production_matrix.csv', options.get('compress'))
+    production_summary(inputs, output_file, options.get('sheet'), options.get('compress-level'))
+
+def main():
+    """Main entry point"""
+    production_command(*parse_options(sys.argv[1:], VALUE_OPTIONS))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import sys
+import time
+
+# Rows handled per chunk when a stage reports progress
+CHUNK_ROWS = 50_000
+
+STAGE_LABELS = {
+    'read': 'Reading',
+    'transform': 'Converting',
+    'write': 'Writing'
+}
+
+def _format_seconds(seconds):
+    """'42s', '3m05s' or '1h02m'"""
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+
+class ProgressReporter:
+    """Progress callback that draws one status line per stage: rows, rows/sec and ETA
+
+    Called as reporter(stage, done, total); total may be None or an estimate. Redraws at
+    most every `interval` seconds and does nothing when the stream is not a terminal, so
+    redirected output and log files stay clean.
+    """
+
+    def __init__(self, stream=None, interval=0.2, enabled=None):
+        self.stream = stream or sys.stderr
+        self.interval = interval
+        self.enabled = self.stream.isatty() if enabled is None else enabled
+        self.stage = None
+        self.finished = None
+        self.started = 0.0
+        self.last_drawn = 0.0
+
+    def __call__(self, stage, done, total=None):
+        if not self.enabled or stage == self.finished:
+            return
+
+        now = time.monotonic()
+        if stage != self.stage:
+            self._end_line()
+            self.stage = stage
+            self.started = now
+            self.last_drawn = 0.0
+
+        finished = total is not None and done >= total
+        if not finished and now - self.last_drawn < self.interval:
+            return
+        self.last_drawn = now
+        self._draw(stage, done, total, now - self.started)
+        if finished:
+            self._end_line()
+            self.finished = stage
+
+    def _draw(self, stage, done, total, elapsed):
+        line = f"⏳ {STAGE_LABELS.get(stage, stage):<10} {done:>9,}"
+        if total:
+            line += f" / {total:,} rows ({min(done / total, 1):4.0%})"
+        else:
+            line += " rows"
+
+        if elapsed > 0:
+            rate = done / elapsed
+            line += f"  {rate:,.0f} rows/s"
+            if total and rate > 0 and done < total:
+                line += f"  ETA {_format_seconds((total - done) / rate)}"
+
+        self.stream.write("\r" + line.ljust(79))
+        self.stream.flush()
+
+    def _end_line(self):
+        """Finish the current stage's line so the next print starts on a fresh line"""
+        if self.stage is not None:
+            self.stream.write("\n")
+            self.stream.flush()
+            self.stage = None
+
+    def close(self):
+        """End the last line (call once the conversion is done)"""
+        if self.enabled:
+            self._end_line()
+
+def report(progress, stage, done, total=None):
+    """Call a progress callback if one was given"""
+    if progress is not None:
+        progress(stage, done, total)
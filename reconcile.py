@@ -0,0 +1,220 @@
+import pandas as pd
+import numpy as np
+import sys
+import os
+from registry import compile_plan, run_plan
+from form_input import normalize_header, read_table
+from compression import split_output_name, with_compression, write_csv
+from timestamps import parse_timestamps
+from cli import parse_options
+
+AMOUNT_COL = 'Enter Total Amount paid -'
+TIMESTAMP_COL = 'Timestamp'
+
+# Price sheet item for designs that are not priced on their own
+TSHIRT_ITEM = 'TSHIRT'
+
+# Column names tried, in order, when reading a bank/UPI statement export
+STATEMENT_COLUMNS = {
+    'amount': ['Amount', 'Credit', 'Credit Amount', 'Deposit Amt.', 'Deposit', 'Amount (INR)', 'amount'],
+    'time': ['Timestamp', 'Transaction Date', 'Txn Date', 'Date', 'Value Date', 'Time', 'date'],
+    'reference': ['Reference', 'UTR', 'Narration', 'Description', 'Remarks', 'Transaction ID']
+}
+
+DEFAULT_WINDOW_HOURS = 48
+
+VALUE_OPTIONS = {'--prices', '--window', '--amount-col', '--time-col', '--sheet', '--compress', '--compress-level'}
+
+def to_paise(series):
+    """Parse money text like '₹1,079.00', 'Rs. 399' or '798/-' into integer paise (NaN if unreadable)"""
+    text = series.astype(object).where(series.notna(), '').astype(str).str.replace(',', '', regex=False)
+    # The first number in the text, so the '.' of a 'Rs.' prefix is never read as a decimal point
+    number = text.str.extract(r'(-?\d+(?:\.\d+)?)', expand=False)
+    return (pd.to_numeric(number, errors='coerce') * 100).round().astype('Int64')
+
+def load_prices(prices_file):
+    """Read a price sheet (item, quantity, price) into {item: [(quantity, paise), ...]}
+
+    A row with quantity 1 is the unit price; larger quantities are combo offers,
+    e.g. TSHIRT,3,1079 means any three T-shirts for 1079.
+    """
+    sheet = read_table(prices_file)
+    sheet['paise'] = to_paise(sheet['price'])
+    offers = {}
+    for item, rows in sheet.groupby('item', sort=False):
+        offers[item] = list(zip(rows['quantity'].astype(int), rows['paise'].astype(int)))
+    return offers
+
+def best_price_table(offers, max_quantity):
+    """Cheapest total for buying exactly q items, for q = 0..max_quantity"""
+    table = np.full(max_quantity + 1, np.inf)
+    table[0] = 0
+    for q in range(1, max_quantity + 1):
+        for quantity, price in offers:
+            if quantity <= q and table[q - quantity] + price < table[q]:
+                table[q] = table[q - quantity] + price
+    return table
+
+def expected_prices(orders, offers):
+    """Expected amount in paise per person (order lines indexed by form row)"""
+    designs = orders['design'].astype(object)
+    items = designs.where(designs.isin(offers), TSHIRT_ITEM)
+    unpriced = sorted(set(items) - set(offers))
+    if unpriced:
+        raise ValueError(f"No price for: {', '.join(unpriced)}. Add them to the price sheet.")
+
+    counts = pd.crosstab(orders.index, items)
+    expected = pd.Series(0.0, index=counts.index)
+    for item in counts.columns:
+        table = best_price_table(offers[item], int(counts[item].max()))
+        expected += table[counts[item].to_numpy()]
+    return expected
+
+def _pick_column(df, wanted, kind):
+    """Find the statement column for amount/time/reference"""
+    candidates = [normalize_header(wanted)] if wanted else STATEMENT_COLUMNS[kind]
+    for col in candidates:
+        if col in df.columns:
+            return col
+    if kind == 'reference':
+        return None
+    raise KeyError(f"Could not find the {kind} column in the statement (tried: {', '.join(candidates)})")
+
+def read_statement(statement_file, amount_col=None, time_col=None, dayfirst=False):
+    """Read a bank/UPI statement export into (amount paise, time, reference) credits"""
+    df = read_table(statement_file)
+    amount_col = _pick_column(df, amount_col, 'amount')
+    time_col = _pick_column(df, time_col, 'time')
+    reference_col = _pick_column(df, None, 'reference')
+
+    statement = pd.DataFrame({
+        'amount': to_paise(df[amount_col]),
+        'time': parse_timestamps(df[time_col], dayfirst),
+        'reference': df[reference_col].astype(str) if reference_col else ''
+    })
+    return statement[statement['amount'] > 0]
+
+def match_payments(claims, statement, window):
+    """One-to-one as-of join of claims to statement credits on exact amount, nearest time
+
+    Each round joins every open claim to the nearest open credit of the same amount
+    within the window; a credit wanted by several claims goes to the closest one and
+    the rest try again next round. Returns {claim label: statement label}.
+    """
+    claims = claims.dropna(subset=['amount', 'time'])
+    credits = statement.dropna(subset=['amount', 'time'])
+    left = claims.rename_axis('claim').reset_index().astype({'amount': 'int64'}).sort_values('time')
+    right = (credits.rename_axis('credit').reset_index().astype({'amount': 'int64'})
+                    .rename(columns={'time': 'credit_time'}))
+    right['time'] = right['credit_time']
+    right = right.sort_values('time')
+
+    matches = {}
+    while len(left) and len(right):
+        joined = pd.merge_asof(left[['claim', 'time', 'amount']], right[['credit', 'time', 'credit_time', 'amount']],
+                               on='time', by='amount', tolerance=window, direction='nearest')
+        joined = joined.dropna(subset=['credit'])
+        if joined.empty:
+            break
+
+        joined['gap'] = (joined['time'] - joined['credit_time']).abs()
+        joined = joined.sort_values(['gap', 'claim'], kind='stable').drop_duplicates('credit')
+        matches.update(zip(joined['claim'], joined['credit'].astype(int)))
+
+        left = left[~left['claim'].isin(joined['claim'])]
+        right = right[~right['credit'].isin(joined['credit'])]
+
+    return matches
+
+def reconcile(form_file, statement_file, output_file, prices_file, window_hours=DEFAULT_WINDOW_HOURS,
+              dayfirst=False, amount_col=None, time_col=None, sheet=None, level=None):
+    """Check every VOA order's payment against its expected price and a bank statement"""
+    print(f"\n📋 Reading VOA data from: {form_file}")
+    plan = compile_plan('voa')
+    df = read_table(form_file, usecols=plan['usecols'] | {AMOUNT_COL, TIMESTAMP_COL}, sheet=sheet)
+    print(f"✓ Found {len(df)} entries")
+
+    orders, stats = run_plan(plan, df, keep_index=True)
+    offers = load_prices(prices_file)
+    expected = expected_prices(orders, offers)
+
+    people = orders[~orders.index.duplicated()][['name', 'email', 'contact']]
+    report = people.assign(
+        items=orders.groupby(level=0).size(),
+        expected=expected.reindex(people.index),
+        claimed=to_paise(df[AMOUNT_COL]).reindex(people.index) if AMOUNT_COL in df.columns else pd.NA,
+        submitted=parse_timestamps(df[TIMESTAMP_COL]).reindex(people.index)
+    )
+
+    print(f"\n📋 Reading statement from: {statement_file}")
+    statement = read_statement(statement_file, amount_col, time_col, dayfirst)
+    print(f"✓ Found {len(statement)} credits")
+
+    # Look for what each person says they paid first, then for what they should have paid
+    window = pd.Timedelta(hours=float(window_hours))
+    matches = match_payments(report[['claimed', 'submitted']].rename(columns={'claimed': 'amount', 'submitted': 'time'}),
+                             statement, window)
+    unmatched = report.index.difference(list(matches))
+    rest = statement.drop(index=list(matches.values()))
+    matches.update(match_payments(
+        report.loc[unmatched, ['expected', 'submitted']].rename(columns={'expected': 'amount', 'submitted': 'time'}),
+        rest, window))
+
+    credit = pd.Series(matches, dtype=object).reindex(report.index)
+    report['paid'] = credit.map(statement['amount'])
+    report['paid_at'] = credit.map(statement['time'])
+    report['reference'] = credit.map(statement['reference'])
+
+    report['status'] = np.select(
+        [report['paid'].isna().to_numpy(dtype=bool),
+         (report['paid'] == report['expected']).fillna(False).to_numpy(dtype=bool)],
+        ['unpaid', 'ok'], 'amount mismatch')
+
+    for col in ['expected', 'claimed', 'paid']:
+        report[col] = (pd.to_numeric(report[col], errors='coerce') / 100).round(2)
+
+    report = report.reset_index(names='row')
+    report['row'] += 2
+    unmatched_payments = statement.drop(index=list(matches.values()))
+    unmatched_payments = unmatched_payments.assign(amount=unmatched_payments['amount'] / 100)
+
+    base, ext = split_output_name(output_file)
+    payments_file = f"{base}_unmatched_payments{ext}"
+    print(f"\n💾 Saving to {output_file} and {payments_file}...")
+    write_csv(report, output_file, level)
+    write_csv(unmatched_payments, payments_file, level)
+
+    print(f"✅ Reconciliation complete! {len(report)} people, {len(statement)} credits.")
+    print(f"\n📊 Status breakdown:")
+    print(report['status'].value_counts().to_string())
+    print(f"\n💸 Unmatched payments: {len(unmatched_payments)}")
+    return report, unmatched_payments
+
+def reconcile_command(positional, options):
+    """Run 'reconcile <voa_form> <statement> [output]' from parsed command-line arguments"""
+    if len(positional) < 2 or not options.get('prices'):
+        print("Usage: reconcile <voa_form.csv> <bank_statement.csv> [output_file] --prices prices.csv")
+        print("       [--window hours] [--dayfirst] [--amount-col name] [--time-col name] [--sheet name]")
+        sys.exit(1)
+
+    form_file, statement_file = positional[0], positional[1]
+    for path in (form_file, statement_file, options['prices']):
+        if not os.path.exists(path):
+            print(f"\n❌ Error: File '{path}' not found!")
+            sys.exit(1)
+
+    output_file = with_compression(positional[2] if len(positional) > 2 else "reconciliation.csv", options.get('compress'))
+    reconcile(form_file, statement_file, output_file, options['prices'],
+              window_hours=options.get('window', DEFAULT_WINDOW_HOURS),
+              dayfirst=bool(options.get('dayfirst')),
+              amount_col=options.get('amount-col'),
+              time_col=options.get('time-col'),
+              sheet=options.get('sheet'),
+              level=options.get('compress-level'))
+
+def main():
+    """Main entry point"""
+    reconcile_command(*parse_options(sys.argv[1:], VALUE_OPTIONS))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,894 @@
+import pandas as pd
+import numpy as np
+import re
+import io
+import math
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from names import (MAX_NAME_LENGTH, normalize_names, shorten_names as shorten_name_column,
+                   disambiguate_names as disambiguate_name_column, parse_strategy)
+from number_assignment import parse_preferences, resolve_number_conflicts, NUMBER_RANGE
+from form_input import normalize_header, read_table, iter_table, is_workbook, parse_sample, sample_table, read_head
+from progress import CHUNK_ROWS, ProgressReporter, report
+from compression import write_csv, compression_of, open_output
+from checkpoint import (new_journal, load_journal, save_journal, open_partial, commit_chunk,
+                        partial_file, clear_checkpoint)
+
+# Optional: Arrow-backed strings use a fraction of the memory of Python str objects
+try:
+    import pyarrow
+    STRING_DTYPE = 'string[pyarrow]'
+except ImportError:
+    STRING_DTYPE = None
+
+# ---------------------------------------------------------------------------
+# Shared vocabulary
+# ---------------------------------------------------------------------------
+
+VALID_SIZES = ['S', 'M', 'L', 'XL', 'XXL']
+SIZE_ORDER = {'S': 1, 'M': 2, 'L': 3, 'XL': 4, 'XXL': 5}
+
+DOMAIN_MAPPING = {
+    'Sponsorship & Marketing': 'Sponsorship',
+    'Media & Public Relations': 'Media and PR',
+    'Design & Editing': 'Design & Editing',
+    'Vigyaan': 'Vigyaan',
+    'Event Management': 'Event Management',
+    'Tech': 'Tech',
+    'Documentation': 'Documentation'
+}
+
+# Checked in order - a domain only gets the first flag whose keywords match
+DOMAIN_FLAGS = {
+    'design': ['design'],
+    'tech': ['tech'],
+    'spons': ['sponsorship', 'spons'],
+    'pr': ['media', 'pr', 'public relations'],
+    'em': ['event', 'em'],
+    'doc': ['doc'],
+    'vigyaan': ['vigyaan']
+}
+
+# Legacy VOA form: designs picked in the aesthetics question (keywords that select them)
+AESTHETICS_DESIGNS = {
+    'Technocracy': ['Technocracy'],
+    'Dharma': ['Dharma'],
+    'Abyss': ['Abyss', 'Conquering']
+}
+DEFAULT_DESIGN = 'Technocracy'
+
+SIZE_PROMPT = (" enter quantity and Size.\n\nExample: Suppose you want to order 3 'M' sized black T-shirts, "
+               "enter them as M,M,M.\nSimilarly, if you want 5 'XL' sized tees, enter them as \nXL,XL,XL,XL,XL\n"
+               "If you want to order 2 'M' sized and 1 'L' sized tee, \nenter them as M,M,L.\n\n"
+               "Enter 'None', in case you do not wish to order for this design.")
+
+# New VOA form: one free-text size list per design
+TEXT_FIELDS = {
+    'Technocracy': 'For Technocracy Blending Merch,' + SIZE_PROMPT,
+    'Dharma': 'For Dharma Warrior Merch,' + SIZE_PROMPT,
+    'Abyss': 'For Conquering The Abyss Merch,' + SIZE_PROMPT,
+    'Jacket': 'For Jacket,' + SIZE_PROMPT
+}
+
+# Legacy VOA form: one quantity column per size
+GRID_COLUMNS = {size: f'Sizes X Quantities (Oversized T-shirt) [{size}]' for size in VALID_SIZES}
+
+AESTHETICS_COL = ('Choose your aesthetics! (Offers are available at specific order quantities. '
+                  'For combo order select multiple options)')
+RESIDENCY_COL = 'Choose your place of residency (FOR DISTRIBUTION PURPOSES)'
+
+# ---------------------------------------------------------------------------
+# Form declarations
+# ---------------------------------------------------------------------------
+#
+# inputs    - canonical name -> form header (a list means "first header present")
+# required  - canonical columns that must be non-blank, other rows are skipped
+# optional  - canonical columns that may be missing from the export
+# steps     - transforms applied in order to the whole frame (see TRANSFORMS)
+# categories - low-cardinality output columns stored as categoricals
+# key       - output columns that identify a person between runs (--diff-against)
+# output    - output columns, in order
+# breakdowns- columns whose value counts are shown after conversion
+
+FORMS = {
+    'cores': {
+        'title': 'Core Team Converter (with numbers)',
+        'label': 'cores',
+        'inputs': {
+            'name': 'Name On Merch:',
+            'domain': 'Domain',
+            'number': 'Number on Merch (0 to 99)',
+            'alternates': 'Alternate Numbers (optional)',
+            'Timestamp': 'Timestamp'
+        },
+        'required': ['name', 'domain'],
+        'optional': ['alternates'],
+        'steps': ['shorten_names', 'map_domains', 'disambiguate_names', 'parse_numbers', 'domain_flags',
+                  'resolve_numbers'],
+        'output': ['name', 'domain', 'number'] + list(DOMAIN_FLAGS),
+        'categories': ['domain'],
+        'key': ['name', 'domain'],
+        'breakdowns': ['domain'],
+        'default_output': 'cores_photoshop.csv',
+        'done': "✅ Conversion complete! {rows} records processed."
+    },
+    'exes': {
+        'title': 'Executive Team Converter (no numbers)',
+        'label': 'exes',
+        'inputs': {
+            'name': 'Name On Merch:',
+            'domain': 'Domain'
+        },
+        'required': ['name', 'domain'],
+        'steps': ['shorten_names', 'map_domains', 'disambiguate_names', 'domain_flags'],
+        'output': ['name', 'domain'] + list(DOMAIN_FLAGS),
+        'categories': ['domain'],
+        'key': ['name', 'domain'],
+        'breakdowns': ['domain'],
+        'default_output': 'exes_photoshop.csv',
+        'done': "✅ Conversion complete! {rows} records processed."
+    },
+    'sizes': {
+        'title': 'Size Extraction (distribution lists)',
+        'label': 'sizes',
+        'inputs': {
+            'name': 'Name On Merch:',
+            'domain': 'Domain',
+            'size': 'Mention Your Size:'
+        },
+        'required': ['name', 'domain'],
+        'steps': ['shorten_names_quietly', 'map_domains', 'disambiguate_names', 'clean_sizes'],
+        'output': ['name', 'domain', 'size'],
+        'categories': ['domain', 'size'],
+        'key': ['name', 'domain'],
+        'breakdowns': ['size', 'domain'],
+        'default_output': 'sizes.csv',
+        'done': "✅ Extraction complete! {rows} records processed ({skipped} skipped)."
+    },
+    'voa': {
+        'title': 'VOA Orders Converter (volunteers/public)',
+        'label': 'VOA',
+        'inputs': {
+            'name': 'NAME',
+            'contact': 'CONTACT NUMBER',
+            'email': ['Email Address', 'E-MAIL'],
+            'residency': RESIDENCY_COL,
+            'aesthetics': AESTHETICS_COL,
+            **{f'grid_{size}': col for size, col in GRID_COLUMNS.items()},
+            **{f'text_{design}': col for design, col in TEXT_FIELDS.items()}
+        },
+        'required': ['name'],
+        'optional': ['email', 'aesthetics'] + [f'grid_{size}' for size in GRID_COLUMNS]
+                    + [f'text_{design}' for design in TEXT_FIELDS],
+        'steps': ['expand_orders'],
+        'row_local': True,
+        'output': ['name', 'email', 'contact', 'residency', 'design', 'size'],
+        'categories': ['design', 'size', 'residency'],
+        'key': ['name', 'contact'],
+        'breakdowns': ['design', 'size', 'residency'],
+        'default_output': 'voa_orders.csv',
+        'done': "✅ Conversion complete! {rows} order items from {people} people ({skipped} entries skipped).",
+        'empty': "\n❌ No valid orders found!"
+    }
+}
+
+# ---------------------------------------------------------------------------
+# Single-value helpers (kept for library callers)
+# ---------------------------------------------------------------------------
+
+def map_domain(domain):
+    """Map domain names from Google Form to Photoshop format"""
+    return DOMAIN_MAPPING.get(domain.strip(), domain.strip())
+
+def get_domain_columns(domain):
+    """Return TRUE/FALSE values for each domain column based on person's domain"""
+    domain_cols = {flag: False for flag in DOMAIN_FLAGS}
+    domain_lower = domain.lower()
+
+    for flag, keywords in DOMAIN_FLAGS.items():
+        if any(keyword in domain_lower for keyword in keywords):
+            domain_cols[flag] = True
+            break
+
+    return domain_cols
+
+def parse_size_entry(entry):
+    """Parse size entries like 'M,M,S' or '1 L' or '1'M'' or 'S.' into list"""
+    if pd.isna(entry) or str(entry).strip().lower() in ['none', 'nan', '']:
+        return []
+
+    entry_str = str(entry).strip()
+    # Remove quotes, periods, and extra spaces
+    entry_str = entry_str.replace("'", "").replace('"', '').replace('.', '').strip()
+
+    sizes = [s.strip().upper() for s in entry_str.split(',') if s.strip()]
+
+    cleaned_sizes = []
+    for size in sizes:
+        # Extract just the size letter(s): handles "1 L", "1'M'", "S ", "XL ", etc.
+        match = re.search(r'(XXL|XL|[SMLX])', size)
+        if match:
+            cleaned_sizes.append(match.group(1))
+        elif size and size.isalpha() and len(size) <= 3:
+            # Fallback: if it's just letters and short, assume it's a size
+            cleaned_sizes.append(size)
+
+    return cleaned_sizes
+
+# ---------------------------------------------------------------------------
+# Whole-column transforms
+# ---------------------------------------------------------------------------
+
+def text_column(series):
+    """Column as stripped text, with NaN and the literal 'nan' turned into ''"""
+    text = series.astype(object).where(series.notna(), '').astype(str).str.strip()
+    return text.mask(text == 'nan', '')
+
+def map_domain_column(domains):
+    """Vectorized map_domain"""
+    return domains.map(DOMAIN_MAPPING).fillna(domains)
+
+def domain_flag_frame(domains):
+    """Vectorized get_domain_columns: one boolean column per domain flag"""
+    lowered = domains.str.lower()
+    claimed = pd.Series(False, index=domains.index)
+    flags = {}
+
+    for flag, keywords in DOMAIN_FLAGS.items():
+        hit = pd.Series(False, index=domains.index)
+        for keyword in keywords:
+            hit |= lowered.str.contains(keyword, regex=False)
+        flags[flag] = hit & ~claimed
+        claimed |= hit
+
+    return pd.DataFrame(flags, index=domains.index)
+
+def parse_size_tokens(entries):
+    """Split size entries into tokens; returns (tokens, parsed size or NaN), indexed by row label"""
+    text = text_column(entries)
+    ordered = text[(text != '') & (text.str.lower() != 'none')]
+
+    tokens = (ordered.str.replace(r"['\".]", '', regex=True)
+                     .str.split(',')
+                     .explode()
+                     .dropna()
+                     .astype(str)
+                     .str.strip()
+                     .str.upper())
+    tokens = tokens[tokens != '']
+
+    matched = tokens.str.extract(r'(XXL|XL|[SMLX])', expand=False)
+    fallback = tokens.where(tokens.str.isalpha() & (tokens.str.len() <= 3))
+    return tokens, matched.fillna(fallback)
+
+def parse_size_column(entries):
+    """Vectorized parse_size_entry: one row per size, indexed by the entry's row label"""
+    tokens, parsed = parse_size_tokens(entries)
+    return parsed.dropna().astype(str)
+
+def quantity_column(series):
+    """Vectorized int(float(x)) for quantity cells, with blanks and junk counted as 0"""
+    values = pd.to_numeric(series, errors='coerce')
+    return values.where(np.isfinite(values), 0).astype('int64')
+
+TRANSFORMS = {}
+
+def transform(name):
+    """Register a whole-frame transform under the name used in FORMS steps"""
+    def register(func):
+        TRANSFORMS[name] = func
+        return func
+    return register
+
+@transform('shorten_names')
+def shorten_names(frame, stats, quiet=False):
+    """Normalize names and keep only the first word of names longer than MAX_NAME_LENGTH"""
+    frame['full_name'] = normalize_names(frame['name'])
+    frame['name'] = shorten_name_column(frame['full_name'])
+
+    if not quiet:
+        shortened = frame['name'] != frame['full_name']
+        for full, short in zip(frame.loc[shortened, 'full_name'], frame.loc[shortened, 'name']):
+            print(f"📝 Shortened '{full}' to '{short}'")
+    return frame
+
+@transform('shorten_names_quietly')
+def shorten_names_quietly(frame, stats):
+    """shorten_names without the per-name messages"""
+    return shorten_names(frame, stats, quiet=True)
+
+@transform('map_domains')
+def map_domains(frame, stats):
+    """Map form domains to Photoshop names"""
+    frame['domain'] = map_domain_column(frame['domain'])
+    return frame
+
+@transform('domain_flags')
+def domain_flags(frame, stats):
+    """Add the domain visibility columns (booleans, written as TRUE/FALSE)"""
+    flags = domain_flag_frame(frame['domain'])
+    for flag in DOMAIN_FLAGS:
+        frame[flag] = flags[flag].to_numpy()
+    return frame
+
+@transform('disambiguate_names')
+def disambiguate_names(frame, stats):
+    """Rename people whose printed name collides with someone else's in the same domain"""
+    options = stats['options']
+    strategy = parse_strategy(options.get('name-strategy'))
+    frame, report = disambiguate_name_column(frame, strategy)
+    stats['name_changes'] = report
+
+    if len(report) > 0:
+        print(f"\n🔤 Print-name collisions: {len(report)} people affected")
+        for row in report.itertuples(index=False):
+            if row.status == 'changed':
+                print(f"📝 '{row.old_name}' -> '{row.new_name}' ({row.full_name}, {row.domain})")
+            else:
+                print(f"⚠️  '{row.full_name}' ({row.domain}) still prints as '{row.new_name}' - check by hand")
+
+        if options.get('name-report'):
+            print(f"💾 Saving name changes to {options['name-report']}...")
+            write_csv(report, options['name-report'], options.get('compress-level'))
+    return frame
+
+@transform('parse_numbers')
+def parse_numbers(frame, stats):
+    """Read each person's ranked number preferences"""
+    frame['preferences'] = parse_preferences(frame['number'], frame.get('alternates'))
+
+    for name in frame.loc[frame['preferences'].str.len() == 0, 'name']:
+        print(f"⚠️  Invalid number for {name}, the lowest free number will be assigned")
+    return frame
+
+@transform('resolve_numbers')
+def resolve_numbers(frame, stats):
+    """Give out numbers by preference, earliest submissions first"""
+    options = stats['options']
+    print("\n🔍 Checking for number conflicts...")
+
+    pinned = None
+    if options.get('keep-numbers'):
+        previous = read_table(options['keep-numbers'], usecols=['name', 'domain', 'number'])
+        previous['number'] = pd.to_numeric(previous['number'], errors='coerce')
+        unreadable = previous['number'].isna() | (previous['number'] % 1 != 0)
+        if unreadable.any():
+            print(f"⚠️  {int(unreadable.sum())} rows of {options['keep-numbers']} have no usable number and are not kept")
+        previous = previous[~unreadable].drop_duplicates(['name', 'domain'])
+        kept = frame[['name', 'domain']].reset_index().merge(previous, on=['name', 'domain'])
+        pinned = dict(zip(kept['index'], kept['number'].astype(int)))
+        print(f"📌 Keeping {len(pinned)} numbers from {options['keep-numbers']}")
+
+    scope = options.get('number-scope')
+    if scope is None:
+        # One shared 0-99 pool can't number everyone, so each domain gets its own
+        scope = 'domain' if len(frame) > len(NUMBER_RANGE) else 'all'
+        if scope == 'domain':
+            print(f"ℹ️  {len(frame)} people but only {len(NUMBER_RANGE)} numbers: numbering each domain "
+                  f"separately (--number-scope domain)")
+
+    return resolve_number_conflicts(frame,
+                                    nearby=int(options.get('nearby', 0)),
+                                    scope=scope,
+                                    pinned=pinned,
+                                    report_file=options.get('number-report'),
+                                    level=options.get('compress-level'))
+
+@transform('clean_sizes')
+def clean_sizes(frame, stats):
+    """Upper-case sizes and mark blanks as NOT SPECIFIED"""
+    missing = frame['size'] == ''
+    for name in frame.loc[missing, 'name']:
+        print(f"⚠️  {name}: Size not specified")
+    frame['size'] = frame['size'].str.upper().mask(missing, 'NOT SPECIFIED')
+    return frame
+
+@transform('expand_orders')
+def expand_orders(frame, stats):
+    """Turn each VOA response into one row per ordered item"""
+    grid_cols = [f'grid_{size}' for size in GRID_COLUMNS if f'grid_{size}' in frame.columns]
+
+    # A person is on the legacy form if any size quantity is a positive number
+    legacy = pd.Series(False, index=frame.index)
+    for col in grid_cols:
+        legacy |= quantity_column(frame[col]) > 0
+
+    parts = [_legacy_orders(frame[legacy], grid_cols), _text_orders(frame[~legacy])]
+    orders = pd.concat(parts)
+    orders = orders.iloc[np.argsort(orders.index.to_numpy(), kind='stable')]
+
+    no_orders = frame.index.difference(orders.index)
+    for name in frame.loc[no_orders, 'name']:
+        print(f"⚠️  {name}: No orders found")
+    stats['skipped'] += len(no_orders)
+
+    people = frame[['name', 'email', 'contact', 'residency']]
+    result = people.loc[orders.index].assign(design=orders['design'].to_numpy(),
+                                             size=orders['size'].to_numpy())
+    stats['people'] = result['name'].nunique()
+    return result
+
+def _legacy_orders(frame, grid_cols):
+    """Split legacy size quantities across the designs picked in the aesthetics question
+
+    Whole-column version of the per-person loop: one boolean column per design, one
+    quantity matrix, and the base/extra split of each quantity done as array arithmetic.
+    Lines come out in the loop's order: person, then size, then design.
+    """
+    if not grid_cols or frame.empty:
+        return pd.DataFrame({'design': [], 'size': []}, index=pd.Index([], name='row'))
+
+    designs = list(dict.fromkeys([*AESTHETICS_DESIGNS, DEFAULT_DESIGN]))
+    sizes = [col[len('grid_'):] for col in grid_cols]
+
+    picked = np.column_stack([
+        frame['aesthetics'].str.contains('|'.join(map(re.escape, AESTHETICS_DESIGNS.get(design, []))) or '$^')
+        .to_numpy(dtype=bool) for design in designs
+    ])
+    picked[:, designs.index(DEFAULT_DESIGN)] |= ~picked.any(axis=1)
+    num_designs = picked.sum(axis=1)
+    rank = np.cumsum(picked, axis=1) - 1
+
+    quantities = np.column_stack([quantity_column(frame[col]).to_numpy() for col in grid_cols])
+    quantities = np.maximum(quantities, 0)
+
+    # First 'extra' designs get one additional item
+    base_qty, extra = np.divmod(quantities, num_designs[:, None])
+    counts = picked[:, None, :] * (base_qty[:, :, None] + (rank[:, None, :] < extra[:, :, None]))
+
+    uneven = (quantities > 0) & (extra > 0)
+    names = frame['name'].to_numpy()
+    for person, size in zip(*np.nonzero(uneven)):
+        print(f"📝 {names[person]}: {quantities[person, size]} items across "
+              f"{num_designs[person]} designs - distributed unevenly")
+
+    # One line per item: repeat each (person, size, design) cell by its count
+    cells = np.repeat(np.arange(counts.size), counts.ravel())
+    per_person = len(sizes) * len(designs)
+    return pd.DataFrame({
+        'design': np.array(designs, dtype=object)[cells % len(designs)],
+        'size': np.array(sizes, dtype=object)[cells // len(designs) % len(sizes)]
+    }, index=pd.Index(frame.index[cells // per_person], name='row'))
+
+def _text_orders(frame):
+    """Parse the per-design free-text size lists"""
+    parts = []
+    for design in TEXT_FIELDS:
+        col = f'text_{design}'
+        if col in frame.columns:
+            sizes = parse_size_column(frame[col])
+            parts.append(pd.DataFrame({'design': design, 'size': sizes.to_numpy()}, index=sizes.index))
+
+    if not parts:
+        return pd.DataFrame(columns=['design', 'size'])
+
+    # Per person: designs in TEXT_FIELDS order, sizes in the order they were typed
+    orders = pd.concat(parts)
+    return orders.iloc[np.argsort(orders.index.to_numpy(), kind='stable')]
+
+# ---------------------------------------------------------------------------
+# Engine
+# ---------------------------------------------------------------------------
+
+def compact_frame(frame, categories=()):
+    """Store low-cardinality columns as categoricals and other text as Arrow strings (if available)"""
+    frame = frame.copy()
+    for col in frame.columns:
+        if col in categories:
+            # Categories in order of first appearance, so breakdowns list ties as before
+            frame[col] = pd.Categorical(frame[col], categories=frame[col].dropna().unique())
+        elif STRING_DTYPE and (frame[col].dtype == object or pd.api.types.is_string_dtype(frame[col])):
+            frame[col] = frame[col].astype(STRING_DTYPE)
+    return frame
+
+def flags_as_text(frame):
+    """Boolean columns as the TRUE/FALSE text the Photoshop data sets expect"""
+    flags = [col for col in frame.columns if pd.api.types.is_bool_dtype(frame[col])]
+    if not flags:
+        return frame
+    return frame.assign(**{col: np.where(frame[col], 'TRUE', 'FALSE') for col in flags})
+
+def memory_report(frame):
+    """Bytes per column as stored, next to the same column held as Python strings"""
+    legacy = flags_as_text(frame)
+    legacy = legacy.astype({col: object for col in legacy.columns
+                            if not pd.api.types.is_numeric_dtype(legacy[col])})
+
+    table = pd.DataFrame({
+        'dtype': frame.dtypes.astype(str),
+        'before': legacy.memory_usage(index=False, deep=True),
+        'after': frame.memory_usage(index=False, deep=True)
+    })
+    table.loc['total'] = ['', table['before'].sum(), table['after'].sum()]
+    table['saving'] = (table['before'] / table['after'].where(table['after'] > 0)).map('{:.1f}x'.format)
+    return table
+
+def compile_plan(form_type):
+    """Compile a form declaration into the columns to read and the steps to run"""
+    if form_type not in FORMS:
+        raise ValueError(f"Unknown form type '{form_type}'. Use: {', '.join(FORMS)}")
+
+    spec = FORMS[form_type]
+    sources = {}
+    for key, headers in spec['inputs'].items():
+        headers = headers if isinstance(headers, list) else [headers]
+        sources[key] = [normalize_header(header) for header in headers]
+
+    return {
+        'form_type': form_type,
+        'spec': spec,
+        'sources': sources,
+        'usecols': {header for headers in sources.values() for header in headers},
+        'steps': [TRANSFORMS[step] for step in spec['steps']]
+    }
+
+def read_form(input_file, plan, sheet=None, progress=None):
+    """Read only the columns the plan needs (CSV export or a sheet of an Excel workbook)"""
+    return read_table(input_file, usecols=plan['usecols'], sheet=sheet, progress=progress)
+
+def run_plan(plan, df, options=None, keep_index=False, progress=None):
+    """Run a compiled plan on a form DataFrame; returns (output DataFrame, stats)
+
+    options are the command-line style settings (e.g. {'name-strategy': 'full'}),
+    handed to every step as stats['options']. With keep_index the output keeps the
+    form row label of each line instead of a fresh 0..n index. progress is an
+    optional callback told the rows converted once the steps are done (see progress.py).
+    """
+    spec = plan['spec']
+    optional = set(spec.get('optional', []))
+
+    frame = pd.DataFrame(index=df.index)
+    for key, headers in plan['sources'].items():
+        header = next((h for h in headers if h in df.columns), None)
+        if header is None:
+            if key in optional:
+                continue
+            raise KeyError(headers[0])
+        # Timestamps and numbers keep their raw values; everything else is cleaned text
+        frame[key] = df[header] if key in ('Timestamp', 'number') else text_column(df[header])
+
+    for key in optional:
+        if key not in frame.columns and not key.startswith(('grid_', 'text_')):
+            frame[key] = ''
+
+    missing = pd.Series(False, index=frame.index)
+    for key in spec['required']:
+        missing |= frame[key] == ''
+
+    for idx in frame.index[missing]:
+        print(f"⚠️  Skipping row {idx+2} - missing {' or '.join(spec['required'])}")
+
+    stats = {'entries': len(frame), 'skipped': int(missing.sum()), 'options': options or {}}
+    frame = frame[~missing].copy()
+
+    for step in plan['steps']:
+        frame = step(frame, stats)
+    report(progress, 'transform', len(df), len(df))
+
+    output = compact_frame(frame.reindex(columns=spec['output']), spec.get('categories', []))
+    if not keep_index:
+        output = output.reset_index(drop=True)
+    stats['rows'] = len(output)
+    stats.setdefault('people', output['name'].nunique() if len(output) else 0)
+    return output, stats
+
+def parse_jobs(value):
+    """Turn a --jobs value into a worker count ('auto' or 0 means every core)"""
+    if value is None:
+        return 1
+    if value is True or str(value).strip().lower() in ('auto', '0'):
+        return os.cpu_count() or 1
+    jobs = int(value)
+    if jobs < 1:
+        raise ValueError(f"--jobs must be at least 1 (got {value})")
+    return jobs
+
+def _run_chunk(form_type, chunk, options):
+    """Worker: run one row range and hand back its printed messages with the result"""
+    messages = io.StringIO()
+    with redirect_stdout(messages):
+        output, stats = run_plan(compile_plan(form_type), chunk, options, keep_index=True)
+    return output, stats, messages.getvalue()
+
+def run_plan_parallel(plan, df, options=None, jobs=1, progress=None):
+    """run_plan over row ranges in a process pool, merged back in the original row order
+
+    Only for forms whose steps look at one row at a time ('row_local'), so the output
+    and stats match a serial run. Warnings are printed one row range after another.
+    When progress is reported a large frame is cut into ranges of CHUNK_ROWS (in this
+    process with one job), so the transform stage counts rows as they are converted.
+    """
+    chunked = progress is not None and len(df) > CHUNK_ROWS
+    if not plan['spec'].get('row_local') or ((jobs <= 1 or len(df) < 2 * jobs) and not chunked):
+        return run_plan(plan, df, options, progress=progress)
+
+    parts = max(jobs, math.ceil(len(df) / CHUNK_ROWS)) if chunked else jobs
+    bounds = np.linspace(0, len(df), parts + 1).astype(int)
+    chunks = [df.iloc[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+
+    results, done = [], 0
+    pool = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    try:
+        pending = (pool.map if pool else map)(_run_chunk, [plan['form_type']] * parts, chunks, [options] * parts)
+        for chunk, result in zip(chunks, pending):
+            results.append(result)
+            done += len(chunk)
+            report(progress, 'transform', done, len(df))
+    finally:
+        if pool:
+            pool.shutdown()
+
+    for _, _, messages in results:
+        print(messages, end='')
+
+    # Each part has its own categories, so compact the merged frame again
+    output = pd.concat([part for part, _, _ in results]).reset_index(drop=True)
+    output = compact_frame(output, plan['spec'].get('categories', []))
+    stats = {'entries': len(df), 'options': options or {}, 'rows': len(output),
+             'skipped': sum(part_stats['skipped'] for _, part_stats, _ in results),
+             'people': output['name'].nunique() if len(output) else 0}
+    return output, stats
+
+def write_output(df, output_file, progress=None, level=None):
+    """Save a converter output CSV (compressed for .gz/.zst), in chunks when progress is being reported"""
+    df = flags_as_text(df)
+    if progress is None or len(df) <= CHUNK_ROWS:
+        write_csv(df, output_file, level)
+        report(progress, 'write', len(df), len(df))
+        return
+
+    write_csv(df, output_file, level, CHUNK_ROWS, lambda rows: report(progress, 'write', rows, len(df)))
+
+# Rows a plain --dry-run reads from the start of the file
+DRY_RUN_ROWS = 1000
+
+# Warnings shown from a dry run before the rest are only counted
+DRY_RUN_WARNINGS = 10
+
+# Options that make a step save a side report, dropped in a dry run
+REPORT_OPTIONS = ['name-report', 'number-report']
+
+def is_dry_run(options):
+    """Whether options ask for a dry run (--dry-run or --sample), which must write no files"""
+    return bool((options or {}).get('dry-run') or (options or {}).get('sample'))
+
+def _header_lines(plan, columns):
+    """One line per form input: the header it resolved to, or why it is missing"""
+    spec = plan['spec']
+    required = set(spec['required'])
+    lines, grouped = [], {}
+    for key, headers in plan['sources'].items():
+        header = next((h for h in headers if h in columns), None)
+        if key.startswith(('grid_', 'text_')):
+            group = 'legacy size grid' if key.startswith('grid_') else 'design text fields'
+            found, count = grouped.get(group, (0, 0))
+            grouped[group] = (found + (header is not None), count + 1)
+        elif header is not None:
+            lines.append(f"  ✓ {key:12s} <- {header[:60]}")
+        elif key in required or key not in spec.get('optional', []):
+            lines.append(f"  ❌ {key:12s} missing (looked for: {' / '.join(headers)[:60]})")
+        else:
+            lines.append(f"  - {key:12s} not in this export (optional)")
+    for group, (found, count) in grouped.items():
+        lines.append(f"  {'✓' if found else '-'} {group}: {found} of {count} columns")
+    return lines
+
+def dry_run_form(form_type, input_file, label=None, options=None):
+    """Run a form's whole pipeline on part of the export and report what a full run would do
+
+    --sample N keeps N random rows, --sample 0.05 keeps 5% of them (both stream the whole
+    file); a plain --dry-run reads only the first DRY_RUN_ROWS rows. Counts are scaled up
+    to the whole file. Nothing is written.
+    """
+    options = options or {}
+    plan = compile_plan(form_type)
+    spec = plan['spec']
+    sample = options.get('sample')
+    sample = parse_sample(sample) if sample not in (None, True) else None
+
+    print(f"\n🧪 Dry run: {label or spec['label']} data from {input_file} (no files are written)")
+    for key in REPORT_OPTIONS:
+        if options.get(key):
+            print(f"ℹ️  --{key} {options[key]} is not written in a dry run")
+    options = {key: value for key, value in options.items() if key not in REPORT_OPTIONS}
+    started = time.perf_counter()
+    if sample is None:
+        df, total = read_head(input_file, DRY_RUN_ROWS, plan['usecols'], options.get('sheet'))
+        how = 'first'
+    else:
+        df, total = sample_table(input_file, sample, plan['usecols'], options.get('sheet'))
+        how = 'random'
+    read_seconds = time.perf_counter() - started
+    scale = total / len(df) if total and len(df) else None
+
+    print(f"✓ Read {len(df):,} {how} rows of " + (f"{total:,}" if total and how == 'random' else
+                                                   f"~{total:,}" if total else "an unknown number of") + " rows")
+    print("\n🔎 Columns:")
+    lines = _header_lines(plan, df.columns)
+    print("\n".join(lines))
+    if any('❌' in line for line in lines):
+        print("\n❌ Required columns are missing - a full run would stop here.")
+        return None
+
+    messages = io.StringIO()
+    started = time.perf_counter()
+    try:
+        with redirect_stdout(messages):
+            output, stats = run_plan(plan, df, options)
+    except (KeyError, ValueError) as e:
+        print(messages.getvalue(), end='')
+        print(f"\n❌ The pipeline failed on the sample: {e}")
+        return None
+    transform_seconds = time.perf_counter() - started
+
+    warnings = [line for line in messages.getvalue().splitlines() if line.startswith('⚠️')]
+    if warnings:
+        print(f"\n⚠️  {len(warnings)} warnings on the sample:")
+        print("\n".join(warnings[:DRY_RUN_WARNINGS]))
+        if len(warnings) > DRY_RUN_WARNINGS:
+            print(f"   ... and {len(warnings) - DRY_RUN_WARNINGS} more")
+
+    estimate = (lambda count: f"~{round(count * scale):,}") if scale else (lambda count: '?')
+    print(f"\n📈 Sample: {stats['entries']:,} entries, {stats['skipped']:,} skipped, {stats['rows']:,} output rows")
+    print(f"   Full file (estimated): {estimate(stats['entries'])} entries, {estimate(stats['skipped'])} skipped, "
+          f"{estimate(stats['rows'])} output rows")
+
+    for col in spec['breakdowns']:
+        counts = output[col].value_counts()
+        table = pd.DataFrame({'sample': counts})
+        if scale:
+            table['estimated'] = (counts * scale).round().astype(int)
+        print(f"\n📊 {col.capitalize()} breakdown:")
+        print(table.to_string())
+
+    if scale:
+        # A head read only saw part of the file; a random sample already read all of it
+        projected = (read_seconds * (scale if how == 'first' else 1)) + transform_seconds * scale
+        print(f"\n⏱️  Sample took {read_seconds + transform_seconds:.1f}s; a full run should take about "
+              f"{projected:.1f}s (plus writing)")
+    return None
+
+# Input rows converted and committed per checkpoint (--checkpoint / --resume)
+CHECKPOINT_ROWS = CHUNK_ROWS
+
+def checkpointed_form(plan, input_file, output_file, label=None, options=None):
+    """Convert a row-local form chunk by chunk, committing each chunk to disk as it goes
+
+    Every chunk of input rows is appended to <output>.partial and synced, then the
+    journal (<output>.checkpoint.json: input digest, options, input rows and output bytes
+    committed, running counts) is replaced atomically. With --resume a run picks up after
+    the last committed chunk, so an interrupted run finishes with the same bytes as an
+    uninterrupted one. The finished file replaces output_file and the journal is removed.
+    """
+    options = options or {}
+    spec = plan['spec']
+    chunk_rows = int(options.get('checkpoint-rows', CHECKPOINT_ROWS))
+    expected = new_journal(plan['form_type'], input_file, options, chunk_rows)
+
+    print(f"\n📋 Reading {label or spec['label']} data from: {input_file} ({chunk_rows:,} rows per checkpoint)")
+    journal = None
+    if options.get('resume'):
+        journal, reason = load_journal(output_file, expected)
+        if journal:
+            print(f"⏯️  Resuming after input row {journal['rows_read']:,} "
+                  f"({journal['rows']:,} output rows already committed)")
+        else:
+            print(f"ℹ️  Starting from the beginning: {reason}")
+    journal = journal or expected
+    save_journal(output_file, journal)
+
+    jobs = parse_jobs(options.get('jobs'))
+    skip = range(1, journal['rows_read'] + 1) if journal['rows_read'] else None
+    f = open_partial(output_file, journal['bytes'])
+    try:
+        for chunk in iter_table(input_file, plan['usecols'], chunk_rows, options.get('sheet'), skiprows=skip):
+            start = journal['rows_read']
+            chunk.index = pd.RangeIndex(start, start + len(chunk))
+            output, stats = run_plan_parallel(plan, chunk, options, jobs)
+
+            text = flags_as_text(output).to_csv(index=False, header=journal['bytes'] == 0)
+            journal['bytes'] = commit_chunk(f, text)
+            journal['rows_read'] += len(chunk)
+            for key in ['entries', 'skipped', 'rows']:
+                journal[key] += stats[key]
+            save_journal(output_file, journal)
+            print(f"💾 Committed input rows {start + 1:,}-{journal['rows_read']:,} "
+                  f"({journal['rows']:,} output rows so far)")
+    except (Exception, KeyboardInterrupt):
+        print(f"\n⏸️  Stopped after {journal['rows_read']:,} committed input rows - "
+              f"run the same command with --resume to continue from there")
+        raise
+    finally:
+        f.close()
+
+    if journal['rows'] == 0 and 'empty' in spec:
+        clear_checkpoint(output_file)
+        print(spec['empty'])
+        return pd.DataFrame(columns=spec['output'])
+
+    print(f"\n💾 Saving to {output_file}...")
+    if compression_of(output_file):
+        with open(partial_file(output_file), encoding='utf-8', newline='') as source, \
+                open_output(output_file, options.get('compress-level')) as target:
+            shutil.copyfileobj(source, target, 1024 * 1024)
+    else:
+        os.replace(partial_file(output_file), output_file)
+    clear_checkpoint(output_file)
+
+    # Read the finished file back for the summary and for callers (ledger, --diff-against)
+    output_df = compact_frame(read_table(output_file, dtype=str, keep_default_na=False),
+                              spec.get('categories', []))
+    stats = {key: journal[key] for key in ['entries', 'skipped', 'rows']}
+    stats['people'] = output_df['name'].nunique() if len(output_df) else 0
+    print(spec['done'].format(**stats))
+    for col in spec['breakdowns']:
+        print(f"\n📊 {col.capitalize()} breakdown:")
+        print(output_df[col].value_counts().to_string())
+    return output_df
+
+# Conversion options that take a value, for scripts that parse their own command line
+CONVERT_OPTIONS = {'--sheet', '--sample', '--jobs', '--compress-level', '--checkpoint-rows',
+                   '--name-strategy', '--name-report', '--nearby', '--number-scope',
+                   '--keep-numbers', '--number-report'}
+
+def convert_form(form_type, input_file, output_file, label=None, options=None, progress=None):
+    """Read, convert and save one form export using its registered declaration
+
+    progress is a callback(stage, done, total) for library callers; by default a
+    ProgressReporter draws a status line when the output is a terminal. With the
+    dry-run or sample option nothing is written and None is returned (see dry_run_form);
+    with checkpoint or resume a row-local form is committed chunk by chunk (see
+    checkpointed_form).
+    """
+    if is_dry_run(options):
+        return dry_run_form(form_type, input_file, label, options)
+
+    plan = compile_plan(form_type)
+    spec = plan['spec']
+    if (options or {}).get('checkpoint') or (options or {}).get('resume'):
+        if not spec.get('row_local'):
+            print(f"ℹ️  Only voa conversions can be checkpointed: {spec['label']} exports are converted in "
+                  f"one pass (every row is needed to resolve names and numbers), so --checkpoint/--resume "
+                  f"are ignored")
+        elif is_workbook(input_file):
+            print("ℹ️  Excel workbooks are read in one piece, so --checkpoint/--resume are ignored "
+                  "(save the sheet as CSV to resume)")
+        else:
+            return checkpointed_form(plan, input_file, output_file, label, options)
+
+    reporter = ProgressReporter() if progress is None else None
+    if reporter and reporter.enabled:
+        progress = reporter
+
+    # The status line is always ended, so nothing printed after it lands on the same line
+    try:
+        print(f"\n📋 Reading {label or spec['label']} data from: {input_file}")
+        df = read_form(input_file, plan, (options or {}).get('sheet'), progress)
+        print(f"✓ Found {len(df)} entries")
+
+        output_df, stats = run_plan_parallel(plan, df, options, parse_jobs((options or {}).get('jobs')), progress)
+        empty = len(output_df) == 0 and 'empty' in spec
+        if not empty:
+            print(f"\n💾 Saving to {output_file}...")
+            write_output(output_df, output_file, progress, (options or {}).get('compress-level'))
+    finally:
+        if reporter:
+            reporter.close()
+
+    if empty:
+        print(spec['empty'])
+        return output_df
+
+    print(spec['done'].format(**stats))
+    for col in spec['breakdowns']:
+        print(f"\n📊 {col.capitalize()} breakdown:")
+        print(output_df[col].value_counts().to_string())
+
+    if (options or {}).get('memory-report'):
+        print(f"\n🧮 Memory per column (bytes):")
+        print(memory_report(output_df).to_string())
+
+    return output_df
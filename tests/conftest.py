@@ -0,0 +1,35 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# The toolkit is a set of top-level scripts, so import them from the repository root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from registry import TEXT_FIELDS, RESIDENCY_COL
+
+
+@pytest.fixture
+def voa_form(tmp_path):
+    """Write a small new-style VOA export; rows are dicts of name/contact/email/sizes/extra columns"""
+    def write(rows, name='voa_form.csv'):
+        records = []
+        for row in rows:
+            record = {
+                'Timestamp': row.get('timestamp', '1/28/2026 9:05:00'),
+                'NAME': row['name'],
+                'CONTACT NUMBER': row.get('contact', ''),
+                'E-MAIL': row.get('email', ''),
+                RESIDENCY_COL: row.get('residency', 'Day Scholar'),
+            }
+            for design, header in TEXT_FIELDS.items():
+                record[header] = row.get('sizes', {}).get(design, 'None')
+            record.update(row.get('extra', {}))
+            records.append(record)
+        path = tmp_path / name
+        pd.DataFrame(records).to_csv(path, index=False)
+        return str(path)
+    return write
@@ -0,0 +1,65 @@
+import os
+
+import pytest
+
+import registry
+from checkpoint import journal_file, partial_file
+from convert_voa import convert_voa_data
+
+
+def people(count):
+    return [{'name': f"Person {i}", 'contact': f"98765{i:05d}", 'sizes': {'Technocracy': 'M,L', 'Jacket': 'XL'}}
+            for i in range(count)]
+
+
+def interrupt_on_save(monkeypatch, calls):
+    """Make the calls-th journal save fail, after its chunk is already in the partial file"""
+    save_journal = registry.save_journal
+    seen = []
+
+    def failing(output_file, journal):
+        seen.append(journal['rows_read'])
+        if len(seen) == calls:
+            raise KeyboardInterrupt
+        save_journal(output_file, journal)
+    monkeypatch.setattr(registry, 'save_journal', failing)
+
+
+def test_resume_after_interruption_matches_an_uninterrupted_run(voa_form, tmp_path, monkeypatch, capsys):
+    input_file = voa_form(people(23))
+    plain, output = str(tmp_path / 'plain.csv'), str(tmp_path / 'orders.csv')
+    convert_voa_data(input_file, plain)
+    options = {'checkpoint': True, 'checkpoint-rows': '5'}
+
+    # The third save comes after the second chunk was appended: that chunk is not committed
+    with monkeypatch.context() as patch:
+        interrupt_on_save(patch, 3)
+        with pytest.raises(KeyboardInterrupt):
+            convert_voa_data(input_file, output, options)
+    assert not os.path.exists(output)
+    assert os.path.exists(journal_file(output)) and os.path.exists(partial_file(output))
+
+    convert_voa_data(input_file, output, {**options, 'resume': True})
+    assert 'Resuming after input row 5' in capsys.readouterr().out
+    with open(output, 'rb') as resumed, open(plain, 'rb') as expected:
+        assert resumed.read() == expected.read()
+    assert not os.path.exists(journal_file(output)) and not os.path.exists(partial_file(output))
+
+
+def test_resume_starts_over_when_the_input_changed(voa_form, tmp_path, monkeypatch, capsys):
+    output = str(tmp_path / 'orders.csv')
+    options = {'checkpoint': True, 'checkpoint-rows': '5'}
+    with monkeypatch.context() as patch:
+        interrupt_on_save(patch, 3)
+        with pytest.raises(KeyboardInterrupt):
+            convert_voa_data(voa_form(people(12)), output, options)
+
+    input_file = voa_form(people(14))
+    plain = str(tmp_path / 'plain.csv')
+    convert_voa_data(input_file, plain)
+    convert_voa_data(input_file, output, {**options, 'resume': True})
+
+    assert 'Starting from the beginning: checkpoint is for a different run (the input file changed)' \
+        in capsys.readouterr().out
+    with open(output, 'rb') as resumed, open(plain, 'rb') as expected:
+        assert resumed.read() == expected.read()
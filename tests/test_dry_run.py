@@ -0,0 +1,33 @@
+import os
+
+from tshirt_converter import check_before_convert, check_duplicates
+from registry import convert_form
+
+
+def test_dry_run_writes_no_files(voa_form, tmp_path, monkeypatch):
+    input_file = voa_form([
+        {'name': 'Rahul Dev', 'contact': '+91 98765 43210', 'sizes': {'Technocracy': 'M'}},
+        {'name': 'Dev Rahul', 'contact': '09876543210', 'sizes': {'Dharma': 'L'}},
+        {'name': 'Meera Iyer', 'contact': '9123456780', 'sizes': {'Abyss': 'XL'}},
+    ])
+    monkeypatch.chdir(tmp_path)
+    before = set(os.listdir(tmp_path))
+    options = {'dry-run': True, 'fail-fast': True, 'check-duplicates': True,
+               'name-report': 'names.csv', 'number-report': 'numbers.csv'}
+
+    check_before_convert(input_file, 'voa', options)
+    check_duplicates(input_file, 'voa', options)
+    assert convert_form('voa', input_file, 'voa_orders.csv', options=options) is None
+
+    assert set(os.listdir(tmp_path)) == before
+
+
+def test_dry_run_drops_cores_report_options(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    example = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'examples', 'cores_example.csv')
+    options = {'sample': '2', 'name-report': 'names.csv', 'number-report': 'numbers.csv'}
+
+    convert_form('cores', example, 'cores_photoshop.csv', options=options)
+
+    assert os.listdir(tmp_path) == []
+    assert '--number-report numbers.csv is not written in a dry run' in capsys.readouterr().out
@@ -0,0 +1,75 @@
+import pandas as pd
+
+import tshirt_converter
+from duplicates import phone_digits, find_duplicates, duplicates_file, MAX_BLOCK
+
+
+def test_phone_digits_matches_country_code_and_trunk_prefix():
+    contacts = pd.Series(['+91 98765 43210', '09876543210', '98765-43210', '12345', ''])
+    assert phone_digits(contacts).tolist() == ['9876543210'] * 3 + ['', '']
+
+
+def test_cores_duplicates_use_the_real_name_phone_and_email(tmp_path):
+    form = pd.DataFrame({
+        'Timestamp': ['1/28/2026 9:05:00', '1/28/2026 9:40:00', '1/28/2026 10:00:00'],
+        'Email Address': ['rahul.d@example.com', 'Rahul.D+merch@example.com', 'meera@example.com'],
+        'NAME': ['Rahul Dev', 'Dev Rahul', 'Meera Iyer'],
+        'CONTACT NUMBER': ['+91 98765 43210', '09876543210', '9123456780'],
+        # The printed names differ completely, so only the person columns can match them
+        'Name On Merch:': ['RD', 'Captain', 'Meera'],
+        'Domain': ['Tech', 'Tech', 'Design'],
+    })
+    path = tmp_path / 'cores_form.csv'
+    form.to_csv(path, index=False)
+
+    review = duplicates_file(str(path), str(tmp_path / 'review.csv'), 'cores')
+    assert len(review) == 1
+    match = review.iloc[0]
+    assert (match['row_a'], match['row_b']) == (2, 3)
+    assert match['later'] == 'b'
+    assert 'same phone' in match['reasons'] and 'email 1.00' in match['reasons']
+    assert (tmp_path / 'review.csv').exists()
+
+
+def test_shared_phone_is_compared_however_many_rows_share_it():
+    rows = MAX_BLOCK + 10
+    # Different people who all share one phone and email; their names all start 'Per'
+    names = [f"Person{chr(65 + i // 26)}{chr(65 + i % 26)} Q{i:03d}x" for i in range(rows)]
+    df = pd.DataFrame({
+        'NAME': names,
+        'CONTACT NUMBER': ['9876543210'] * rows,
+        'E-MAIL': ['team@example.com'] * rows,
+    })
+
+    review, stats = find_duplicates(df, 'voa', threshold=0.0)
+    assert stats['pairs'] == rows * (rows - 1) // 2
+    # Only the oversized 'per' name block is skipped, the phone and email blocks are not
+    assert stats['skipped_blocks'] == 1
+    assert len(review) == stats['pairs']
+
+
+def test_common_name_blocks_are_capped():
+    rows = MAX_BLOCK + 1
+    df = pd.DataFrame({'NAME': [f"Rahul {i}" for i in range(rows)], 'CONTACT NUMBER': [''] * rows})
+
+    review, stats = find_duplicates(df, 'voa')
+    assert stats['skipped_blocks'] == 1
+    assert stats['pairs'] == 0
+
+
+def test_exes_check_duplicates_is_not_ignored(tmp_path, monkeypatch):
+    form = pd.DataFrame({
+        'Timestamp': ['1/28/2026 9:05:00', '1/28/2026 9:40:00'],
+        'NAME': ['Meera Iyer', 'Meera  Iyer'],
+        'CONTACT NUMBER': ['9123456780', '+91 91234 56780'],
+        'Name On Merch:': ['Meera', 'MI'],
+        'Domain': ['Design', 'Design'],
+    })
+    form.to_csv(tmp_path / 'exes_form.csv', index=False)
+    monkeypatch.chdir(tmp_path)
+
+    monkeypatch.setattr('sys.argv', ['tshirt_converter.py', 'exes', 'exes_form.csv', 'exes_out.csv', '--check-duplicates'])
+    tshirt_converter.main()
+
+    review = pd.read_csv(tmp_path / 'duplicates_review.csv')
+    assert review[['row_a', 'row_b']].values.tolist() == [[2, 3]]
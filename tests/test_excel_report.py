@@ -0,0 +1,59 @@
+import pandas as pd
+import pytest
+
+import excel_report
+from excel_report import ReportBook, write_orders
+
+openpyxl = pytest.importorskip('openpyxl')
+
+
+def sheet_rows(path):
+    book = openpyxl.load_workbook(path, read_only=True)
+    return {name: [[cell if cell is not None else '' for cell in row] for row in book[name].iter_rows(values_only=True)]
+            for name in book.sheetnames}
+
+
+def test_merged_orders_with_different_columns(tmp_path):
+    first, second = tmp_path / 'a.csv', tmp_path / 'b.csv'
+    pd.DataFrame({'name': ['Asha'], 'design': ['Dharma'], 'size': ['M']}).to_csv(first, index=False)
+    pd.DataFrame({'name': ['Ben'], 'size': ['L'], 'residency': ['Hostel']}).to_csv(second, index=False)
+
+    book = ReportBook(str(tmp_path / 'report.xlsx'))
+    assert write_orders(book, [str(first), str(second)]) == 2
+    book.close()
+
+    rows = sheet_rows(tmp_path / 'report.xlsx')['Orders']
+    assert rows == [
+        ['name', 'design', 'size', 'residency', 'file'],
+        ['Asha', 'Dharma', 'M', '', str(first)],
+        ['Ben', '', 'L', 'Hostel', str(second)],
+    ]
+
+
+def test_orders_start_a_new_sheet_at_the_row_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr(excel_report, 'EXCEL_MAX_ROWS', 4)
+    orders = tmp_path / 'orders.csv'
+    pd.DataFrame({'name': [f"P{i}" for i in range(7)], 'size': ['=1+1'] * 7}).to_csv(orders, index=False)
+
+    book = ReportBook(str(tmp_path / 'report.xlsx'))
+    assert write_orders(book, [str(orders)]) == 7
+    book.close()
+
+    sheets = sheet_rows(tmp_path / 'report.xlsx')
+    assert [len(rows) for rows in sheets.values()] == [4, 4, 2]
+    # Form text starting with '=' stays text instead of becoming a formula
+    assert openpyxl.load_workbook(tmp_path / 'report.xlsx')['Orders']['B2'].data_type == 's'
+
+
+def test_openpyxl_fallback_keeps_formula_text_as_text(tmp_path, monkeypatch):
+    monkeypatch.setattr(excel_report, 'xlsxwriter', None)
+    orders = tmp_path / 'orders.csv'
+    pd.DataFrame({'name': ['=HYPERLINK("http://x")', '+1', '-A', '@SUM(A1)', 'Asha']}).to_csv(orders, index=False)
+
+    book = ReportBook(str(tmp_path / 'report.xlsx'))
+    write_orders(book, [str(orders)])
+    book.close()
+
+    sheet = openpyxl.load_workbook(tmp_path / 'report.xlsx')['Orders']
+    assert [(cell.value, cell.data_type) for (cell,) in sheet.iter_rows(min_row=2)] == [
+        ('=HYPERLINK("http://x")', 's'), ('+1', 's'), ('-A', 's'), ('@SUM(A1)', 's'), ('Asha', 's')]
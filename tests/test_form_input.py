@@ -0,0 +1,59 @@
+import pandas as pd
+import pytest
+
+import form_input
+from form_input import read_table, sniff_file
+
+
+def test_workbook_batches_read_like_one_csv(tmp_path, monkeypatch):
+    openpyxl = pytest.importorskip('openpyxl')
+    monkeypatch.setattr(form_input, 'WORKBOOK_BATCH_ROWS', 2)
+    rows = [['Name', 'Number on Merch (0 to 99)', 'Amount'],
+            ['Asha', 7, 1], ['Ben', 8, 2], [None, None, None], ['Chitra', 'seven', 2.5], ['Dev', None, None]]
+    book = openpyxl.Workbook()
+    for row in rows:
+        book.active.append(row)
+    book.save(tmp_path / 'form.xlsx')
+    pd.DataFrame([['' if cell is None else cell for cell in row] for row in rows[1:3] + rows[4:]],
+                 columns=rows[0]).to_csv(tmp_path / 'form.csv', index=False)
+
+    workbook = read_table(str(tmp_path / 'form.xlsx'))
+    pd.testing.assert_frame_equal(workbook, read_table(str(tmp_path / 'form.csv')))
+    assert workbook['Number on Merch (0 to 99)'].tolist()[:3] == ['7', '8', 'seven']
+
+    head = read_table(str(tmp_path / 'form.xlsx'), usecols=['Name'], nrows=3)
+    assert head['Name'].tolist() == ['Asha', 'Ben', 'Chitra']
+
+
+@pytest.mark.parametrize('encoding, delimiter', [
+    ('utf-8-sig', ','), ('utf-16', '\t'), ('cp1252', ';'), ('utf-8', '|'),
+])
+def test_sniffed_exports_read_the_same(tmp_path, encoding, delimiter):
+    form = pd.DataFrame({'Timestamp': ['1/28/2026 9:05:00', '1/28/2026 9:40:00'],
+                         'Name On Merch:': ['José', 'Zoë; R'],
+                         'Domain': ['Tech, Design', 'PR']})
+    path = tmp_path / 'form.csv'
+    form.to_csv(path, index=False, sep=delimiter, encoding=encoding)
+
+    dialect = sniff_file(str(path))
+    assert dialect['delimiter'] == delimiter
+    assert dialect['encoding'] == ('utf-8' if encoding == 'utf-8' else encoding)
+    pd.testing.assert_frame_equal(read_table(str(path)), form)
+
+
+def test_multi_line_quoted_header_is_normalized(tmp_path):
+    path = tmp_path / 'form.csv'
+    path.write_text('Name,"Kindly attach the screenshot of payment\n( JPEG/PDF/PNG)",Name\nAsha,link,A\n',
+                    encoding='utf-8')
+
+    assert sniff_file(str(path))['delimiter'] == ','
+    assert read_table(str(path)).columns.tolist() == [
+        'Name', 'Kindly attach the screenshot of payment ( JPEG/PDF/PNG)', 'Name.1']
+
+
+def test_utf8_sample_cut_inside_a_character(tmp_path, monkeypatch):
+    path = tmp_path / 'form.csv'
+    path.write_bytes(('Name\n' + 'é' * 10).encode('utf-8'))
+    monkeypatch.setattr(form_input, 'SAMPLE_SIZE', 6)
+
+    assert sniff_file(str(path))['encoding'] == 'utf-8'
@@ -0,0 +1,44 @@
+import pandas as pd
+import pytest
+
+from convert_cores import convert_cores_data
+
+
+def cores_form(tmp_path, count, domains=('Technical', 'Design & Editing', 'Media and PR')):
+    form = pd.DataFrame({
+        'Timestamp': [f"1/28/2026 9:{i % 60:02d}:{i // 60:02d}" for i in range(count)],
+        'Name On Merch:': [f"P{i:03d}" for i in range(count)],
+        'Domain': [domains[i % len(domains)] for i in range(count)],
+        'Number on Merch (0 to 99)': [str(i % 10) for i in range(count)],
+    })
+    path = tmp_path / 'cores.csv'
+    form.to_csv(path, index=False)
+    return str(path)
+
+
+def test_more_people_than_numbers_are_numbered_per_domain(tmp_path, capsys):
+    output = convert_cores_data(cores_form(tmp_path, 150), str(tmp_path / 'out.csv'))
+
+    assert 'numbering each domain separately' in capsys.readouterr().out
+    assert len(output) == 150
+    assert not output.duplicated(['domain', 'number']).any()
+
+
+def test_one_pool_too_small_says_to_number_per_domain(tmp_path):
+    with pytest.raises(ValueError, match='--number-scope domain'):
+        convert_cores_data(cores_form(tmp_path, 150), str(tmp_path / 'out.csv'), {'number-scope': 'all'})
+
+
+def test_keep_numbers_skips_rows_without_a_usable_number(tmp_path, capsys):
+    input_file = cores_form(tmp_path, 4)
+    first = convert_cores_data(input_file, str(tmp_path / 'first.csv'))
+    previous = first.copy()
+    previous['number'] = previous['number'].astype(object)
+    previous.loc[0, 'number'] = ''
+    previous.loc[1, 'number'] = 'TBD'
+    previous.to_csv(tmp_path / 'previous.csv', index=False)
+
+    output = convert_cores_data(input_file, str(tmp_path / 'out.csv'), {'keep-numbers': str(tmp_path / 'previous.csv')})
+
+    assert '2 rows of' in capsys.readouterr().out
+    assert output['number'].tolist() == first['number'].tolist()
@@ -0,0 +1,38 @@
+import io
+
+import pandas as pd
+
+import registry
+from convert_voa import convert_voa_data
+from progress import CHUNK_ROWS, ProgressReporter
+
+
+def test_transform_progress_counts_rows(voa_form, tmp_path):
+    rows = CHUNK_ROWS + 500
+    input_file = voa_form([{'name': f"Person {i}", 'contact': f"98765{i:05d}", 'sizes': {'Technocracy': 'M,L'}}
+                           for i in range(rows)])
+    calls = []
+
+    reported = convert_voa_data(input_file, str(tmp_path / 'reported.csv'),
+                                progress=lambda stage, done, total=None: calls.append((stage, done, total)))
+    plain = convert_voa_data(input_file, str(tmp_path / 'plain.csv'))
+
+    transform = [(done, total) for stage, done, total in calls if stage == 'transform']
+    assert len(transform) == 2 and transform[-1] == (rows, rows)
+    assert transform[0][0] < rows
+    assert {stage for stage, _, _ in calls} == {'read', 'transform', 'write'}
+    assert (tmp_path / 'reported.csv').read_bytes() == (tmp_path / 'plain.csv').read_bytes()
+    pd.testing.assert_frame_equal(reported, plain)
+
+
+def test_status_line_is_ended_when_no_orders_are_found(voa_form, tmp_path, monkeypatch, capsys):
+    stream = io.StringIO()
+    monkeypatch.setattr(registry, 'ProgressReporter', lambda: ProgressReporter(stream, interval=0, enabled=True))
+    # The reporter only ends a line on its own when a stage reaches its total
+    monkeypatch.setattr(registry, 'report', lambda progress, stage, done, total=None: progress(stage, done))
+    input_file = voa_form([{'name': 'Asha', 'sizes': {}}])
+
+    output = convert_voa_data(input_file, str(tmp_path / 'orders.csv'))
+
+    assert len(output) == 0
+    assert stream.getvalue().endswith('\n')
@@ -0,0 +1,33 @@
+import gzip
+
+import pandas as pd
+
+from reconcile import to_paise, reconcile, AMOUNT_COL
+
+
+def test_to_paise_reads_common_money_formats():
+    values = pd.Series(['₹1,079.00', '798/-', 'Rs. 399', 'Rs.399', 'INR 1,200.50', '-250', 'abc', None])
+    assert to_paise(values).tolist() == [107900, 79800, 39900, 39900, 120050, -25000, pd.NA, pd.NA]
+
+
+def test_reconcile_matches_rs_prefixed_amounts_and_compresses_reports(tmp_path, voa_form):
+    form = voa_form([
+        {'name': 'Priya Sharma', 'contact': '9876543210', 'sizes': {'Technocracy': 'M'},
+         'timestamp': '1/28/2026 9:05:00', 'extra': {AMOUNT_COL: 'Rs. 399'}},
+    ])
+    prices = tmp_path / 'prices.csv'
+    prices.write_text('item,quantity,price\nTSHIRT,1,399\n')
+    statement = tmp_path / 'statement.csv'
+    statement.write_text('Date,Narration,Amount\n2026-01-28 10:00,UPI/1,Rs. 399\n2026-01-28 11:00,UPI/2,Rs. 250\n')
+
+    output = str(tmp_path / 'reconciliation.csv.gz')
+    report, unmatched = reconcile(form, str(statement), output, str(prices))
+
+    assert report['status'].tolist() == ['ok']
+    assert report['paid'].tolist() == [399.0]
+    assert unmatched['amount'].tolist() == [250.0]
+
+    with gzip.open(output, 'rt', encoding='utf-8') as f:
+        assert f.readline().startswith('row,')
+    with gzip.open(str(tmp_path / 'reconciliation_unmatched_payments.csv.gz'), 'rt', encoding='utf-8') as f:
+        assert '250.0' in f.read()
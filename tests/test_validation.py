@@ -0,0 +1,19 @@
+import pandas as pd
+
+from validation import validate_frame, NAME_COL, DOMAIN_COL, NUMBER_COL
+
+
+def test_number_issues_say_the_lowest_free_number_is_assigned():
+    df = pd.DataFrame({
+        NAME_COL: ['Asha', 'Ben', 'Chitra', 'Dev'],
+        DOMAIN_COL: ['Technical'] * 4,
+        NUMBER_COL: ['', 'seven', '7, 17', '150'],
+    })
+
+    report = validate_frame(df, 'cores')
+    issues = report[report['column'] == NUMBER_COL].set_index('row')[['issue', 'severity']]
+
+    assert issues.loc[2].tolist() == ['no number given, the lowest free number will be assigned', 'warning']
+    assert issues.loc[3].tolist() == ['not a number, the lowest free number will be assigned', 'error']
+    assert 4 not in issues.index
+    assert issues.loc[5, 'issue'] == 'number out of range (0 to 99)'
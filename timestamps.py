@@ -0,0 +1,65 @@
+import pandas as pd
+import numpy as np
+
+# Formats tried in order when detecting how an export writes its dates.
+# Google Forms writes '1/28/2026 9:05:00' (month first) in US-locale sheets.
+MONTH_FIRST = ['%m/%d/%Y %H:%M:%S', '%m/%d/%Y %H:%M', '%m/%d/%Y', '%m-%d-%Y %H:%M:%S']
+DAY_FIRST = ['%d/%m/%Y %H:%M:%S', '%d/%m/%Y %H:%M', '%d/%m/%Y', '%d-%m-%Y %H:%M:%S', '%d-%m-%Y',
+             '%d %b %Y %H:%M:%S', '%d %b %Y %H:%M', '%d %b %Y', '%d-%b-%Y', '%d-%b-%y']
+UNAMBIGUOUS = ['%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d', '%Y/%m/%d %H:%M:%S',
+               '%Y/%m/%d']
+
+# How many distinct values the format is detected from
+SAMPLE_SIZE = 500
+
+def _candidate_formats(dayfirst=False):
+    """Formats in the order they are tried (day-first ones first with dayfirst)"""
+    ambiguous = DAY_FIRST + MONTH_FIRST if dayfirst else MONTH_FIRST + DAY_FIRST
+    return UNAMBIGUOUS + ambiguous
+
+def detect_format(values, dayfirst=False):
+    """The strftime format that parses every sampled value, or None if no single one does
+
+    values should be distinct, non-blank strings. '1/2/2026' fits both month-first and
+    day-first formats, so a sample is only decided by values like '1/28/2026'; when
+    nothing decides it, dayfirst picks the order.
+    """
+    sample = pd.Series(values[:SAMPLE_SIZE], dtype=object)
+    if sample.empty:
+        return None
+    for fmt in _candidate_formats(dayfirst):
+        if pd.to_datetime(sample, format=fmt, errors='coerce').notna().all():
+            return fmt
+    return None
+
+def parse_timestamps(values, dayfirst=False, fmt=None):
+    """Parse a column of export timestamps into datetime64 values (NaT for blanks and junk)
+
+    Each distinct value is parsed once: the format is detected from a sample of them and
+    the rest are parsed in one vectorized call with it. Values that don't fit the
+    detected format fall back to pandas' per-value guessing.
+    """
+    values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+
+    text = values.astype(object).where(values.notna(), '').astype(str).str.strip()
+    codes, uniques = pd.factorize(text)
+    uniques = pd.Series(uniques, dtype=object)
+    filled = uniques[uniques != '']
+
+    fmt = fmt or detect_format(filled.tolist(), dayfirst)
+    parsed = pd.Series(pd.NaT, index=uniques.index, dtype='datetime64[ns]')
+    if fmt:
+        parsed[filled.index] = pd.to_datetime(filled, format=fmt, errors='coerce')
+    rest = filled.index[parsed[filled.index].isna()]
+    if len(rest):
+        parsed[rest] = pd.to_datetime(filled[rest], format='mixed', dayfirst=dayfirst, errors='coerce')
+
+    return pd.Series(parsed.to_numpy()[codes], index=values.index, name=values.name)
+
+def sort_by_time(df, column='Timestamp', dayfirst=False):
+    """Rows of df in real submission order (stable; rows without a time go last)"""
+    times = parse_timestamps(df[column], dayfirst).to_numpy()
+    order = np.argsort(times, kind='stable')
+    return df.iloc[order]
@@ -1,8 +1,25 @@
-import pandas as pd
-import random
 import sys
 import os
-import re
+import multiprocessing
+from registry import map_domain, get_domain_columns, parse_size_entry, is_dry_run, FORMS
+from number_assignment import resolve_number_conflicts
+from convert_cores import convert_cores_data
+from convert_exes import convert_exes_data
+from convert_voa import convert_voa_data
+from extract_sizes import extract_size_data as extract_sizes
+from generate_printing_summary import generate_printing_summary, summary_inputs
+from validation import validate_file
+from ledger import ledger_command, record_output
+from reconcile import reconcile_command
+from delta import read_previous, write_diff
+from duplicates import duplicates_command, duplicates_file, DEFAULT_THRESHOLD
+from compression import with_compression
+from workflow import workflow_command
+from production import production_command
+from cube import cube_command
+from distribute import distribute_command
+from preview import preview_command
+from cli import parse_options
 
 def print_banner():
     """Print application banner"""
@@ -11,425 +28,26 @@ def print_banner():
     print("  Complete workflow for committee & public merchandise")
     print("="*70 + "\n")
 
-def map_domain(domain):
-    """Map domain names from Google Form to Photoshop format"""
-    domain_mapping = {
-        'Sponsorship & Marketing': 'Sponsorship',
-        'Media & Public Relations': 'Media and PR',
-        'Design & Editing': 'Design & Editing',
-        'Vigyaan': 'Vigyaan',
-        'Event Management': 'Event Management',
-        'Tech': 'Tech',
-        'Documentation': 'Documentation'
-    }
-    return domain_mapping.get(domain.strip(), domain.strip())
-
-def get_domain_columns(domain):
-    """Return TRUE/FALSE values for each domain column based on person's domain"""
-    domain_cols = {
-        'design': False,
-        'tech': False,
-        'spons': False,
-        'pr': False,
-        'em': False,
-        'doc': False,
-        'vigyaan': False
-    }
-    
-    domain_lower = domain.lower()
-    
-    if 'design' in domain_lower:
-        domain_cols['design'] = True
-    elif 'tech' in domain_lower:
-        domain_cols['tech'] = True
-    elif 'sponsorship' in domain_lower or 'spons' in domain_lower:
-        domain_cols['spons'] = True
-    elif 'media' in domain_lower or 'pr' in domain_lower or 'public relations' in domain_lower:
-        domain_cols['pr'] = True
-    elif 'event' in domain_lower or 'em' in domain_lower:
-        domain_cols['em'] = True
-    elif 'doc' in domain_lower:
-        domain_cols['doc'] = True
-    elif 'vigyaan' in domain_lower:
-        domain_cols['vigyaan'] = True
-    
-    return domain_cols
-
-def resolve_number_conflicts(df):
-    """Resolve conflicts when multiple people choose the same number"""
-    df = df.sort_values('Timestamp')
-    
-    used_numbers = set()
-    final_numbers = []
-    
-    for idx, row in df.iterrows():
-        requested_number = row['number']
-        
-        if requested_number not in used_numbers:
-            final_numbers.append(requested_number)
-            used_numbers.add(requested_number)
-        else:
-            available_numbers = set(range(1, 100)) - used_numbers
-            new_number = random.choice(list(available_numbers))
-            final_numbers.append(new_number)
-            used_numbers.add(new_number)
-            print(f"⚠️  Conflict: {row['name']} requested #{requested_number} but it was taken. Assigned #{new_number}")
-    
-    df['number'] = final_numbers
-    return df
-
-def convert_cores_data(input_file, output_file):
-    """Convert Google Form data for cores to Photoshop format"""
-    print("\n📋 Reading input file...")
-    
-    df = pd.read_csv(input_file)
-    print(f"✓ Found {len(df)} entries")
-    
-    output_data = []
-    
-    for idx, row in df.iterrows():
-        name_full = str(row['Name On Merch:']).strip()
-        domain_raw = str(row['Domain']).strip()
-        
-        if name_full == 'nan' or name_full == '' or domain_raw == 'nan' or domain_raw == '':
-            print(f"⚠️  Skipping row {idx+2} - missing name or domain")
-            continue
-        
-        if len(name_full) > 12:
-            name = name_full.split()[0]
-            print(f"📝 Shortened '{name_full}' to '{name}'")
-        else:
-            name = name_full
-        
-        domain = map_domain(domain_raw)
-        
-        try:
-            number = int(float(row['Number on Merch (0 to 99)']))
-        except:
-            number = random.randint(1, 99)
-            print(f"⚠️  Invalid number for {name}, assigned random: {number}")
-        
-        domain_cols = get_domain_columns(domain)
-        
-        output_row = {
-            'name': name,
-            'domain': domain,
-            'number': number,
-            'design': 'TRUE' if domain_cols['design'] else 'FALSE',
-            'tech': 'TRUE' if domain_cols['tech'] else 'FALSE',
-            'spons': 'TRUE' if domain_cols['spons'] else 'FALSE',
-            'pr': 'TRUE' if domain_cols['pr'] else 'FALSE',
-            'em': 'TRUE' if domain_cols['em'] else 'FALSE',
-            'doc': 'TRUE' if domain_cols['doc'] else 'FALSE',
-            'vigyaan': 'TRUE' if domain_cols['vigyaan'] else 'FALSE',
-            'Timestamp': row['Timestamp']
-        }
-        
-        output_data.append(output_row)
-    
-    output_df = pd.DataFrame(output_data)
-    
-    print("\n🔍 Checking for number conflicts...")
-    output_df = resolve_number_conflicts(output_df)
-    
-    output_df = output_df.drop('Timestamp', axis=1)
-    output_df = output_df[['name', 'domain', 'number', 'design', 'tech', 'spons', 'pr', 'em', 'doc', 'vigyaan']]
-    
-    print(f"\n💾 Saving to {output_file}...")
-    output_df.to_csv(output_file, index=False)
-    
-    print(f"✅ Conversion complete! {len(output_df)} records processed.")
-    print(f"\n📊 Domain breakdown:")
-    print(output_df['domain'].value_counts().to_string())
-
-def convert_exes_data(input_file, output_file):
-    """Convert Google Form data for executives to Photoshop format"""
-    print("\n📋 Reading input file...")
-    
-    df = pd.read_csv(input_file)
-    print(f"✓ Found {len(df)} entries")
-    
-    output_data = []
-    
-    for idx, row in df.iterrows():
-        name_full = str(row['Name On Merch:']).strip()
-        domain_raw = str(row['Domain']).strip()
-        
-        if name_full == 'nan' or name_full == '' or domain_raw == 'nan' or domain_raw == '':
-            print(f"⚠️  Skipping row {idx+2} - missing name or domain")
-            continue
-        
-        if len(name_full) > 12:
-            name = name_full.split()[0]
-            print(f"📝 Shortened '{name_full}' to '{name}'")
-        else:
-            name = name_full
-        
-        domain = map_domain(domain_raw)
-        domain_cols = get_domain_columns(domain)
-        
-        output_row = {
-            'name': name,
-            'domain': domain,
-            'design': 'TRUE' if domain_cols['design'] else 'FALSE',
-            'tech': 'TRUE' if domain_cols['tech'] else 'FALSE',
-            'spons': 'TRUE' if domain_cols['spons'] else 'FALSE',
-            'pr': 'TRUE' if domain_cols['pr'] else 'FALSE',
-            'em': 'TRUE' if domain_cols['em'] else 'FALSE',
-            'doc': 'TRUE' if domain_cols['doc'] else 'FALSE',
-            'vigyaan': 'TRUE' if domain_cols['vigyaan'] else 'FALSE'
-        }
-        
-        output_data.append(output_row)
-    
-    output_df = pd.DataFrame(output_data)
-    
-    print(f"\n💾 Saving to {output_file}...")
-    output_df.to_csv(output_file, index=False)
-    
-    print(f"✅ Conversion complete! {len(output_df)} records processed.")
-    print(f"\n📊 Domain breakdown:")
-    print(output_df['domain'].value_counts().to_string())
-
-def parse_size_entry(entry):
-    """Parse size entries like 'M,M,S' or '1 L' or '1'M'' or 'S.' into list"""
-    if pd.isna(entry) or str(entry).strip().lower() in ['none', 'nan', '']:
-        return []
-    
-    entry_str = str(entry).strip()
-    # Remove quotes, numbers, periods, and extra spaces
-    entry_str = entry_str.replace("'", "").replace('"', '').replace('.', '').strip()
-    
-    # Split by comma
-    sizes = [s.strip().upper() for s in entry_str.split(',') if s.strip()]
-    
-    # Clean each size entry
-    cleaned_sizes = []
-    for size in sizes:
-        # Remove any leading/trailing whitespace and digits
-        size_clean = size.strip()
-        
-        # Extract just the size letter(s) using regex
-        match = re.search(r'(XXL|XL|[SMLX])', size_clean.upper())
-        if match:
-            cleaned_sizes.append(match.group(1))
-        elif size_clean and size_clean.isalpha() and len(size_clean) <= 3:
-            cleaned_sizes.append(size_clean.upper())
-    
-    return cleaned_sizes
-
-def convert_voa_data(input_file, output_file):
-    """Convert VOA merchandise orders to printing format"""
-    print(f"\n📋 Reading VOA data from: {input_file}")
-    
-    df = pd.read_csv(input_file)
-    print(f"✓ Found {len(df)} entries")
-    
-    output_data = []
-    skipped = 0
-    
-    # Column mappings for size entries
-    tshirt_cols = {
-        'S': 'Sizes X Quantities (Oversized T-shirt) [S]',
-        'M': 'Sizes X Quantities (Oversized T-shirt) [M]',
-        'L': 'Sizes X Quantities (Oversized T-shirt) [L]',
-        'XL': 'Sizes X Quantities (Oversized T-shirt) [XL]',
-        'XXL': 'Sizes X Quantities (Oversized T-shirt) [XXL]'
-    }
-    
-    # Text field columns
-    text_fields = {
-        'Technocracy': 'For Technocracy Blending Merch, enter quantity and Size.\n\nExample: Suppose you want to order 3 \'M\' sized black T-shirts, enter them as M,M,M.\nSimilarly, if you want 5 \'XL\' sized tees, enter them as \nXL,XL,XL,XL,XL\nIf you want to order 2 \'M\' sized and 1 \'L\' sized tee, \nenter them as M,M,L.\n\nEnter \'None\', in case you do not wish to order for this design.',
-        'Dharma': 'For Dharma Warrior Merch, enter quantity and Size.\n\nExample: Suppose you want to order 3 \'M\' sized black T-shirts, enter them as M,M,M.\nSimilarly, if you want 5 \'XL\' sized tees, enter them as \nXL,XL,XL,XL,XL\nIf you want to order 2 \'M\' sized and 1 \'L\' sized tee, \nenter them as M,M,L.\n\nEnter \'None\', in case you do not wish to order for this design.',
-        'Abyss': 'For Conquering The Abyss Merch, enter quantity and Size.\n\nExample: Suppose you want to order 3 \'M\' sized black T-shirts, enter them as M,M,M.\nSimilarly, if you want 5 \'XL\' sized tees, enter them as \nXL,XL,XL,XL,XL\nIf you want to order 2 \'M\' sized and 1 \'L\' sized tee, \nenter them as M,M,L.\n\nEnter \'None\', in case you do not wish to order for this design.',
-        'Jacket': 'For Jacket, enter quantity and Size.\n\nExample: Suppose you want to order 3 \'M\' sized black T-shirts, enter them as M,M,M.\nSimilarly, if you want 5 \'XL\' sized tees, enter them as \nXL,XL,XL,XL,XL\nIf you want to order 2 \'M\' sized and 1 \'L\' sized tee, \nenter them as M,M,L.\n\nEnter \'None\', in case you do not wish to order for this design.'
-    }
-    
-    for idx, row in df.iterrows():
-        name = str(row['NAME']).strip()
-        
-        if name == 'nan' or name == '':
-            skipped += 1
-            continue
-        
-        contact = str(row['CONTACT NUMBER']).strip()
-        email = str(row.get('Email Address', row.get('E-MAIL', ''))).strip()
-        residency = str(row['Choose your place of residency (FOR DISTRIBUTION PURPOSES)']).strip()
-        
-        orders = []
-        
-        # Method 1: Check legacy numerical columns
-        legacy_orders = False
-        aesthetics = str(row.get('Choose your aesthetics! (Offers are available at specific order quantities. For combo order select multiple options)', '')).strip()
-        
-        designs_list = []
-        if 'Technocracy' in aesthetics:
-            designs_list.append('Technocracy')
-        if 'Dharma' in aesthetics:
-            designs_list.append('Dharma')
-        if 'Abyss' in aesthetics or 'Conquering' in aesthetics:
-            designs_list.append('Abyss')
-        
-        if not designs_list:
-            designs_list = ['Technocracy']
-        
-        for size_key, col_name in tshirt_cols.items():
-            if col_name in df.columns:
-                try:
-                    quantity = int(float(row[col_name])) if pd.notna(row[col_name]) and str(row[col_name]).strip() != '' else 0
-                    if quantity > 0:
-                        legacy_orders = True
-                        num_designs = len(designs_list)
-                        
-                        if quantity % num_designs == 0:
-                            per_design = quantity // num_designs
-                            for design in designs_list:
-                                for _ in range(per_design):
-                                    orders.append({'design': design, 'size': size_key})
-                        else:
-                            base_qty = quantity // num_designs
-                            extra = quantity % num_designs
-                            
-                            for i, design in enumerate(designs_list):
-                                design_qty = base_qty + (1 if i < extra else 0)
-                                for _ in range(design_qty):
-                                    orders.append({'design': design, 'size': size_key})
-                except (ValueError, TypeError):
-                    pass
-        
-        # Method 2: Check text field entries
-        if not legacy_orders:
-            for design, col_name in text_fields.items():
-                if col_name in df.columns and col_name in row.index:
-                    sizes = parse_size_entry(row[col_name])
-                    for size in sizes:
-                        orders.append({'design': design, 'size': size})
-        
-        if not orders:
-            skipped += 1
-            continue
-        
-        for order in orders:
-            output_data.append({
-                'name': name,
-                'email': email if email != 'nan' else '',
-                'contact': contact if contact != 'nan' else '',
-                'residency': residency if residency != 'nan' else '',
-                'design': order['design'],
-                'size': order['size']
-            })
-    
-    output_df = pd.DataFrame(output_data)
-    
-    if len(output_df) == 0:
-        print("\n❌ No valid orders found!")
-        return
-    
-    print(f"\n💾 Saving to {output_file}...")
-    output_df.to_csv(output_file, index=False)
-    
-    print(f"✅ Conversion complete! {len(output_df)} order items from {len(output_df['name'].unique())} people ({skipped} entries skipped).")
-    print(f"\n📊 Design breakdown:")
-    print(output_df['design'].value_counts().to_string())
-
-def extract_sizes(input_file, output_file, file_type='cores'):
-    """Extract name, domain, and size from Google Form data"""
-    print(f"\n📋 Reading {file_type} data from: {input_file}")
-    
-    df = pd.read_csv(input_file)
-    print(f"✓ Found {len(df)} entries")
-    
-    output_data = []
-    skipped = 0
-    
-    for idx, row in df.iterrows():
-        name_full = str(row['Name On Merch:']).strip()
-        domain_raw = str(row['Domain']).strip()
-        size = str(row['Mention Your Size:']).strip()
-        
-        if name_full == 'nan' or name_full == '' or domain_raw == 'nan' or domain_raw == '':
-            skipped += 1
-            continue
-        
-        if len(name_full) > 12:
-            name = name_full.split()[0]
-        else:
-            name = name_full
-        
-        domain = map_domain(domain_raw)
-        
-        if size == 'nan' or size == '':
-            size = 'NOT SPECIFIED'
-        
-        output_data.append({
-            'name': name,
-            'domain': domain,
-            'size': size.upper()
-        })
-    
-    output_df = pd.DataFrame(output_data)
-    
-    print(f"\n💾 Saving to {output_file}...")
-    output_df.to_csv(output_file, index=False)
-    
-    print(f"✅ Extraction complete! {len(output_df)} records processed ({skipped} skipped).")
-    print(f"\n📊 Size breakdown:")
-    print(output_df['size'].value_counts().to_string())
-
-def generate_printing_summary(input_file, output_file):
-    """Generate printing summary from VOA orders"""
-    print(f"\n📋 Reading orders from: {input_file}")
-    
-    df = pd.read_csv(input_file)
-    print(f"✓ Found {len(df)} order items")
-    
-    summary = df.groupby(['design', 'size']).size().reset_index(name='quantity')
-    
-    size_order = {'S': 1, 'M': 2, 'L': 3, 'XL': 4, 'XXL': 5}
-    summary['size_order'] = summary['size'].map(lambda x: size_order.get(x, 999))
-    summary = summary.sort_values(['design', 'size_order'])
-    summary = summary.drop('size_order', axis=1)
-    
-    print(f"\n💾 Saving to {output_file}...")
-    summary.to_csv(output_file, index=False)
-    
-    print(f"✅ Summary complete!\n")
-    print("=" * 50)
-    print("PRINTING SUMMARY BY DESIGN")
-    print("=" * 50)
-    
-    for design in summary['design'].unique():
-        design_data = summary[summary['design'] == design]
-        total = design_data['quantity'].sum()
-        
-        print(f"\n📦 {design} (Total: {total} items)")
-        print("-" * 40)
-        for _, row in design_data.iterrows():
-            print(f"  {row['size']:6s} : {row['quantity']:3d} pcs")
-    
-    print("\n" + "=" * 50)
-    print(f"GRAND TOTAL: {summary['quantity'].sum()} items")
-    print("=" * 50)
-
 def interactive_mode():
     """Run in interactive mode"""
     print_banner()
     
     print("Select tool:")
-    print("1. Core Team Converter (with numbers)")
-    print("2. Executive Team Converter (no numbers)")
-    print("3. VOA Orders Converter (volunteers/public)")
-    print("4. Size Extraction (distribution lists)")
+    print(f"1. {FORMS['cores']['title']}")
+    print(f"2. {FORMS['exes']['title']}")
+    print(f"3. {FORMS['voa']['title']}")
+    print(f"4. {FORMS['sizes']['title']}")
     print("5. Printing Summary Generator")
-    print("6. Exit")
+    print("6. Validate Form Data (check before converting)")
+    print("7. Exit")
     
-    choice = input("\nEnter your choice (1-6): ").strip()
+    choice = input("\nEnter your choice (1-7): ").strip()
     
-    if choice == '6':
+    if choice == '7':
         print("\n👋 Goodbye!")
         return
     
-    if choice not in ['1', '2', '3', '4', '5']:
+    if choice not in ['1', '2', '3', '4', '5', '6']:
         print("\n❌ Invalid choice. Please run again.")
         return
     
@@ -441,11 +59,12 @@ def interactive_mode():
     
     # Set default output based on choice
     default_outputs = {
-        '1': 'cores_photoshop.csv',
-        '2': 'exes_photoshop.csv',
-        '3': 'voa_orders.csv',
-        '4': 'sizes.csv',
-        '5': 'printing_summary.csv'
+        '1': FORMS['cores']['default_output'],
+        '2': FORMS['exes']['default_output'],
+        '3': FORMS['voa']['default_output'],
+        '4': FORMS['sizes']['default_output'],
+        '5': 'printing_summary.csv',
+        '6': 'validation_report.csv'
     }
     
     default_output = default_outputs[choice]
@@ -469,6 +88,12 @@ def interactive_mode():
             extract_sizes(input_file, output_file, file_type)
         elif choice == '5':
             generate_printing_summary(input_file, output_file)
+        elif choice == '6':
+            form_type = input("Is this for cores, exes or voa? (cores/exes/voa): ").strip().lower()
+            if form_type not in ['cores', 'exes', 'voa']:
+                print("Invalid type. Using 'cores'")
+                form_type = 'cores'
+            validate_file(input_file, output_file, form_type)
         
         print(f"\n✨ Output saved to: {os.path.abspath(output_file)}")
         
@@ -479,59 +104,188 @@ def interactive_mode():
     
     input("\nPress Enter to exit...")
 
+VALUE_OPTIONS = {'--report', '--name-strategy', '--name-report',
+                 '--nearby', '--number-scope', '--keep-numbers', '--number-report',
+                 '--db', '--events', '--ledger', '--event',
+                 '--prices', '--window', '--amount-col', '--time-col', '--jobs',
+                 '--sheet', '--diff-against', '--compress', '--compress-level',
+                 '--threshold', '--merge', '--sample',
+                 '--cores', '--exes', '--voa', '--by', '--desk', '--design',
+                 '--font', '--print-width', '--name-height', '--number-height',
+                 '--checkpoint-rows', '--xlsx'}
+
+def check_before_convert(input_file, form_type, options):
+    """Run the validation pre-pass when --fail-fast is given and stop on errors
+
+    A dry run prints the issues instead of writing the report.
+    """
+    if not options.get('fail-fast'):
+        return
+    
+    report_file = None if is_dry_run(options) else options.get('report', 'validation_report.csv')
+    report = validate_file(input_file, report_file, form_type, options.get('sheet'), options.get('compress-level'))
+    if (report['severity'] == 'error').any():
+        print("\n❌ Validation failed - fix the sheet and run again.")
+        sys.exit(1)
+
+def record_in_ledger(output_df, source, options):
+    """Import a conversion result into the ledger when --ledger and --event are given"""
+    if not options.get('ledger') or output_df is None or len(output_df) == 0:
+        return
+    if not options.get('event'):
+        print("⚠️  --ledger needs --event <name>; output not recorded")
+        return
+    record_output(options['ledger'], output_df, options['event'], source)
+
+def check_duplicates(input_file, form_type, options):
+    """Write the duplicate-people review file first when --check-duplicates is given (only print it in a dry run)"""
+    if options.get('check-duplicates'):
+        duplicates_file(input_file, None if is_dry_run(options) else 'duplicates_review.csv', form_type,
+                        options.get('threshold', DEFAULT_THRESHOLD), options.get('sheet'))
+
+def run_conversion(convert, *args):
+    """Run a converter, stopping with a clear message instead of a traceback on bad input"""
+    try:
+        return convert(*args)
+    except (KeyError, ValueError) as e:
+        print(f"\n❌ Error: {e}")
+        sys.exit(1)
+
+def load_previous_output(options):
+    """Read the --diff-against output now, before the new output can overwrite it"""
+    if not options.get('diff-against'):
+        return None
+    if not os.path.exists(options['diff-against']):
+        print(f"\n❌ Error: File '{options['diff-against']}' not found!")
+        sys.exit(1)
+    return read_previous(options['diff-against'])
+
+def write_changes(output_df, previous, output_file, form_type, options):
+    """Write the added/changed/removed files when --diff-against is given"""
+    if previous is None or output_df is None:
+        return
+    write_diff(output_df, previous, output_file, form_type, options.get('compress-level'))
+
 def main():
     """Main entry point"""
-    if len(sys.argv) > 1:
+    args, options = parse_options(sys.argv[1:], VALUE_OPTIONS)
+    
+    if args:
         # Command-line mode
-        command = sys.argv[1]
+        command = args[0]
         
         if command == 'cores':
-            if len(sys.argv) < 3:
-                print("Usage: tshirt_converter cores <input_file> [output_file]")
+            if len(args) < 2:
+                print("Usage: tshirt_converter cores <input_file> [output_file] [--fail-fast] [--report file]")
+                print("       [--diff-against previous.csv] [--name-strategy full,last-initial|none] [--name-report file]")
+                print("       [--nearby N] [--number-scope all|domain] [--keep-numbers previous.csv] [--number-report file]")
                 sys.exit(1)
-            input_file = sys.argv[2]
-            output_file = sys.argv[3] if len(sys.argv) > 3 else "cores_photoshop.csv"
-            convert_cores_data(input_file, output_file)
+            input_file = args[1]
+            output_file = with_compression(args[2] if len(args) > 2 else "cores_photoshop.csv", options.get('compress'))
+            check_before_convert(input_file, 'cores', options)
+            check_duplicates(input_file, 'cores', options)
+            previous = load_previous_output(options)
+            output_df = run_conversion(convert_cores_data, input_file, output_file, options)
+            record_in_ledger(output_df, 'cores', options)
+            write_changes(output_df, previous, output_file, 'cores', options)
             
         elif command == 'exes':
-            if len(sys.argv) < 3:
-                print("Usage: tshirt_converter exes <input_file> [output_file]")
+            if len(args) < 2:
+                print("Usage: tshirt_converter exes <input_file> [output_file] [--fail-fast] [--report file]")
+                print("       [--diff-against previous.csv] [--name-strategy full,last-initial|none] [--name-report file]")
                 sys.exit(1)
-            input_file = sys.argv[2]
-            output_file = sys.argv[3] if len(sys.argv) > 3 else "exes_photoshop.csv"
-            convert_exes_data(input_file, output_file)
+            input_file = args[1]
+            output_file = with_compression(args[2] if len(args) > 2 else "exes_photoshop.csv", options.get('compress'))
+            check_before_convert(input_file, 'exes', options)
+            check_duplicates(input_file, 'exes', options)
+            previous = load_previous_output(options)
+            output_df = run_conversion(convert_exes_data, input_file, output_file, options)
+            record_in_ledger(output_df, 'exes', options)
+            write_changes(output_df, previous, output_file, 'exes', options)
             
         elif command == 'voa':
-            if len(sys.argv) < 3:
-                print("Usage: tshirt_converter voa <input_file> [output_file]")
+            if len(args) < 2:
+                print("Usage: tshirt_converter voa <input_file> [output_file] [--fail-fast] [--report file] [--jobs N|auto]")
+                print("       [--diff-against previous_voa_orders.csv]")
+                print("       [--checkpoint | --resume] [--checkpoint-rows N] (resumable runs: voa CSV exports only)")
                 sys.exit(1)
-            input_file = sys.argv[2]
-            output_file = sys.argv[3] if len(sys.argv) > 3 else "voa_orders.csv"
-            convert_voa_data(input_file, output_file)
+            input_file = args[1]
+            output_file = with_compression(args[2] if len(args) > 2 else "voa_orders.csv", options.get('compress'))
+            check_before_convert(input_file, 'voa', options)
+            check_duplicates(input_file, 'voa', options)
+            previous = load_previous_output(options)
+            output_df = run_conversion(convert_voa_data, input_file, output_file, options)
+            record_in_ledger(output_df, 'voa', options)
+            write_changes(output_df, previous, output_file, 'voa', options)
             
         elif command == 'sizes':
-            if len(sys.argv) < 4:
-                print("Usage: tshirt_converter sizes <cores|exes> <input_file> [output_file]")
+            if len(args) < 3:
+                print("Usage: tshirt_converter sizes <cores|exes> <input_file> [output_file] [--fail-fast] [--report file]")
                 sys.exit(1)
-            file_type = sys.argv[2]
-            input_file = sys.argv[3]
-            output_file = sys.argv[4] if len(sys.argv) > 4 else "sizes.csv"
-            extract_sizes(input_file, output_file, file_type)
+            file_type = args[1]
+            input_file = args[2]
+            output_file = with_compression(args[3] if len(args) > 3 else "sizes.csv", options.get('compress'))
+            check_before_convert(input_file, file_type, options)
+            previous = load_previous_output(options)
+            output_df = run_conversion(extract_sizes, input_file, output_file, file_type, options)
+            record_in_ledger(output_df, 'sizes', options)
+            write_changes(output_df, previous, output_file, 'sizes', options)
             
         elif command == 'summary':
-            if len(sys.argv) < 3:
-                print("Usage: tshirt_converter summary <input_file> [output_file]")
+            if len(args) < 2:
+                print("Usage: tshirt_converter summary <input_file> [output_file] [--merge more_orders.csv,...] "
+                      "[--xlsx report.xlsx [--orders-sheet]]")
+                sys.exit(1)
+            input_file = args[1]
+            output_file = with_compression(args[2] if len(args) > 2 else "printing_summary.csv", options.get('compress'))
+            generate_printing_summary(summary_inputs(input_file, options), output_file,
+                                      options.get('xlsx'), bool(options.get('orders-sheet')),
+                                      options.get('compress-level'))
+            
+        elif command == 'ledger':
+            ledger_command(args[1:], options)
+            
+        elif command == 'reconcile':
+            reconcile_command(args[1:], options)
+            
+        elif command == 'duplicates':
+            duplicates_command(args[1:], options)
+            
+        elif command == 'production':
+            production_command(args[1:], options)
+            
+        elif command == 'cube':
+            cube_command(args[1:], options)
+            
+        elif command == 'distribute':
+            distribute_command(args[1:], options)
+            
+        elif command == 'preview':
+            preview_command(args[1:], options)
+            
+        elif command == 'run':
+            workflow_command(args[1:], options)
+            
+        elif command == 'validate':
+            if len(args) < 3 or args[1] not in ['cores', 'exes', 'voa']:
+                print("Usage: tshirt_converter validate <cores|exes|voa> <input_file> [report_file] [--fail-fast]")
+                sys.exit(1)
+            form_type = args[1]
+            input_file = args[2]
+            output_file = with_compression(args[3] if len(args) > 3 else "validation_report.csv", options.get('compress'))
+            report = validate_file(input_file, output_file, form_type, options.get('sheet'),
+                                   options.get('compress-level'))
+            if options.get('fail-fast') and (report['severity'] == 'error').any():
                 sys.exit(1)
-            input_file = sys.argv[2]
-            output_file = sys.argv[3] if len(sys.argv) > 3 else "printing_summary.csv"
-            generate_printing_summary(input_file, output_file)
             
         else:
-            print("Unknown command. Use: cores, exes, voa, sizes, or summary")
+            print("Unknown command. Use: cores, exes, voa, sizes, summary, validate, ledger, reconcile, duplicates, production, cube, distribute, preview or run")
             sys.exit(1)
     else:
         # Interactive mode
         interactive_mode()
 
 if __name__ == "__main__":
+    # Needed for --jobs worker processes in the PyInstaller build
+    multiprocessing.freeze_support()
     main()
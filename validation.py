@@ -0,0 +1,185 @@
+import pandas as pd
+import numpy as np
+import sys
+import os
+from registry import (FORMS, VALID_SIZES, MAX_NAME_LENGTH, DOMAIN_MAPPING,
+                      GRID_COLUMNS, TEXT_FIELDS, parse_size_tokens)
+from form_input import normalize_header, read_table
+from compression import write_csv
+
+KNOWN_DOMAINS = set(DOMAIN_MAPPING) | set(DOMAIN_MAPPING.values())
+
+NAME_COL = normalize_header(FORMS['cores']['inputs']['name'])
+DOMAIN_COL = normalize_header(FORMS['cores']['inputs']['domain'])
+NUMBER_COL = normalize_header(FORMS['cores']['inputs']['number'])
+SIZE_COL = normalize_header(FORMS['sizes']['inputs']['size'])
+VOA_NAME_COL = normalize_header(FORMS['voa']['inputs']['name'])
+
+# Headers as read_table returns them
+QUANTITY_HEADERS = {normalize_header(col) for col in GRID_COLUMNS.values()}
+SIZE_TEXT_HEADERS = {normalize_header(col) for col in TEXT_FIELDS.values()}
+
+REPORT_COLUMNS = ['row', 'column', 'value', 'issue', 'severity']
+
+# Issues printed when the report is not saved to a file
+ISSUES_SHOWN = 20
+
+def _blank_mask(series):
+    """Boolean mask of cells that are empty, NaN or the literal 'nan'"""
+    text = series.astype(str).str.strip()
+    return series.isna() | text.eq('') | text.eq('nan')
+
+def _issues(mask, column, values, issue, severity):
+    """Build report rows for every position where mask is True"""
+    mask = np.asarray(mask, dtype=bool)
+    positions = np.flatnonzero(mask)
+    return pd.DataFrame({
+        'row': positions + 2,  # +2 = header line + 1-based spreadsheet rows
+        'column': column,
+        'value': np.asarray(values, dtype=object)[mask],
+        'issue': issue,
+        'severity': severity
+    })
+
+def _check_required(df, column, found):
+    """Flag the column as missing or its blank cells as errors"""
+    if column not in df.columns:
+        found.append(pd.DataFrame([{'row': 1, 'column': column, 'value': '',
+                                    'issue': 'column missing from header', 'severity': 'error'}]))
+        return None
+    found.append(_issues(_blank_mask(df[column]), column, df[column], 'missing value', 'error'))
+    return df[column].astype(str).str.strip()
+
+def _check_committee(df, with_number, found):
+    """Checks shared by the cores and exes forms"""
+    names = _check_required(df, NAME_COL, found)
+    domains = _check_required(df, DOMAIN_COL, found)
+
+    if names is not None:
+        too_long = names.str.len() > MAX_NAME_LENGTH
+        found.append(_issues(too_long, NAME_COL, names,
+                             f'longer than {MAX_NAME_LENGTH} characters, will be shortened', 'warning'))
+
+    if domains is not None:
+        unmapped = ~_blank_mask(df[DOMAIN_COL]) & ~domains.isin(KNOWN_DOMAINS)
+        found.append(_issues(unmapped, DOMAIN_COL, domains, 'unmapped domain', 'error'))
+
+    if with_number:
+        if NUMBER_COL not in df.columns:
+            _check_required(df, NUMBER_COL, found)
+        else:
+            raw = df[NUMBER_COL]
+            numbers = pd.to_numeric(raw, errors='coerce')
+            blank = _blank_mask(raw)
+            # '7, 17 / 77' is read as ranked choices, so only text without any digits is unreadable
+            unreadable = ~blank & numbers.isna() & ~raw.astype(str).str.contains(r'\d')
+            found.append(_issues(blank, NUMBER_COL, raw,
+                                 'no number given, the lowest free number will be assigned', 'warning'))
+            found.append(_issues(unreadable, NUMBER_COL, raw,
+                                 'not a number, the lowest free number will be assigned', 'error'))
+            found.append(_issues(numbers.notna() & ((numbers < 0) | (numbers > 99)), NUMBER_COL, raw,
+                                 'number out of range (0 to 99)', 'error'))
+
+    if SIZE_COL in df.columns:
+        sizes = df[SIZE_COL].astype(str).str.strip().str.upper()
+        blank = _blank_mask(df[SIZE_COL])
+        found.append(_issues(blank, SIZE_COL, sizes, 'size not specified', 'warning'))
+        found.append(_issues(~blank & ~sizes.isin(VALID_SIZES), SIZE_COL, sizes, 'unknown size', 'error'))
+
+def _check_voa(df, found):
+    """Checks for the VOA order form"""
+    _check_required(df, VOA_NAME_COL, found)
+
+    for col in df.columns:
+        if col in QUANTITY_HEADERS:
+            raw = df[col]
+            quantities = pd.to_numeric(raw, errors='coerce')
+            non_numeric = ~_blank_mask(raw) & quantities.isna()
+            found.append(_issues(non_numeric, col, raw, 'non-numeric quantity', 'error'))
+            found.append(_issues(quantities < 0, col, raw, 'negative quantity', 'error'))
+        elif col in SIZE_TEXT_HEADERS:
+            found.append(_check_size_text(df[col], col))
+
+def _check_size_text(series, column):
+    """Flag tokens of 'M,M,L' style entries that do not parse to a valid size"""
+    tokens, parsed = parse_size_tokens(series)
+    bad_tokens = tokens[~parsed.isin(VALID_SIZES)]
+    return pd.DataFrame({
+        'row': bad_tokens.index.to_numpy() + 2,
+        'column': column,
+        'value': bad_tokens.to_numpy(dtype=object),
+        'issue': 'unknown size',
+        'severity': 'error'
+    })
+
+def validate_frame(df, form_type='cores'):
+    """Run every check on the whole frame at once and return the issues found"""
+    df = df.reset_index(drop=True)
+    found = [pd.DataFrame(columns=REPORT_COLUMNS)]
+
+    if form_type == 'cores':
+        _check_committee(df, True, found)
+    elif form_type == 'exes':
+        _check_committee(df, False, found)
+    elif form_type == 'voa':
+        _check_voa(df, found)
+    else:
+        raise ValueError(f"Unknown form type '{form_type}'. Use: cores, exes or voa")
+
+    found = [frame for frame in found if len(frame) > 0] or found[:1]
+    report = pd.concat(found, ignore_index=True)[REPORT_COLUMNS]
+    return report.sort_values(['row', 'column'], kind='stable').reset_index(drop=True)
+
+def validate_file(input_file, output_file='validation_report.csv', form_type='cores', sheet=None, level=None):
+    """Validate a Google Form export and write the issues to a report CSV
+
+    With output_file=None nothing is written and the issues are printed instead. level is
+    the compression level of a .gz/.zst output_file.
+    """
+    print(f"\n🔎 Validating {form_type} data from: {input_file}")
+
+    df = read_table(input_file, sheet=sheet)
+    report = validate_frame(df, form_type)
+
+    errors = int((report['severity'] == 'error').sum())
+    warnings = int((report['severity'] == 'warning').sum())
+
+    print(f"✓ Checked {len(df)} entries: {errors} errors, {warnings} warnings")
+
+    if len(report) > 0 and output_file is None:
+        print(report.head(ISSUES_SHOWN).to_string(index=False))
+        if len(report) > ISSUES_SHOWN:
+            print(f"   ... and {len(report) - ISSUES_SHOWN} more")
+    if len(report) > 0:
+        if output_file is not None:
+            print(f"\n💾 Saving validation report to {output_file}...")
+            write_csv(report, output_file, level)
+        print(f"\n📊 Issue breakdown:")
+        print(report.groupby(['severity', 'issue']).size().to_string())
+    else:
+        print("✅ No problems found!")
+
+    return report
+
+def main():
+    """Main entry point"""
+    if len(sys.argv) < 3 or sys.argv[1] not in ['cores', 'exes', 'voa']:
+        print("Usage: python validation.py <cores|exes|voa> <input_file> [report_file] [--fail-fast]")
+        sys.exit(1)
+
+    args = [arg for arg in sys.argv[1:] if arg != '--fail-fast']
+    form_type = args[0]
+    input_file = args[1]
+    output_file = args[2] if len(args) > 2 else 'validation_report.csv'
+
+    if not os.path.exists(input_file):
+        print(f"\n❌ Error: File '{input_file}' not found!")
+        sys.exit(1)
+
+    report = validate_file(input_file, output_file, form_type)
+
+    if '--fail-fast' in sys.argv and (report['severity'] == 'error').any():
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import redirect_stdout, redirect_stderr
+from registry import parse_jobs
+from convert_cores import convert_cores_data
+from convert_exes import convert_exes_data
+from convert_voa import convert_voa_data
+from extract_sizes import extract_size_data
+from generate_printing_summary import generate_printing_summary
+from validation import validate_file
+from compression import with_compression
+from cli import parse_options
+
+# Optional on Python < 3.11, where tomllib is not in the standard library
+try:
+    import tomllib
+except ImportError:
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+# Stage command -> function(inputs, output, stage); inputs is a list of file paths
+STAGE_COMMANDS = {
+    'cores': lambda inputs, output, stage: convert_cores_data(inputs[0], output, stage['options']),
+    'exes': lambda inputs, output, stage: convert_exes_data(inputs[0], output, stage['options']),
+    'voa': lambda inputs, output, stage: convert_voa_data(inputs[0], output, stage['options']),
+    'sizes': lambda inputs, output, stage: extract_size_data(inputs[0], output, stage['form'], stage['options']),
+    'summary': lambda inputs, output, stage: generate_printing_summary(inputs, output, stage['options'].get('xlsx'),
+                                                                       bool(stage['options'].get('orders-sheet')),
+                                                                       stage['options'].get('compress-level')),
+    'validate': lambda inputs, output, stage: validate_file(inputs[0], output, stage['form'],
+                                                            stage['options'].get('sheet'),
+                                                            stage['options'].get('compress-level'))
+}
+
+# Commands that need form = "cores" / "exes" / "voa"
+FORM_COMMANDS = {'sizes': ['cores', 'exes'], 'validate': ['cores', 'exes', 'voa']}
+
+# Options holding file paths (resolved like stage paths); the contents of the
+# read ones are part of the stage fingerprint
+PATH_OPTIONS = {'report', 'name-report', 'number-report', 'keep-numbers', 'diff-against', 'xlsx'}
+READ_OPTIONS = {'keep-numbers'}
+
+STATUS_ICONS = {'ran': '✅', 'unchanged': '⏭️ ', 'failed': '❌', 'blocked': '⛔'}
+
+VALUE_OPTIONS = {'--jobs'}
+
+def _option_values(options):
+    """TOML option values as the command line would give them (true -> flag, false -> left out)"""
+    return {key: value if value is True else str(value)
+            for key, value in (options or {}).items() if value is not False}
+
+def load_workflow(workflow_file):
+    """Read a workflow TOML file into {'jobs', 'state', 'stages'} with resolved paths and dependencies
+
+    A stage's input names an [inputs] entry, else another stage (whose output it then
+    reads and waits for), else a file path. Paths are relative to the workflow file.
+    """
+    if tomllib is None:
+        raise ImportError("Workflow files need Python 3.11+ or tomli (pip install tomli)")
+
+    with open(workflow_file, 'rb') as f:
+        config = tomllib.load(f)
+
+    base = os.path.dirname(os.path.abspath(workflow_file))
+    resolve = lambda path: os.path.normpath(os.path.join(base, path))
+    settings = config.get('workflow', {})
+    named_inputs = config.get('inputs', {})
+    declared = config.get('stages', {})
+    if not declared:
+        raise ValueError(f"{workflow_file} has no [stages.<name>] tables")
+
+    stages = {}
+    for name, spec in declared.items():
+        command = spec.get('command', name)
+        if command not in STAGE_COMMANDS:
+            raise ValueError(f"Stage '{name}': unknown command '{command}'. Use: {', '.join(STAGE_COMMANDS)}")
+        if command in FORM_COMMANDS and spec.get('form') not in FORM_COMMANDS[command]:
+            raise ValueError(f"Stage '{name}': {command} needs form = {' or '.join(FORM_COMMANDS[command])}")
+        if 'output' not in spec:
+            raise ValueError(f"Stage '{name}' has no output")
+
+        refs = spec.get('input', [])
+        refs = [refs] if isinstance(refs, str) else list(refs)
+        if not refs:
+            raise ValueError(f"Stage '{name}' has no input")
+
+        after = spec.get('after', [])
+        after = [after] if isinstance(after, str) else list(after)
+        options = _option_values(spec.get('options'))
+        options.update({key: resolve(value) for key, value in options.items()
+                        if key in PATH_OPTIONS and value is not True})
+        stages[name] = {
+            'name': name,
+            'command': command,
+            'form': spec.get('form'),
+            'refs': refs,
+            'after': sorted({ref for ref in refs if ref in declared and ref not in named_inputs} | set(after)),
+            'options': options,
+            'output': with_compression(resolve(spec['output']), options.get('compress'))
+        }
+
+    for stage in stages.values():
+        unknown = [dep for dep in stage['after'] if dep not in stages]
+        if unknown:
+            raise ValueError(f"Stage '{stage['name']}' waits for unknown stage(s): {', '.join(unknown)}")
+        stage['inputs'] = [resolve(named_inputs[ref]) if ref in named_inputs
+                           else stages[ref]['output'] if ref in stages
+                           else resolve(ref) for ref in stage['refs']]
+
+    state_name = os.path.splitext(os.path.basename(workflow_file))[0] + '.state.json'
+    return {
+        'jobs': settings.get('jobs'),
+        'state': resolve(settings.get('state', state_name)),
+        'stages': stages,
+        'order': topological_order(stages)
+    }
+
+def topological_order(stages):
+    """Stage names with every stage after the ones it waits for (declaration order otherwise)"""
+    order, visiting, done = [], set(), set()
+
+    def visit(name, path):
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"Stages wait for each other in a cycle: {' -> '.join(path + [name])}")
+        visiting.add(name)
+        for dep in stages[name]['after']:
+            visit(dep, path + [name])
+        visiting.discard(name)
+        done.add(name)
+        order.append(name)
+
+    for name in stages:
+        visit(name, [])
+    return order
+
+def file_digest(path, cache):
+    """sha256 of a file's contents, computed once per run"""
+    if path not in cache:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        cache[path] = digest.hexdigest()
+    return cache[path]
+
+def stage_fingerprint(stage, cache):
+    """Digest of everything a stage's output depends on: its command, options and input contents"""
+    payload = {
+        'command': stage['command'],
+        'form': stage['form'],
+        'options': stage['options'],
+        'output': stage['output'],
+        'inputs': [(path, file_digest(path, cache)) for path in stage['inputs']],
+        'read': [(stage['options'][key], file_digest(stage['options'][key], cache))
+                 for key in sorted(READ_OPTIONS) if key in stage['options']]
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+
+def load_state(state_file):
+    """Fingerprints and timings saved by the last run ({} the first time)"""
+    if not os.path.exists(state_file):
+        return {}
+    with open(state_file, encoding='utf-8') as f:
+        return json.load(f)
+
+def save_state(state_file, state):
+    with open(state_file, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+
+def run_stage(stage):
+    """Worker: run one stage and hand back (printed messages, seconds, error text or None)"""
+    messages = io.StringIO()
+    started = time.perf_counter()
+    error = None
+    with redirect_stdout(messages), redirect_stderr(messages):
+        try:
+            os.makedirs(os.path.dirname(stage['output']), exist_ok=True)
+            STAGE_COMMANDS[stage['command']](stage['inputs'], stage['output'], stage)
+        except (Exception, SystemExit) as e:
+            error = f"{type(e).__name__}: {e}"
+    return messages.getvalue(), time.perf_counter() - started, error
+
+def run_workflow(workflow_file, jobs=None, force=False):
+    """Run the stages of a workflow file, independent ones in parallel, skipping unchanged ones
+
+    A stage is skipped when its fingerprint (command, options and input file contents)
+    matches the last successful run and its output still exists. Returns
+    {stage: {'status', 'seconds'}}.
+    """
+    workflow = load_workflow(workflow_file)
+    stages, order = workflow['stages'], workflow['order']
+    jobs = parse_jobs(jobs if jobs is not None else workflow['jobs'] or 'auto')
+    state = load_state(workflow['state'])
+    digests = {}
+
+    print(f"\n🗂️  Workflow {workflow_file}: {len(stages)} stages, up to {jobs} at a time")
+
+    results = {}
+    pending = list(order)
+    running = {}
+    with ProcessPoolExecutor(max_workers=min(jobs, len(stages))) as pool:
+        while pending or running:
+            for name in list(pending):
+                stage = stages[name]
+                if any(results.get(dep, {}).get('status') in ('failed', 'blocked') for dep in stage['after']):
+                    pending.remove(name)
+                    results[name] = {'status': 'blocked', 'seconds': 0.0}
+                    print(f"⛔ {name}: not run, an earlier stage failed")
+                    continue
+                if not all(dep in results for dep in stage['after']):
+                    continue
+
+                pending.remove(name)
+                missing = [path for path in stage['inputs'] + [stage['options'][key] for key in READ_OPTIONS
+                                                               if key in stage['options']]
+                           if not os.path.exists(path)]
+                if missing:
+                    results[name] = {'status': 'failed', 'seconds': 0.0}
+                    print(f"❌ {name}: input not found: {', '.join(missing)}")
+                    continue
+
+                fingerprint = stage_fingerprint(stage, digests)
+                previous = state.get(name, {})
+                if not force and previous.get('fingerprint') == fingerprint and os.path.exists(stage['output']):
+                    results[name] = {'status': 'unchanged', 'seconds': 0.0}
+                    print(f"⏭️  {name}: unchanged since the last run")
+                    continue
+
+                print(f"▶️  {name}: {stage['command']} {' '.join(os.path.basename(p) for p in stage['inputs'])}"
+                      f" -> {os.path.basename(stage['output'])}")
+                running[pool.submit(run_stage, stage)] = (name, fingerprint)
+
+            if not running:
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name, fingerprint = running.pop(future)
+                messages, seconds, error = future.result()
+                print(f"\n{'─' * 20} {name} {'─' * 20}")
+                print(messages.rstrip())
+                if error:
+                    results[name] = {'status': 'failed', 'seconds': seconds}
+                    print(f"❌ {name} failed after {seconds:.1f}s: {error}")
+                    state.pop(name, None)
+                else:
+                    results[name] = {'status': 'ran', 'seconds': seconds}
+                    print(f"✅ {name} finished in {seconds:.1f}s")
+                    # Outputs changed, so stages reading them must hash them again
+                    digests.pop(stages[name]['output'], None)
+                    state[name] = {'fingerprint': fingerprint, 'seconds': round(seconds, 3)}
+                save_state(workflow['state'], state)
+
+    print_timings(results, order)
+    return results
+
+def print_timings(results, order):
+    """Stage-by-stage status and time"""
+    print("\n" + "=" * 50)
+    print("WORKFLOW SUMMARY")
+    print("=" * 50)
+    for name in order:
+        result = results[name]
+        seconds = f"{result['seconds']:.1f}s" if result['status'] in ('ran', 'failed') else '-'
+        print(f"  {STATUS_ICONS[result['status']]} {name:24s} {result['status']:10s} {seconds:>8s}")
+    ran = sum(result['status'] == 'ran' for result in results.values())
+    skipped = sum(result['status'] == 'unchanged' for result in results.values())
+    print(f"\n{ran} ran, {skipped} unchanged, {len(results) - ran - skipped} failed or blocked")
+
+def workflow_command(positional, options):
+    """Run 'run <workflow.toml> [--jobs N] [--force]' from parsed command-line arguments"""
+    if not positional:
+        print("Usage: run <workflow.toml> [--jobs N|auto] [--force]")
+        sys.exit(1)
+
+    workflow_file = positional[0]
+    if not os.path.exists(workflow_file):
+        print(f"\n❌ Error: File '{workflow_file}' not found!")
+        sys.exit(1)
+
+    try:
+        results = run_workflow(workflow_file, options.get('jobs'), bool(options.get('force')))
+    except (ValueError, ImportError) as e:
+        print(f"\n❌ Error: {e}")
+        sys.exit(1)
+
+    if any(result['status'] in ('failed', 'blocked') for result in results.values()):
+        sys.exit(1)
+
+def main():
+    """Main entry point"""
+    workflow_command(*parse_options(sys.argv[1:], VALUE_OPTIONS))
+
+if __name__ == "__main__":
+    main()